@@ -0,0 +1,31 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from scanning import CHUNK  # noqa: E402
+
+from lox import Lox  # noqa: E402
+
+# Memory held by the parsed program (AST nodes and the tokens they keep)
+# per KB of source.
+SIZE_KB = 512
+
+
+def main():
+    copies = SIZE_KB * 1024 // len(CHUNK) + 1
+    source = CHUNK * copies
+    kilobytes = len(source) / 1024
+
+    tracemalloc.start()
+    statements = Lox.parse(source)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"parsed {kilobytes:.0f} KB into {len(statements)} declarations")
+    print(f"AST   {retained / kilobytes:>10.0f} bytes/source KB")
+
+
+if __name__ == "__main__":
+    main()
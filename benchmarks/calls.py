@@ -0,0 +1,56 @@
+import statistics
+
+from harness import time_run
+
+# Each program is paired with the number of Lox calls it makes, so the
+# table can report the cost of a single call.
+PROGRAMS = {
+    "recursive_fib": (
+        """
+        fun fib(n) {
+            if (n < 2) return n;
+            return fib(n - 1) + fib(n - 2);
+        }
+        print fib(20);
+        """,
+        21891,
+    ),
+    "accessors": (
+        """
+        class Point {
+            init(x, y) { self.x = x; self.y = y; }
+            getX() { return self.x; }
+            getY() { return self.y; }
+        }
+        {
+            var p = Point(1, 2);
+            var sum = 0;
+            for (var i = 0; i < 20000; i = i + 1) {
+                sum = sum + p.getX() + p.getY();
+            }
+            print sum;
+        }
+        """,
+        40001,
+    ),
+}
+
+ENGINES = ("tree", "closure")
+REPEAT = 3
+
+
+def main():
+    print(f"{'program':<16}" + "".join(f"{e:>16}" for e in ENGINES))
+    for name, (source, calls) in PROGRAMS.items():
+        timings = [
+            statistics.median(time_run(source, e)[0] for _ in range(REPEAT))
+            for e in ENGINES
+        ]
+        row = "".join(
+            f"{timing / calls * 1e6:>11.2f}us/call" for timing in timings
+        )
+        print(f"{name:<16}{row}")
+
+
+if __name__ == "__main__":
+    main()
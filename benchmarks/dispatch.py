@@ -0,0 +1,67 @@
+import statistics
+
+from harness import time_run
+
+PROGRAMS = {
+    "nested_loops": """
+        {
+            var total = 0;
+            for (var i = 0; i < 300; i = i + 1) {
+                for (var j = 0; j < 300; j = j + 1) {
+                    total = total + i * j - j / 2;
+                }
+            }
+            print total;
+        }
+    """,
+    "while_counter": """
+        fun count(n) {
+            var i = 0;
+            var even = 0;
+            while (i < n) {
+                if (i - (i / 2) * 2 == 0 or i > n) even = even + 1;
+                i = i + 1;
+            }
+            return even;
+        }
+        print count(100000);
+    """,
+    "closure_loop": """
+        fun makeAdder(n) {
+            fun add(x) { return x + n; }
+            return add;
+        }
+        {
+            var add = makeAdder(3);
+            var sum = 0;
+            for (var i = 0; i < 50000; i = i + 1) sum = add(sum);
+            print sum;
+        }
+    """,
+}
+
+ENGINES = ("tree", "closure", "python")
+REPEAT = 3
+
+
+def main():
+    # Every engine after the first is also reported as its speedup over
+    # the first (the tree-walker).
+    baseline, *others = ENGINES
+    header = "".join(f"{e:>12}" for e in ENGINES)
+    header += "".join(f"{'x ' + e:>12}" for e in others)
+    print(f"{'program':<16}{header}")
+    for name, source in PROGRAMS.items():
+        timings = {
+            e: statistics.median(time_run(source, e)[0] for _ in range(REPEAT))
+            for e in ENGINES
+        }
+        row = "".join(f"{timings[e]:>11.3f}s" for e in ENGINES)
+        row += "".join(
+            f"{timings[baseline] / timings[e]:>12.2f}" for e in others
+        )
+        print(f"{name:<16}{row}")
+
+
+if __name__ == "__main__":
+    main()
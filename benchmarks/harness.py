@@ -0,0 +1,31 @@
+"""Shared by the benchmark scripts.
+
+Importing it puts src/ on sys.path, so the interpreter modules can be
+imported right after it.
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lox import Lox  # noqa: E402
+from transpiler import PythonProgram  # noqa: E402
+
+
+def time_run(source: str, engine: str) -> tuple[float, str]:
+    """Runs source on engine, returning the wall time and its output.
+
+    The in-memory cache of transpiled programs is cleared first, so a
+    repeated python run pays for transpiling like the first one did.
+    """
+    PythonProgram.cache.clear()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        Lox.run(source, engine)
+        elapsed = time.perf_counter() - start
+    return elapsed, output.getvalue()
@@ -0,0 +1,121 @@
+"""Native lists against linked lists of instances.
+
+    python benchmarks/lists.py [--size 20000] [--engines tree,vm]
+
+Each program builds a sequence of --size numbers, sums it front to back
+and then reads READS elements at positions spread over the sequence.
+The linked list has to walk from the head for every positional read,
+so that phase is quadratic for it. Memory is the traced memory the
+tree engine still holds per element once the sequence is built.
+"""
+
+import argparse
+import tracemalloc
+
+from harness import time_run
+
+from interpreter import Interpreter
+from lox import ENGINES, Lox
+from resolver import Resolver
+
+BUILD = {
+    "list": """
+        var items = [];
+        for (var i = 0; i < %d; i = i + 1) append(items, i);
+    """,
+    "linked": """
+        class Node {
+            init(value, next) {
+                self.value = value;
+                self.next = next;
+            }
+        }
+        var items = nil;
+        var tail = nil;
+        for (var i = 0; i < %d; i = i + 1) {
+            var node = Node(i, nil);
+            if (tail == nil) items = node; else tail.next = node;
+            tail = node;
+        }
+    """,
+}
+
+USE = {
+    "list": """
+        var sum = 0;
+        for (var i = 0; i < len(items); i = i + 1) sum = sum + items[i];
+        print sum;
+
+        var picked = 0;
+        for (var i = 0; i < %(reads)d; i = i + 1) {
+            picked = picked + items[i * %(stride)d];
+        }
+        print picked;
+    """,
+    "linked": """
+        var sum = 0;
+        for (var node = items; node != nil; node = node.next) {
+            sum = sum + node.value;
+        }
+        print sum;
+
+        var picked = 0;
+        for (var i = 0; i < %(reads)d; i = i + 1) {
+            var node = items;
+            for (var j = 0; j < i * %(stride)d; j = j + 1) node = node.next;
+            picked = picked + node.value;
+        }
+        print picked;
+    """,
+}
+
+READS = 100
+
+
+def program(kind: str, size: int) -> str:
+    stride = max(size // READS, 1)
+    reads = min(READS, size)
+    use = USE[kind] % {"reads": reads, "stride": stride}
+    return BUILD[kind] % size + use
+
+
+def retained_bytes(kind: str, size: int) -> int:
+    statements = Lox.parse(BUILD[kind] % size)
+    tracemalloc.start()
+    interpreter = Interpreter()
+    Resolver(interpreter).resolve(statements)
+    interpreter.interpret(statements)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog="lists.py")
+    arg_parser.add_argument("--size", type=int, default=20_000)
+    arg_parser.add_argument("--engines", default=",".join(ENGINES))
+    args = arg_parser.parse_args()
+
+    engines = args.engines.split(",")
+    print(f"{args.size} elements")
+    print(f"{'':<10}" + "".join(f"{engine:>10}" for engine in engines))
+    for kind in BUILD:
+        outputs = set()
+        row = f"{kind:<10}"
+        for engine in engines:
+            elapsed, output = time_run(program(kind, args.size), engine)
+            outputs.add(output)
+            row += f"{elapsed:>9.3f}s"
+        print(row)
+        if len(outputs) > 1:
+            print(f"  warning: engines disagree on the output of {kind}")
+
+    for kind in BUILD:
+        per_element = (
+            retained_bytes(kind, args.size) - retained_bytes(kind, 0)
+        ) / args.size
+        print(f"{kind:<10}{per_element:>8.1f} bytes/element (tree engine)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from closure_compiler import ClosureInterpreter  # noqa: E402
+from interpreter import Interpreter  # noqa: E402
+from lox import Lox  # noqa: E402
+from resolver import Resolver  # noqa: E402
+
+# Builds a complete binary tree and keeps it alive in a global, so the
+# memory still traced after the run is the memory held by the nodes.
+BINARY_TREES = """
+    class Node {
+        init(left, right) {
+            self.left = left;
+            self.right = right;
+        }
+    }
+
+    fun build(depth) {
+        if (depth == 0) return Node(nil, nil);
+        return Node(build(depth - 1), build(depth - 1));
+    }
+
+    var tree = build(%d);
+"""
+
+INTERPRETERS = {"tree": Interpreter, "closure": ClosureInterpreter}
+DEPTH = 14
+
+
+def retained_bytes(interpreter_class: type, depth: int) -> int:
+    statements = Lox.parse(BINARY_TREES % depth)
+    tracemalloc.start()
+    interpreter = interpreter_class()
+    Resolver(interpreter).resolve(statements)
+    interpreter.interpret(statements)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained
+
+
+def main():
+    nodes = 2 ** (DEPTH + 1) - 1
+    print(f"binary trees, depth {DEPTH} ({nodes} instances)")
+    for name, interpreter_class in INTERPRETERS.items():
+        baseline = retained_bytes(interpreter_class, 0)
+        retained = retained_bytes(interpreter_class, DEPTH)
+        per_instance = (retained - baseline) / (nodes - 1)
+        print(f"{name:<10}{per_instance:>8.1f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Print-heavy program written to a pipe, buffered and --unbuffered.
+
+    python benchmarks/output.py [--lines 200000] [--engines tree,vm]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lox import ENGINES  # noqa: E402
+
+LOX = Path(__file__).resolve().parent.parent / "src" / "lox.py"
+
+PROGRAM = """
+    for (var i = 0; i < %d; i = i + 1) {
+        print "line " + "of output";
+        print i;
+    }
+"""
+
+
+def run(script: str, engine: str, *flags: str) -> tuple[float, bytes]:
+    command = [sys.executable, str(LOX), "--no-cache", "--engine", engine]
+    start = time.perf_counter()
+    result = subprocess.run(
+        [*command, *flags, script], stdout=subprocess.PIPE, check=True
+    )
+    return time.perf_counter() - start, result.stdout
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog="output.py")
+    arg_parser.add_argument("--lines", type=int, default=200_000)
+    arg_parser.add_argument("--engines", default=",".join(ENGINES))
+    args = arg_parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".lox") as script:
+        script.write(PROGRAM % (args.lines // 2))
+        script.flush()
+
+        print(f"{args.lines} lines to a pipe")
+        print(f"{'engine':<10}{'unbuffered':>12}{'buffered':>12}")
+        for engine in args.engines.split(","):
+            unbuffered, expected = run(script.name, engine, "--unbuffered")
+            buffered, output = run(script.name, engine)
+            if output != expected:
+                print(f"  warning: {engine} output differs when buffered")
+            print(f"{engine:<10}{unbuffered:>11.3f}s{buffered:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main()
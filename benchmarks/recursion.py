@@ -0,0 +1,99 @@
+"""Deep non-tail recursion: how deep each engine gets and how fast.
+
+    python benchmarks/recursion.py [--depths 1000,10000,100000]
+        [--engines tree,closure,vm,python,stack]
+
+Builds a linked list recursively, then walks and sums it recursively,
+so the Lox call stack reaches the given depth three times. Engines
+that run out of stack print their error instead of a time.
+"""
+
+import argparse
+import tracemalloc
+
+from harness import time_run
+
+from lox import ENGINES
+from stack_interpreter import StackInterpreter
+
+LIST = """
+    class Node {
+        init(value, next) {
+            self.value = value;
+            self.next = next;
+        }
+    }
+
+    fun build(n) {
+        if (n == 0) return nil;
+        return Node(n, build(n - 1));
+    }
+
+    fun length(list) {
+        if (list == nil) return 0;
+        return 1 + length(list.next);
+    }
+
+    fun sum(list) {
+        if (list == nil) return 0;
+        return list.value + sum(list.next);
+    }
+
+    var list = build(%d);
+    print length(list);
+    print sum(list);
+"""
+
+SUM = """
+    fun sum(n) {
+        if (n == 0) return 0;
+        return n + sum(n - 1);
+    }
+    print sum(%d);
+"""
+
+MEMORY_DEPTH = 10_000
+
+
+def expected(depth: int) -> str:
+    return f"{depth}\n{depth * (depth + 1) // 2}\n"
+
+
+def bytes_per_frame(depth: int) -> float:
+    # Peak traced memory of a recursion minus that of a shallow one.
+    peaks = []
+    for n in (1, depth):
+        tracemalloc.start()
+        time_run(SUM % n, "stack")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return (peaks[1] - peaks[0]) / (depth - 1)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog="recursion.py")
+    arg_parser.add_argument("--depths", default="1000,10000,100000")
+    arg_parser.add_argument("--engines", default=",".join(ENGINES))
+    args = arg_parser.parse_args()
+
+    depths = [int(depth) for depth in args.depths.split(",")]
+    engines = args.engines.split(",")
+    print(f"{'depth':<10}" + "".join(f"{e:>12}" for e in engines))
+    for depth in depths:
+        row = f"{depth:<10}"
+        for engine in engines:
+            elapsed, output = time_run(LIST % depth, engine)
+            if output == expected(depth):
+                row += f"{elapsed:>11.3f}s"
+            else:
+                row += f"{'failed':>12}"
+        print(row)
+
+    print(
+        f"stack engine: {bytes_per_frame(MEMORY_DEPTH):.0f} bytes per Lox"
+        f" frame, --max-frames {StackInterpreter.max_frames} by default"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Runs the Lox programs in benchmarks/lox under every engine.
+
+    python benchmarks/run.py [programs...] [--engines tree,vm]
+        [--repeat 5] [--json results.json]
+    python benchmarks/run.py --compare base.json new.json [--threshold 0.1]
+
+--compare exits with status 1 when any program/engine pair got slower
+than the threshold allows.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+from pathlib import Path
+
+from harness import time_run
+
+from lox import ENGINES
+
+PROGRAMS = Path(__file__).resolve().parent / "lox"
+
+
+def run_suite(names: list[str], engines: list[str], repeat: int) -> dict:
+    results: dict[str, dict] = {}
+    print(f"{'program':<16}" + "".join(f"{e:>18}" for e in engines))
+
+    for name in names:
+        source = (PROGRAMS / f"{name}.lox").read_text()
+        results[name] = {}
+        outputs = set()
+        row = ""
+        for engine in engines:
+            runs = []
+            for _ in range(repeat):
+                elapsed, output = time_run(source, engine)
+                runs.append(elapsed)
+                outputs.add(output)
+            median = statistics.median(runs)
+            stddev = statistics.stdev(runs) if len(runs) > 1 else 0.0
+            results[name][engine] = {
+                "median": median,
+                "stddev": stddev,
+                "runs": runs,
+            }
+            row += f"{median:>9.3f}s ±{stddev:>6.3f}"
+        print(f"{name:<16}{row}")
+        if len(outputs) > 1:
+            print(f"  warning: engines disagree on the output of {name}")
+
+    return {
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> bool:
+    base = json.loads(Path(base_path).read_text())["results"]
+    new = json.loads(Path(new_path).read_text())["results"]
+    regressed = False
+
+    print(f"{'program':<16}{'engine':<10}{'base':>10}{'new':>10}{'change':>9}")
+    for name, engines in new.items():
+        for engine, result in engines.items():
+            if engine not in base.get(name, {}):
+                continue
+            before = base[name][engine]["median"]
+            after = result["median"]
+            change = after / before - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressed = True
+            print(
+                f"{name:<16}{engine:<10}{before:>9.3f}s{after:>9.3f}s"
+                f"{change:>+9.1%}{flag}"
+            )
+    return not regressed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog="run.py")
+    arg_parser.add_argument("programs", nargs="*")
+    arg_parser.add_argument("--engines", default=",".join(ENGINES))
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--json")
+    arg_parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    arg_parser.add_argument("--threshold", type=float, default=0.1)
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare(*args.compare, args.threshold) else 1)
+
+    names = args.programs or sorted(p.stem for p in PROGRAMS.glob("*.lox"))
+    results = run_suite(names, args.engines.split(","), args.repeat)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
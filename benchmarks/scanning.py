@@ -0,0 +1,54 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from scanner import RegexScanner, Scanner  # noqa: E402
+
+CHUNK = """
+// Generated-looking code with a bit of everything.
+class Vector {
+    init(x, y) { self.x = x; self.y = y; }
+    add(other) { return Vector(self.x + other.x, self.y + other.y); }
+    len2() { return self.x * self.x + self.y * self.y; }
+}
+
+fun checksum(n) {
+    var total = 0;
+    for (var i = 0; i < n; i = i + 1) {
+        if (i >= 10 and i != 42 or !false) total = total + i / 2.5;
+    }
+    return total;
+}
+
+var label = "checksum of the first few numbers";
+print label;
+print checksum(100) == nil;
+"""
+
+SCANNERS = {"classic": Scanner, "regex": RegexScanner}
+SIZE_MB = 2
+REPEAT = 3
+
+
+def main():
+    copies = SIZE_MB * 1024 * 1024 // len(CHUNK) + 1
+    source = CHUNK * copies
+    megabytes = len(source) / (1024 * 1024)
+    print(f"scanning {megabytes:.1f} MB")
+
+    for name, scanner_class in SCANNERS.items():
+        best = float("inf")
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            tokens = scanner_class(source).scan_tokens()
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{name:<10}{megabytes / best:>8.2f} MB/s"
+            f"  ({len(tokens)} tokens, {best:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from program_cache import CACHE_DIR  # noqa: E402
+
+LOX = Path(__file__).resolve().parent.parent / "src" / "lox.py"
+
+# Declarations only, so a run is dominated by the front end that the
+# .loxc cache skips.
+CHUNK = """
+class Vector%(n)d {
+    init(x, y) { self.x = x; self.y = y; }
+    add(other) { return Vector%(n)d(self.x + other.x, self.y + other.y); }
+    len2() { return self.x * self.x + self.y * self.y; }
+}
+
+fun checksum%(n)d(n) {
+    var total = 0;
+    for (var i = 0; i < n; i = i + 1) {
+        if (i >= 10 and i != 42 or !false) total = total + i / 2.5;
+    }
+    return total;
+}
+"""
+
+ENGINES = ("tree", "closure", "vm", "python")
+CHUNKS = 2000
+REPEAT = 3
+
+
+def startup(script: Path, engine: str, cold: bool) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        if cold:
+            shutil.rmtree(script.parent / CACHE_DIR, ignore_errors=True)
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(LOX), f"--engine={engine}", str(script)],
+            check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "large.lox"
+        script.write_text("".join(CHUNK % {"n": n} for n in range(CHUNKS)))
+        size = script.stat().st_size / 1024
+        print(f"startup of a {size:.0f} KB script")
+
+        for engine in ENGINES:
+            cold = startup(script, engine, cold=True)
+            warm = startup(script, engine, cold=False)
+            print(
+                f"{engine:<10}cold {cold:>6.2f}s  warm {warm:>6.2f}s"
+                f"  ({cold / warm:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
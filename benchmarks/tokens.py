@@ -0,0 +1,45 @@
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from parser import Parser  # noqa: E402
+
+from scanning import CHUNK  # noqa: E402
+
+from scanner import RegexScanner  # noqa: E402
+
+# Compares a list of Token objects with the struct-of-arrays TokenBuffer:
+# bytes held per token after scanning, and scan + parse time.
+STORES = {
+    "list": lambda source: list(RegexScanner(source).iter_tokens()),
+    "buffer": lambda source: RegexScanner(source).scan_buffer(),
+}
+SIZE_MB = 1
+
+
+def main():
+    copies = SIZE_MB * 1024 * 1024 // len(CHUNK) + 1
+    source = CHUNK * copies
+    print(f"token store for {len(source) / (1024 * 1024):.1f} MB of source")
+
+    for name, store in STORES.items():
+        tracemalloc.start()
+        tokens = store(source)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_token = retained / len(tokens)
+
+        start = time.perf_counter()
+        Parser(store(source)).parse()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<10}{per_token:>8.1f} bytes/token"
+            f"  scan + parse {elapsed:.2f}s ({len(tokens)} tokens)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import typing as t
+
+# Every instruction takes two slots in FunctionProto.code: the opcode
+# followed by a single integer operand (0 when the opcode has none).
+CONSTANT = 0
+NIL = 1
+TRUE = 2
+FALSE = 3
+POP = 4
+GET_LOCAL = 5
+SET_LOCAL = 6
+DEFINE_LOCAL = 7
+GET_CELL = 8
+SET_CELL = 9
+DEFINE_CELL = 10
+NEW_CELL = 11
+GET_UPVALUE = 12
+SET_UPVALUE = 13
+GET_GLOBAL = 14
+SET_GLOBAL = 15
+DEFINE_GLOBAL = 16
+GET_PROPERTY = 17
+SET_PROPERTY = 18
+GET_SUPER = 19
+EQUAL = 20
+NOT_EQUAL = 21
+GREATER = 22
+GREATER_EQUAL = 23
+LESS = 24
+LESS_EQUAL = 25
+ADD = 26
+SUBTRACT = 27
+MULTIPLY = 28
+DIVIDE = 29
+NOT = 30
+NEGATE = 31
+PRINT = 32
+JUMP = 33
+JUMP_IF_FALSE = 34
+JUMP_IF_TRUE = 35
+POP_JUMP_IF_FALSE = 36
+CALL = 37
+INVOKE = 38
+SUPER_INVOKE = 39
+CLOSURE = 40
+RETURN = 41
+CLASS = 42
+INHERIT = 43
+METHOD = 44
+BUILD_LIST = 45
+GET_INDEX = 46
+SET_INDEX = 47
+
+OP_NAMES = {
+    value: name
+    for name, value in dict(globals()).items()
+    if name.isupper() and isinstance(value, int)
+}
+
+# INVOKE and SUPER_INVOKE pack the method name index and the argument
+# count into their single operand.
+ARGC_BITS = 8
+ARGC_MASK = (1 << ARGC_BITS) - 1
+
+
+class FunctionProto:
+    def __init__(self, name: str, arity: int, is_initializer: bool = False):
+        self.name = name
+        self.arity = arity
+        self.is_initializer = is_initializer
+        self.code: list[int] = []
+        self.lines: list[int] = []
+        self.constants: list[t.Any] = []
+        self.names: list[str] = []
+        self.num_slots = 0
+        self.upvalues: list[tuple[bool, int]] = []
+        self.cell_params: list[int] = []
+
+    def __str__(self) -> str:
+        return f"<{self.name}>"
+
+
+def disassemble(proto: FunctionProto) -> str:
+    lines = [f"== {proto.name} =="]
+    for offset in range(0, len(proto.code), 2):
+        op, arg = proto.code[offset], proto.code[offset + 1]
+        line = proto.lines[offset // 2]
+        text = f"{offset:04d} {line:4d} {OP_NAMES[op]:<18}"
+
+        if op in (CONSTANT, CLOSURE):
+            text += f"{arg:4d} '{proto.constants[arg]}'"
+        elif op in (INVOKE, SUPER_INVOKE):
+            name, argc = arg >> ARGC_BITS, arg & ARGC_MASK
+            text += f"({argc} args) '{proto.names[name]}'"
+        elif op in (
+            GET_GLOBAL,
+            SET_GLOBAL,
+            DEFINE_GLOBAL,
+            GET_PROPERTY,
+            SET_PROPERTY,
+            GET_SUPER,
+            CLASS,
+            METHOD,
+        ):
+            text += f"{arg:4d} '{proto.names[arg]}'"
+        elif op not in (
+            NIL,
+            TRUE,
+            FALSE,
+            POP,
+            PRINT,
+            RETURN,
+            INHERIT,
+            GET_INDEX,
+            SET_INDEX,
+        ):
+            text += f"{arg:4d}"
+        lines.append(text.rstrip())
+
+    for constant in proto.constants:
+        if isinstance(constant, FunctionProto):
+            lines.append("")
+            lines.append(disassemble(constant))
+    return "\n".join(lines)
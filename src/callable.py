@@ -2,6 +2,9 @@ import time
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any
 
+import plox_list
+from plox_list import LoxList
+
 if TYPE_CHECKING:
     from interpreter import Interpreter
 
@@ -16,12 +19,76 @@ class PloxCallable(ABC):
         pass
 
 
-class ClockCallable(PloxCallable):
+class NativeCallable(PloxCallable):
+    """A function built into the interpreter, named as Lox code calls it.
+
+    The profiler times every subclass's call under that name.
+    """
+
+    name = "<native>"
+
+    def __str__(self):
+        return "<native fn>"
+
+
+class ClockCallable(NativeCallable):
+    name = "clock"
+
     def arity(self):
         return 0
 
     def call(self, interpreter: "Interpreter", arguments: list[Any]) -> float:
         return time.time()
 
-    def __str__(self):
-        return "<native fn>"
+
+class FlushCallable(NativeCallable):
+    name = "flush"
+
+    def arity(self):
+        return 0
+
+    def call(self, interpreter: "Interpreter", arguments: list[Any]) -> None:
+        interpreter.output.flush()
+        return None
+
+
+class ListCallable(NativeCallable):
+    name = "list"
+
+    def arity(self):
+        return 1
+
+    def call(
+        self, interpreter: "Interpreter", arguments: list[Any]
+    ) -> LoxList:
+        return plox_list.new_list(arguments[0])
+
+
+class AppendCallable(NativeCallable):
+    name = "append"
+
+    def arity(self):
+        return 2
+
+    def call(self, interpreter: "Interpreter", arguments: list[Any]) -> None:
+        plox_list.append(arguments[0], arguments[1])
+
+
+class LenCallable(NativeCallable):
+    name = "len"
+
+    def arity(self):
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[Any]) -> float:
+        return plox_list.length(arguments[0])
+
+
+class PopCallable(NativeCallable):
+    name = "pop"
+
+    def arity(self):
+        return 1
+
+    def call(self, interpreter: "Interpreter", arguments: list[Any]) -> Any:
+        return plox_list.pop(arguments[0])
@@ -0,0 +1,701 @@
+import typing as t
+
+import expr
+import stmt
+from callable import PloxCallable
+from environment import UNDEFINED, Environment
+from exceptions import error_message
+from interpreter import Interpreter
+from plox_class import LoxClass
+from plox_function import TailCall
+from plox_instance import LoxInstance
+from plox_list import (
+    LoxList,
+    get_index,
+    set_index,
+)
+from plox_token import Token
+from token_type import TokenType
+
+# Compiled statements return None on normal completion and a one-element
+# tuple holding the value when a return statement fires, or a TailCall
+# when the returned value is a call left for the caller to run.
+Completion = t.Optional[tuple | TailCall]
+StmtFn = t.Callable[[Environment], Completion]
+ExprFn = t.Callable[[Environment], t.Any]
+
+is_equal = Interpreter.is_equal
+stringify = Interpreter.stringify
+check_number_operand = Interpreter.check_number_operand
+check_number_operands = Interpreter.check_number_operands
+
+
+def is_tail_callable(calle: t.Any) -> bool:
+    return calle.__class__ is CompiledFunction and not calle.is_initializer
+
+
+class CompiledFunction(PloxCallable):
+    def __init__(
+        self,
+        declaration: stmt.Function,
+        body: StmtFn,
+        closure: Environment,
+        is_initializer: bool,
+    ):
+        self.declaration = declaration
+        self.body = body
+        self.closure = closure
+        self.is_initializer = is_initializer
+        self.num_params = len(declaration.params)
+
+    def arity(self) -> int:
+        return self.num_params
+
+    def call(
+        self,
+        interpreter: "Interpreter",
+        arguments: list[t.Any],
+    ) -> t.Any:
+        completion = self.body(Environment(self.closure, arguments))
+
+        if self.is_initializer:
+            return self.closure.values[0]
+        if completion is not None:
+            if isinstance(completion, TailCall):
+                return completion.run(interpreter)
+            return completion[0]
+        return None
+
+    def invoke(
+        self,
+        interpreter: "Interpreter",
+        instance: LoxInstance,
+        arguments: list[t.Any],
+    ) -> t.Any:
+        bound = Environment(self.closure, [instance])
+        completion = self.body(Environment(bound, arguments))
+
+        if self.is_initializer:
+            return instance
+        if completion is not None:
+            if isinstance(completion, TailCall):
+                return completion.run(interpreter)
+            return completion[0]
+        return None
+
+    def execute(
+        self,
+        interpreter: "Interpreter",
+        instance: t.Optional[LoxInstance],
+        arguments: list[t.Any],
+    ) -> Completion:
+        closure = self.closure
+        if instance is not None:
+            closure = Environment(closure, [instance])
+        return self.body(Environment(closure, arguments))
+
+    def bind(self, instance: LoxInstance) -> "CompiledFunction":
+        return CompiledFunction(
+            self.declaration,
+            self.body,
+            Environment(self.closure, [instance]),
+            self.is_initializer,
+        )
+
+    def __str__(self) -> str:
+        return f"<{self.declaration.name.lexeme}>"
+
+
+class ClosureCompiler:
+    """Turns each AST node into a specialised Python closure, once.
+
+    The closures take the current Environment as their only argument, so
+    running a program never goes through accept()/visit_* dispatch.
+    Variable accesses use the (depth, slot) pairs the Resolver stored in
+    Interpreter.locals.
+    """
+
+    def __init__(self, interpreter: Interpreter):
+        self.interpreter = interpreter
+
+    def compile_block(self, statements: list[stmt.Stmt]) -> StmtFn:
+        compiled = [self.compile_statement(s) for s in statements]
+
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block(env):
+            for statement in compiled:
+                completion = statement(env)
+                if completion is not None:
+                    return completion
+            return None
+
+        return block
+
+    def compile_statement(self, statement: stmt.Stmt) -> StmtFn:
+        return statement.accept(self)
+
+    def compile_expression(self, expression: expr.Expr) -> ExprFn:
+        return expression.accept(self)
+
+    def visit_expression_stmt(self, statement: stmt.Expression):
+        expression = self.compile_expression(statement.expr)
+
+        def expression_stmt(env):
+            expression(env)
+
+        return expression_stmt
+
+    def visit_print_stmt(self, statement: stmt.Print):
+        expression = self.compile_expression(statement.expr)
+        write = self.interpreter.output.write
+
+        def print_stmt(env):
+            write(stringify(expression(env)))
+
+        return print_stmt
+
+    def visit_var_stmt(self, statement: stmt.Var):
+        name = statement.name.lexeme
+        if statement.initializer is None:
+
+            def var_stmt(env):
+                env.define_var(name, None)
+
+            return var_stmt
+
+        initializer = self.compile_expression(statement.initializer)
+
+        def var_init_stmt(env):
+            env.define_var(name, initializer(env))
+
+        return var_init_stmt
+
+    def visit_block_stmt(self, block_stmt: stmt.Block):
+        body = self.compile_block(block_stmt.statements)
+
+        def block_stmt_fn(env):
+            return body(Environment(env))
+
+        return block_stmt_fn
+
+    def visit_if_stmt(self, statement: stmt.IfStmt):
+        condition = self.compile_expression(statement.condition)
+        then_stmt = self.compile_statement(statement.then_stmt)
+
+        if statement.else_stmt is None:
+
+            def if_stmt(env):
+                value = condition(env)
+                if value is not None and value is not False:
+                    return then_stmt(env)
+                return None
+
+            return if_stmt
+
+        else_stmt = self.compile_statement(statement.else_stmt)
+
+        def if_else_stmt(env):
+            value = condition(env)
+            if value is not None and value is not False:
+                return then_stmt(env)
+            return else_stmt(env)
+
+        return if_else_stmt
+
+    def visit_while_stmt(self, statement: stmt.While):
+        condition = self.compile_expression(statement.condition)
+        body = self.compile_statement(statement.body)
+
+        def while_stmt(env):
+            while True:
+                value = condition(env)
+                if value is None or value is False:
+                    return None
+                completion = body(env)
+                if completion is not None:
+                    return completion
+
+        return while_stmt
+
+    def visit_function_stmt(self, statement: stmt.Function):
+        name = statement.name.lexeme
+        body = self.compile_block(statement.body)
+
+        def function_stmt(env):
+            env.define_var(name, CompiledFunction(statement, body, env, False))
+
+        return function_stmt
+
+    def visit_return_stmt(self, statement: stmt.Return):
+        if statement.value is None:
+
+            def return_nil_stmt(env):
+                return (None,)
+
+            return return_nil_stmt
+
+        if statement.value.__class__ is expr.Call and statement.value.tail:
+            call = self.visit_call_expr(statement.value, True)
+
+            def return_call_stmt(env):
+                result = call(env)
+                if result.__class__ is TailCall:
+                    return result
+                return (result,)
+
+            return return_call_stmt
+
+        value = self.compile_expression(statement.value)
+
+        def return_stmt(env):
+            return (value(env),)
+
+        return return_stmt
+
+    def visit_class_stmt(self, statement: stmt.Class):
+        name = statement.name
+        superclass_fn = None
+        if statement.superclass is not None:
+            superclass_fn = self.compile_expression(statement.superclass)
+
+        methods = [
+            (method, self.compile_block(method.body))
+            for method in statement.methods
+        ]
+
+        def class_stmt(env):
+            superclass = None
+            if superclass_fn is not None:
+                superclass = superclass_fn(env)
+                if not isinstance(superclass, LoxClass):
+                    raise RuntimeError("Superclass must be a class.")
+
+            method_env = env
+            if superclass is not None:
+                method_env = Environment(env, [superclass])
+
+            functions = {}
+            for method, body in methods:
+                is_init = method.name.lexeme == "init"
+                functions[method.name.lexeme] = CompiledFunction(
+                    method, body, method_env, is_init
+                )
+
+            env.define_var(
+                name.lexeme, LoxClass(name.lexeme, superclass, functions)
+            )
+
+        return class_stmt
+
+    def visit_literal_expr(self, literal_expr: expr.Literal):
+        value = literal_expr.value
+
+        def literal(env):
+            return value
+
+        return literal
+
+    def visit_grouping_expr(self, grouping_expr: expr.Grouping):
+        return self.compile_expression(grouping_expr.expr)
+
+    def visit_unary_expr(self, unary_expr: expr.Unary):
+        right = self.compile_expression(unary_expr.right)
+        operator = unary_expr.operator
+
+        if operator.token_type == TokenType.BANG:
+
+            def not_expr(env):
+                value = right(env)
+                return value is None or value is False
+
+            return not_expr
+
+        def negate_expr(env):
+            value = right(env)
+            check_number_operand(operator, value)
+            return -value
+
+        return negate_expr
+
+    def visit_binary_expr(self, binary_expr: expr.Binary):
+        left = self.compile_expression(binary_expr.left)
+        right = self.compile_expression(binary_expr.right)
+        operator = binary_expr.operator
+        operator_type = operator.token_type
+
+        if operator_type == TokenType.PLUS:
+
+            def add(env):
+                a = left(env)
+                b = right(env)
+                if (type(a) is float and type(b) is float) or (
+                    type(a) is str and type(b) is str
+                ):
+                    return a + b
+                raise RuntimeError(
+                    f"Operands must be two numbers or two strings."
+                    f" Operator: {operator_type}"
+                )
+
+            return add
+
+        if operator_type == TokenType.EQUAL_EQUAL:
+
+            def equal(env):
+                return is_equal(left(env), right(env))
+
+            return equal
+
+        if operator_type == TokenType.BANG_EQUAL:
+
+            def not_equal(env):
+                return not is_equal(left(env), right(env))
+
+            return not_equal
+
+        if operator_type == TokenType.MINUS:
+
+            def subtract(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a - b
+                check_number_operands(operator, a, b)
+
+            return subtract
+
+        if operator_type == TokenType.STAR:
+
+            def multiply(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a * b
+                check_number_operands(operator, a, b)
+
+            return multiply
+
+        if operator_type == TokenType.SLASH:
+
+            def divide(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a / b
+                check_number_operands(operator, a, b)
+
+            return divide
+
+        if operator_type == TokenType.LESS:
+
+            def less(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a < b
+                check_number_operands(operator, a, b)
+
+            return less
+
+        if operator_type == TokenType.LESS_EQUAL:
+
+            def less_equal(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a <= b
+                check_number_operands(operator, a, b)
+
+            return less_equal
+
+        if operator_type == TokenType.GREATER:
+
+            def greater(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a > b
+                check_number_operands(operator, a, b)
+
+            return greater
+
+        def greater_equal(env):
+            a = left(env)
+            b = right(env)
+            if type(a) is float and type(b) is float:
+                return a >= b
+            check_number_operands(operator, a, b)
+
+        return greater_equal
+
+    def visit_logical_expr(self, logical_expr: expr.Logical):
+        left = self.compile_expression(logical_expr.left)
+        right = self.compile_expression(logical_expr.right)
+
+        if logical_expr.operator.token_type == TokenType.OR:
+
+            def or_expr(env):
+                value = left(env)
+                if value is not None and value is not False:
+                    return value
+                return right(env)
+
+            return or_expr
+
+        def and_expr(env):
+            value = left(env)
+            if value is None or value is False:
+                return value
+            return right(env)
+
+        return and_expr
+
+    def variable_getter(self, name: Token, expression: expr.Expr) -> ExprFn:
+        local = self.interpreter.locals.get(expression)
+
+        if local is None:
+            cell = self.interpreter.global_cell(name, expression)
+
+            def global_var(env):
+                value = cell.value
+                if value is UNDEFINED:
+                    raise RuntimeError(f"Undefined variable {name}.")
+                return value
+
+            return global_var
+
+        distance, slot = local
+        if distance == 0:
+
+            def local_var(env):
+                return env.values[slot]
+
+            return local_var
+
+        if distance == 1:
+
+            def enclosing_var(env):
+                return env.enclosing.values[slot]
+
+            return enclosing_var
+
+        def ancestor_var(env):
+            for _ in range(distance):
+                env = env.enclosing
+            return env.values[slot]
+
+        return ancestor_var
+
+    def visit_var_expr(self, var_expr: expr.Var):
+        return self.variable_getter(var_expr.token, var_expr)
+
+    def visit_self_expr(self, self_expr: expr.Self):
+        return self.variable_getter(self_expr.keyword, self_expr)
+
+    def visit_assign_expr(self, assign_expr: expr.Assign):
+        value_fn = self.compile_expression(assign_expr.value)
+        name = assign_expr.name
+        local = self.interpreter.locals.get(assign_expr)
+
+        if local is None:
+            cell = self.interpreter.global_cell(name, assign_expr)
+
+            def assign_global(env):
+                value = value_fn(env)
+                if cell.value is UNDEFINED:
+                    raise RuntimeError(name, f"Undefined variable '{name}'.")
+                cell.value = value
+                return value
+
+            return assign_global
+
+        distance, slot = local
+        if distance == 0:
+
+            def assign_local(env):
+                value = env.values[slot] = value_fn(env)
+                return value
+
+            return assign_local
+
+        if distance == 1:
+
+            def assign_enclosing(env):
+                value = env.enclosing.values[slot] = value_fn(env)
+                return value
+
+            return assign_enclosing
+
+        def assign_ancestor(env):
+            value = value_fn(env)
+            for _ in range(distance):
+                env = env.enclosing
+            env.values[slot] = value
+            return value
+
+        return assign_ancestor
+
+    def visit_call_expr(self, call_expr: expr.Call, tail: bool = False):
+        # A tail call to a Lox function returns a TailCall instead of
+        # running it; other callees are called as usual.
+        if isinstance(call_expr.calle, expr.Get):
+            return self.compile_invoke(call_expr, call_expr.calle, tail)
+
+        calle_fn = self.compile_expression(call_expr.calle)
+        argument_fns = [
+            self.compile_expression(argument)
+            for argument in call_expr.arguments
+        ]
+        interpreter = self.interpreter
+
+        def call(env):
+            calle = calle_fn(env)
+            arguments = [argument(env) for argument in argument_fns]
+
+            if not isinstance(calle, PloxCallable):
+                raise RuntimeError("Can only call functions and classes.")
+
+            if len(arguments) != calle.arity():
+                raise RuntimeError(
+                    f"Expected {calle.arity()} arguments, "
+                    f"but {len(arguments)} were given."
+                )
+            if tail and is_tail_callable(calle):
+                return TailCall(calle, None, arguments)
+            return calle.call(interpreter, arguments)
+
+        return call
+
+    def compile_invoke(
+        self, call_expr: expr.Call, get_expr: expr.Get, tail: bool = False
+    ):
+        object_fn = self.compile_expression(get_expr.expression)
+        argument_fns = [
+            self.compile_expression(argument)
+            for argument in call_expr.arguments
+        ]
+        name = get_expr.name
+        cache = self.interpreter.property_cache()
+        interpreter = self.interpreter
+
+        def invoke(env):
+            obj = object_fn(env)
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError("Only instances have properties.")
+
+            slot, method = cache.lookup(obj, name)
+            arguments = [argument(env) for argument in argument_fns]
+
+            if method is None:
+                calle = obj.values[slot]
+                if not isinstance(calle, PloxCallable):
+                    raise RuntimeError("Can only call functions and classes.")
+            else:
+                calle = method
+
+            if len(arguments) != calle.arity():
+                raise RuntimeError(
+                    f"Expected {calle.arity()} arguments, "
+                    f"but {len(arguments)} were given."
+                )
+            if tail and is_tail_callable(calle):
+                instance = None if method is None else obj
+                return TailCall(calle, instance, arguments)
+            if method is None:
+                return calle.call(interpreter, arguments)
+            return method.invoke(interpreter, obj, arguments)
+
+        return invoke
+
+    def visit_get_expr(self, get_expr: expr.Get):
+        object_fn = self.compile_expression(get_expr.expression)
+        name = get_expr.name
+        cache = self.interpreter.property_cache()
+
+        def get(env):
+            obj = object_fn(env)
+            if isinstance(obj, LoxInstance):
+                return cache.get(obj, name)
+            raise RuntimeError("Only instances have properties.")
+
+        return get
+
+    def visit_set_expr(self, set_expr: expr.Set):
+        object_fn = self.compile_expression(set_expr.expression)
+        value_fn = self.compile_expression(set_expr.value)
+        name = set_expr.name
+        cache = self.interpreter.property_cache()
+
+        def set_property(env):
+            obj = object_fn(env)
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError("Only instances have fields.")
+            value = value_fn(env)
+            cache.set(obj, name, value)
+            return value
+
+        return set_property
+
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        element_fns = [
+            self.compile_expression(element) for element in list_expr.elements
+        ]
+
+        def list_literal(env):
+            return LoxList([element_fn(env) for element_fn in element_fns])
+
+        return list_literal
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        list_fn = self.compile_expression(index_expr.expression)
+        index_fn = self.compile_expression(index_expr.index)
+
+        def index(env):
+            return get_index(list_fn(env), index_fn(env))
+
+        return index
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        list_fn = self.compile_expression(set_expr.expression)
+        index_fn = self.compile_expression(set_expr.index)
+        value_fn = self.compile_expression(set_expr.value)
+
+        def set_index_fn(env):
+            lox_list = list_fn(env)
+            index = index_fn(env)
+            return set_index(lox_list, index, value_fn(env))
+
+        return set_index_fn
+
+    def visit_super_expr(self, super_expr: expr.Super):
+        local = self.interpreter.locals.get(super_expr)
+        assert local is not None
+        distance = local[0]
+        method_name = super_expr.method.lexeme
+
+        def super_expr_fn(env):
+            superclass = env.get_at(distance, 0)
+            instance = env.get_at(distance - 1, 0)
+            method = superclass.get_method(method_name)
+            if method is None:
+                raise RuntimeError(f"Undefined property: '{method_name}'.")
+            return method.bind(instance)
+
+        return super_expr_fn
+
+
+class ClosureInterpreter(Interpreter):
+    """Drop-in Interpreter that runs closures built by ClosureCompiler."""
+
+    def interpret(self, statements: list[stmt.Stmt]) -> bool:
+        try:
+            program = ClosureCompiler(self).compile_block(statements)
+            program(self.globals)
+        except RuntimeError as error:
+            self.output.write(error_message(error))
+            return False
+        finally:
+            self.output.flush()
+        return True
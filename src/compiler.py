@@ -0,0 +1,546 @@
+import typing as t
+
+import bytecode as op
+import expr
+import stmt
+from bytecode import FunctionProto
+from exceptions import ResolveError
+from plox_class import ClassType
+from plox_function import FunctionType
+from plox_token import Token
+from token_type import TokenType
+
+CELL_VARIANTS = {
+    op.GET_LOCAL: op.GET_CELL,
+    op.SET_LOCAL: op.SET_CELL,
+    op.DEFINE_LOCAL: op.DEFINE_CELL,
+}
+
+BINARY_OPCODES = {
+    TokenType.PLUS: op.ADD,
+    TokenType.MINUS: op.SUBTRACT,
+    TokenType.STAR: op.MULTIPLY,
+    TokenType.SLASH: op.DIVIDE,
+    TokenType.GREATER: op.GREATER,
+    TokenType.GREATER_EQUAL: op.GREATER_EQUAL,
+    TokenType.LESS: op.LESS,
+    TokenType.LESS_EQUAL: op.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: op.EQUAL,
+    TokenType.BANG_EQUAL: op.NOT_EQUAL,
+}
+
+
+class Local:
+    def __init__(self, name: str, depth: int):
+        self.name = name
+        self.depth = depth
+        self.defined = False
+        self.captured = False
+        self.positions: list[int] = []
+
+
+class FunctionState:
+    def __init__(
+        self,
+        enclosing: t.Optional["FunctionState"],
+        proto: FunctionProto,
+        function_type: FunctionType,
+    ):
+        self.enclosing = enclosing
+        self.proto = proto
+        self.function_type = function_type
+        self.locals: list[Local] = []
+        self.scope_depth = 0
+        self.constant_indexes: dict[tuple[type, str], int] = {}
+        self.name_indexes: dict[str, int] = {}
+
+
+class Compiler:
+    """Lowers parsed statements into FunctionProto bytecode for the VM.
+
+    Locals live in numbered frame slots. A local that an inner function
+    captures is boxed into a Cell, and the instructions already emitted
+    for it are patched to their cell variants when the capture is found.
+    """
+
+    def __init__(self):
+        self.current = self.script()
+        self.current_class = ClassType.NONE
+        self.line = 0
+
+    @staticmethod
+    def script() -> FunctionState:
+        return FunctionState(
+            None, FunctionProto("script", 0), FunctionType.NONE
+        )
+
+    def compile(self, statements: list[stmt.Stmt]) -> FunctionProto:
+        self.current = self.script()
+        for statement in statements:
+            self.compile_statement(statement)
+        self.emit(op.NIL)
+        self.emit(op.RETURN)
+        return self.current.proto
+
+    def compile_statement(self, statement: stmt.Stmt):
+        statement.accept(self)
+
+    def compile_expression(self, expression: expr.Expr):
+        expression.accept(self)
+
+    def emit(self, opcode: int, arg: int = 0) -> int:
+        code = self.current.proto.code
+        position = len(code)
+        code.append(opcode)
+        code.append(arg)
+        self.current.proto.lines.append(self.line)
+        return position
+
+    def emit_jump(self, opcode: int) -> int:
+        return self.emit(opcode, -1)
+
+    def patch_jump(self, position: int) -> None:
+        self.current.proto.code[position + 1] = len(self.current.proto.code)
+
+    def make_constant(self, value: t.Any) -> int:
+        constants = self.current.proto.constants
+        if isinstance(value, FunctionProto):
+            constants.append(value)
+            return len(constants) - 1
+
+        # repr() keeps 0.0 and -0.0, which compare equal, apart.
+        key = (type(value), repr(value))
+        index = self.current.constant_indexes.get(key)
+        if index is None:
+            index = len(constants)
+            constants.append(value)
+            self.current.constant_indexes[key] = index
+        return index
+
+    def make_name(self, name: str) -> int:
+        index = self.current.name_indexes.get(name)
+        if index is None:
+            index = len(self.current.proto.names)
+            self.current.proto.names.append(name)
+            self.current.name_indexes[name] = index
+        return index
+
+    def track(self, token: Token) -> None:
+        self.line = token.line
+
+    def begin_scope(self) -> None:
+        self.current.scope_depth += 1
+
+    def end_scope(self) -> None:
+        state = self.current
+        state.scope_depth -= 1
+        while state.locals and state.locals[-1].depth > state.scope_depth:
+            state.locals.pop()
+
+    def add_local(self, name: str) -> int:
+        state = self.current
+        state.locals.append(Local(name, state.scope_depth))
+        state.proto.num_slots = max(state.proto.num_slots, len(state.locals))
+        return len(state.locals) - 1
+
+    def declare(self, name: Token) -> int | None:
+        if self.current.scope_depth == 0:
+            return None
+        return self.declare_local(name)
+
+    def declare_local(self, name: Token) -> int:
+        state = self.current
+        for local in reversed(state.locals):
+            if local.depth < state.scope_depth:
+                break
+            if local.name == name.lexeme:
+                self.error(
+                    name, "Already variable with this name in this scope."
+                )
+        return self.add_local(name.lexeme)
+
+    def define(self, name: Token, slot: int | None) -> None:
+        if slot is None:
+            self.emit(op.DEFINE_GLOBAL, self.make_name(name.lexeme))
+            return
+        local = self.current.locals[slot]
+        local.defined = True
+        self.emit_local(op.DEFINE_LOCAL, slot)
+
+    def emit_local(self, opcode: int, slot: int) -> None:
+        local = self.current.locals[slot]
+        if local.captured:
+            self.emit(CELL_VARIANTS[opcode], slot)
+        else:
+            local.positions.append(self.emit(opcode, slot))
+
+    @staticmethod
+    def resolve_local(state: FunctionState, name: str) -> int | None:
+        for slot in range(len(state.locals) - 1, -1, -1):
+            if state.locals[slot].name == name:
+                return slot
+        return None
+
+    def resolve_upvalue(self, state: FunctionState, name: str) -> int | None:
+        if state.enclosing is None:
+            return None
+
+        slot = self.resolve_local(state.enclosing, name)
+        if slot is not None:
+            self.capture(state.enclosing, slot)
+            return self.add_upvalue(state, True, slot)
+
+        index = self.resolve_upvalue(state.enclosing, name)
+        if index is not None:
+            return self.add_upvalue(state, False, index)
+        return None
+
+    @staticmethod
+    def capture(state: FunctionState, slot: int) -> None:
+        local = state.locals[slot]
+        if local.captured:
+            return
+        local.captured = True
+        code = state.proto.code
+        for position in local.positions:
+            code[position] = CELL_VARIANTS[code[position]]
+        local.positions.clear()
+
+    @staticmethod
+    def add_upvalue(state: FunctionState, is_local: bool, index: int) -> int:
+        upvalue = (is_local, index)
+        upvalues = state.proto.upvalues
+        if upvalue in upvalues:
+            return upvalues.index(upvalue)
+        upvalues.append(upvalue)
+        return len(upvalues) - 1
+
+    def named_variable(self, name: str, assign: bool = False) -> None:
+        slot = self.resolve_local(self.current, name)
+        if slot is not None:
+            self.emit_local(op.SET_LOCAL if assign else op.GET_LOCAL, slot)
+            return
+
+        index = self.resolve_upvalue(self.current, name)
+        if index is not None:
+            self.emit(op.SET_UPVALUE if assign else op.GET_UPVALUE, index)
+            return
+
+        self.emit(
+            op.SET_GLOBAL if assign else op.GET_GLOBAL, self.make_name(name)
+        )
+
+    def compile_function(
+        self, function_stmt: stmt.Function, func_type: FunctionType
+    ) -> None:
+        proto = FunctionProto(
+            function_stmt.name.lexeme,
+            len(function_stmt.params),
+            func_type == FunctionType.INITIALIZER,
+        )
+        self.current = FunctionState(self.current, proto, func_type)
+        self.begin_scope()
+
+        if func_type in (FunctionType.METHOD, FunctionType.INITIALIZER):
+            self.current.locals[self.add_local("self")].defined = True
+
+        for param in function_stmt.params:
+            self.current.locals[self.declare_local(param)].defined = True
+
+        for statement in function_stmt.body:
+            self.compile_statement(statement)
+
+        if func_type == FunctionType.INITIALIZER:
+            self.emit_local(op.GET_LOCAL, 0)
+        else:
+            self.emit(op.NIL)
+        self.emit(op.RETURN)
+
+        state = self.current
+        first_param = 0 if func_type == FunctionType.FUNCTION else 1
+        proto.cell_params = [
+            slot
+            for slot in range(first_param + proto.arity)
+            if state.locals[slot].captured
+        ]
+        assert state.enclosing is not None
+        self.current = state.enclosing
+        self.emit(op.CLOSURE, self.make_constant(proto))
+
+    def visit_expression_stmt(self, statement: stmt.Expression):
+        self.compile_expression(statement.expr)
+        self.emit(op.POP)
+
+    def visit_print_stmt(self, statement: stmt.Print):
+        self.compile_expression(statement.expr)
+        self.emit(op.PRINT)
+
+    def visit_var_stmt(self, statement: stmt.Var):
+        self.track(statement.name)
+        slot = self.declare(statement.name)
+        if statement.initializer is not None:
+            self.compile_expression(statement.initializer)
+        else:
+            self.emit(op.NIL)
+        self.define(statement.name, slot)
+
+    def visit_block_stmt(self, block_stmt: stmt.Block):
+        self.begin_scope()
+        for statement in block_stmt.statements:
+            self.compile_statement(statement)
+        self.end_scope()
+
+    def visit_if_stmt(self, statement: stmt.IfStmt):
+        self.compile_expression(statement.condition)
+        else_jump = self.emit_jump(op.POP_JUMP_IF_FALSE)
+        self.compile_statement(statement.then_stmt)
+
+        if statement.else_stmt is None:
+            self.patch_jump(else_jump)
+            return
+
+        end_jump = self.emit_jump(op.JUMP)
+        self.patch_jump(else_jump)
+        self.compile_statement(statement.else_stmt)
+        self.patch_jump(end_jump)
+
+    def visit_while_stmt(self, statement: stmt.While):
+        loop_start = len(self.current.proto.code)
+        self.compile_expression(statement.condition)
+        exit_jump = self.emit_jump(op.POP_JUMP_IF_FALSE)
+        self.compile_statement(statement.body)
+        self.emit(op.JUMP, loop_start)
+        self.patch_jump(exit_jump)
+
+    def visit_function_stmt(self, statement: stmt.Function):
+        self.track(statement.name)
+        slot = self.declare(statement.name)
+        if slot is None:
+            self.compile_function(statement, FunctionType.FUNCTION)
+            self.define(statement.name, slot)
+            return
+
+        local = self.current.locals[slot]
+        local.defined = True
+        self.compile_function(statement, FunctionType.FUNCTION)
+
+        if not local.captured:
+            self.emit_local(op.DEFINE_LOCAL, slot)
+            return
+
+        # The function refers to itself, so its cell has to exist before
+        # the closure captures it.
+        code = self.current.proto.code
+        proto_index = code[-1]
+        del code[-2:]
+        self.current.proto.lines.pop()
+        self.emit(op.NEW_CELL, slot)
+        self.emit(op.CLOSURE, proto_index)
+        self.emit(op.SET_CELL, slot)
+        self.emit(op.POP)
+
+    def visit_return_stmt(self, statement: stmt.Return):
+        self.track(statement.keyword)
+        if self.current.function_type == FunctionType.NONE:
+            self.error(statement.keyword, "Can't return from top-level code.")
+        elif self.current.function_type == FunctionType.INITIALIZER:
+            self.error(statement.keyword, "Can't return from initializer.")
+
+        if statement.value is not None:
+            self.compile_expression(statement.value)
+        else:
+            self.emit(op.NIL)
+        self.emit(op.RETURN)
+
+    def visit_class_stmt(self, statement: stmt.Class):
+        self.track(statement.name)
+        enclosing_class = self.current_class
+        self.current_class = ClassType.CLASS
+
+        slot = self.declare(statement.name)
+        if slot is not None:
+            self.current.locals[slot].defined = True
+        self.emit(op.CLASS, self.make_name(statement.name.lexeme))
+        self.define(statement.name, slot)
+
+        if statement.superclass is not None:
+            if statement.name.lexeme == statement.superclass.token.lexeme:
+                self.error(
+                    statement.superclass.token,
+                    "A class can't inherit from itself.",
+                )
+            self.current_class = ClassType.SUBCLASS
+
+            self.begin_scope()
+            self.compile_expression(statement.superclass)
+            super_slot = self.add_local("super")
+            self.current.locals[super_slot].defined = True
+            self.emit_local(op.DEFINE_LOCAL, super_slot)
+
+            self.named_variable(statement.name.lexeme)
+            self.named_variable("super")
+            self.emit(op.INHERIT)
+        else:
+            self.named_variable(statement.name.lexeme)
+
+        for method in statement.methods:
+            self.track(method.name)
+            func_type = FunctionType.METHOD
+            if method.name.lexeme == "init":
+                func_type = FunctionType.INITIALIZER
+            self.compile_function(method, func_type)
+            self.emit(op.METHOD, self.make_name(method.name.lexeme))
+
+        self.emit(op.POP)
+        if statement.superclass is not None:
+            self.end_scope()
+
+        self.current_class = enclosing_class
+
+    def visit_literal_expr(self, literal_expr: expr.Literal):
+        value = literal_expr.value
+        if value is None:
+            self.emit(op.NIL)
+        elif value is True:
+            self.emit(op.TRUE)
+        elif value is False:
+            self.emit(op.FALSE)
+        else:
+            self.emit(op.CONSTANT, self.make_constant(value))
+
+    def visit_grouping_expr(self, grouping_expr: expr.Grouping):
+        self.compile_expression(grouping_expr.expr)
+
+    def visit_unary_expr(self, unary_expr: expr.Unary):
+        self.compile_expression(unary_expr.right)
+        self.track(unary_expr.operator)
+        if unary_expr.operator.token_type == TokenType.BANG:
+            self.emit(op.NOT)
+        else:
+            self.emit(op.NEGATE)
+
+    def visit_binary_expr(self, binary_expr: expr.Binary):
+        self.compile_expression(binary_expr.left)
+        self.compile_expression(binary_expr.right)
+        self.track(binary_expr.operator)
+        self.emit(BINARY_OPCODES[binary_expr.operator.token_type])
+
+    def visit_logical_expr(self, logical_expr: expr.Logical):
+        self.compile_expression(logical_expr.left)
+        if logical_expr.operator.token_type == TokenType.OR:
+            jump = self.emit_jump(op.JUMP_IF_TRUE)
+        else:
+            jump = self.emit_jump(op.JUMP_IF_FALSE)
+        self.emit(op.POP)
+        self.compile_expression(logical_expr.right)
+        self.patch_jump(jump)
+
+    def visit_var_expr(self, var_expr: expr.Var):
+        self.track(var_expr.token)
+        state = self.current
+        slot = self.resolve_local(state, var_expr.token.lexeme)
+        if (
+            slot is not None
+            and state.locals[slot].depth == state.scope_depth
+            and not state.locals[slot].defined
+        ):
+            self.error(
+                var_expr.token,
+                "Can't read local variable in its own initializer.",
+            )
+        self.named_variable(var_expr.token.lexeme)
+
+    def visit_assign_expr(self, assign_expr: expr.Assign):
+        self.compile_expression(assign_expr.value)
+        self.track(assign_expr.name)
+        self.named_variable(assign_expr.name.lexeme, assign=True)
+
+    def visit_call_expr(self, call_expr: expr.Call):
+        calle = call_expr.calle
+        argc = len(call_expr.arguments)
+
+        if isinstance(calle, expr.Get):
+            self.compile_expression(calle.expression)
+            for argument in call_expr.arguments:
+                self.compile_expression(argument)
+            self.track(calle.name)
+            name = self.make_name(calle.name.lexeme)
+            self.emit(op.INVOKE, name << op.ARGC_BITS | argc)
+            return
+
+        if isinstance(calle, expr.Super):
+            self.check_super(calle)
+            self.named_variable("self")
+            for argument in call_expr.arguments:
+                self.compile_expression(argument)
+            self.named_variable("super")
+            self.track(calle.method)
+            name = self.make_name(calle.method.lexeme)
+            self.emit(op.SUPER_INVOKE, name << op.ARGC_BITS | argc)
+            return
+
+        self.compile_expression(calle)
+        for argument in call_expr.arguments:
+            self.compile_expression(argument)
+        self.track(call_expr.paren)
+        self.emit(op.CALL, argc)
+
+    def visit_get_expr(self, get_expr: expr.Get):
+        self.compile_expression(get_expr.expression)
+        self.track(get_expr.name)
+        self.emit(op.GET_PROPERTY, self.make_name(get_expr.name.lexeme))
+
+    def visit_set_expr(self, set_expr: expr.Set):
+        self.compile_expression(set_expr.expression)
+        self.compile_expression(set_expr.value)
+        self.track(set_expr.name)
+        self.emit(op.SET_PROPERTY, self.make_name(set_expr.name.lexeme))
+
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        for element in list_expr.elements:
+            self.compile_expression(element)
+        self.track(list_expr.bracket)
+        self.emit(op.BUILD_LIST, len(list_expr.elements))
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        self.compile_expression(index_expr.expression)
+        self.compile_expression(index_expr.index)
+        self.track(index_expr.bracket)
+        self.emit(op.GET_INDEX)
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        self.compile_expression(set_expr.expression)
+        self.compile_expression(set_expr.index)
+        self.compile_expression(set_expr.value)
+        self.track(set_expr.bracket)
+        self.emit(op.SET_INDEX)
+
+    def visit_self_expr(self, self_expr: expr.Self):
+        if self.current_class is ClassType.NONE:
+            self.error(
+                self_expr.keyword, "Can't use 'self' outside of a class."
+            )
+        self.named_variable("self")
+
+    def visit_super_expr(self, super_expr: expr.Super):
+        self.check_super(super_expr)
+        self.named_variable("self")
+        self.named_variable("super")
+        self.track(super_expr.method)
+        self.emit(op.GET_SUPER, self.make_name(super_expr.method.lexeme))
+
+    def check_super(self, super_expr: expr.Super) -> None:
+        if self.current_class is ClassType.NONE:
+            self.error(
+                super_expr.keyword, "Can't use 'super' outside of a class."
+            )
+        elif self.current_class != ClassType.SUBCLASS:
+            self.error(
+                super_expr.keyword,
+                "Can't use 'super' in a class with no superclass.",
+            )
+
+    @staticmethod
+    def error(token: Token, message: str):
+        msg = f"Error: {message}, token: {token}"
+        raise ResolveError(msg)
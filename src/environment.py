@@ -2,40 +2,81 @@ import typing as t
 
 from plox_token import Token
 
+UNDEFINED = object()
+
+
+class GlobalCell:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value: t.Any = UNDEFINED
 
-class Environment:
-    def __init__(self, enclosing: t.Optional["Environment"] = None):
-        self.var_values: dict = {}
-        self.enclosing = enclosing
+
+class GlobalEnvironment:
+    # Each global name owns one cell for the lifetime of the environment,
+    # so call sites may cache it: later definitions and redefinitions
+    # update the cell in place.
+    def __init__(self):
+        self.cells: dict[str, GlobalCell] = {}
+
+    def cell(self, name: str) -> GlobalCell:
+        cell = self.cells.get(name)
+        if cell is None:
+            cell = self.cells[name] = GlobalCell()
+        return cell
 
     def define_var(self, name: str, value: t.Any) -> None:
-        self.var_values[name] = value
+        self.cell(name).value = value
 
     def get_var(self, name: Token) -> t.Any:
-        if name.lexeme in self.var_values:
-            return self.var_values[name.lexeme]
-        elif self.enclosing is not None:
-            return self.enclosing.get_var(name)
-        raise RuntimeError(f"Undefined variable {name}.")
+        return self.get_cell(self.cell(name.lexeme), name)
 
     def assign(self, name: Token, value: t.Any) -> None:
-        if name.lexeme in self.var_values:
-            self.var_values[name.lexeme] = value
-        elif self.enclosing:
-            self.enclosing.assign(name, value)
-        else:
+        self.assign_cell(self.cell(name.lexeme), name, value)
+
+    @staticmethod
+    def get_cell(cell: GlobalCell, name: Token) -> t.Any:
+        value = cell.value
+        if value is UNDEFINED:
+            raise RuntimeError(f"Undefined variable {name}.")
+        return value
+
+    @staticmethod
+    def assign_cell(cell: GlobalCell, name: Token, value: t.Any) -> None:
+        if cell.value is UNDEFINED:
             raise RuntimeError(name, f"Undefined variable '{name}'.")
+        cell.value = value
 
-    def ancestor(self, distance: int) -> "Environment":
-        environment = self
-        for _ in range(distance):
-            if environment.enclosing is None:
-                raise RuntimeError("No ancestor at the given distance")
-            environment = environment.enclosing
-        return environment
 
-    def get_at(self, distance: int, name: str) -> t.Any:
-        return self.ancestor(distance).var_values.get(name)
+class Environment:
+    # Local scopes are addressed by the (depth, slot) pairs the Resolver
+    # assigns. Slots follow declaration order, so defining a variable
+    # appends to values.
+    __slots__ = ("values", "enclosing")
 
-    def assign_at(self, distance: int, name: Token, value: t.Any) -> None:
-        self.ancestor(distance).var_values[name.lexeme] = value
+    def __init__(
+        self,
+        enclosing: t.Union["Environment", GlobalEnvironment],
+        values: t.Optional[list] = None,
+    ):
+        self.values: list = [] if values is None else values
+        self.enclosing = enclosing
+
+    def define_var(self, name: str, value: t.Any) -> None:
+        self.values.append(value)
+
+    def get_at(self, distance: int, slot: int) -> t.Any:
+        # Resolved distances never reach the GlobalEnvironment, so the
+        # walk only ever sees Environments.
+        environment: t.Any = self
+        while distance:
+            environment = environment.enclosing
+            distance -= 1
+        return environment.values[slot]
+
+    def assign_at(self, distance: int, slot: int, value: t.Any) -> None:
+        environment: t.Any = self
+        while distance:
+            environment = environment.enclosing
+            distance -= 1
+        environment.values[slot] = value
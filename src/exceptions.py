@@ -2,11 +2,13 @@ class ParserError(RuntimeError):
     pass
 
 
-class ReturnError(RuntimeError):
-    def __init__(self, value):
-        super().__init__()
-        self.value = value
-
-
 class ResolveError(RuntimeError):
     pass
+
+
+def error_message(error: RuntimeError) -> str:
+    # Errors raised as RuntimeError(token, message) report the message
+    # alone, so every engine prints the same line for the same error.
+    if len(error.args) == 2:
+        return str(error.args[1])
+    return str(error)
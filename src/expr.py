@@ -1,3 +1,4 @@
+# Generated by tools/generate_ast.py, do not edit.
 from typing import Any
 
 from plox_token import Token
@@ -6,7 +7,8 @@ from plox_token import Token
 class Expr:
     """
     Expression -> Assignment ;
-    assignment -> ( Call ".")? IDENTIFIER "=" Assignment | Equality ;
+    assignment -> ( Call ".")? IDENTIFIER "=" Assignment
+        | Call "[" Expression "]" "=" Assignment | Equality ;
     Logic_or → Logic_and ( "or" Logic_and )* ;
     Logic_and → Equality ( "and" Equality )* ;
     Equality -> Comparison ( ( "!=" | "==" ) Comparison )* ;
@@ -14,14 +16,18 @@ class Expr:
     Term → Factor ( ( "-" | "+" ) Factor )* ;
     Factor → Unary ( ( "/" | "*" ) Unary )* ;
     Unary -> ("!" | "-")Unary | Primary;
-    Call -> Primary ( "(" arguments? ")" | "." IDENTIFIER )* ;
+    Call -> Primary ( "(" arguments? ")" | "." IDENTIFIER
+        | "[" Expression "]" )* ;
     Primary -> "true" | "false" | "nil"
         |  NUMBER | STRING
         | "(" expression ")"
+        | "[" arguments? "]"
         | IDENTIFIER ;
         | "super" "." IDENTIFIER ;
     """
 
+    __slots__ = ()
+
     def accept(self, visitor):
         raise NotImplementedError(
             "accept method must be implemented by Expr subclasses"
@@ -29,6 +35,8 @@ class Expr:
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -39,6 +47,8 @@ class Binary(Expr):
 
 
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
@@ -48,6 +58,8 @@ class Unary(Expr):
 
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: Any):
         self.value = value
 
@@ -56,6 +68,8 @@ class Literal(Expr):
 
 
 class Grouping(Expr):
+    __slots__ = ("expr",)
+
     def __init__(self, expr: Expr):
         self.expr = expr
 
@@ -64,6 +78,8 @@ class Grouping(Expr):
 
 
 class Assign(Expr):
+    __slots__ = ("name", "value")
+
     def __init__(self, name: Token, value: Expr):
         self.name = name
         self.value = value
@@ -73,6 +89,8 @@ class Assign(Expr):
 
 
 class Var(Expr):
+    __slots__ = ("token",)
+
     def __init__(self, token: Token):
         self.token = token
 
@@ -81,6 +99,8 @@ class Var(Expr):
 
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -91,35 +111,46 @@ class Logical(Expr):
 
 
 class Call(Expr):
+    __slots__ = ("calle", "paren", "arguments", "tail")
+
     def __init__(self, calle: Expr, paren: Token, arguments: list[Expr]):
         self.calle = calle
         self.paren = paren
         self.arguments = arguments
+        self.tail = None
 
     def accept(self, visitor):
         return visitor.visit_call_expr(self)
 
 
 class Get(Expr):
+    __slots__ = ("expression", "name", "cache")
+
     def __init__(self, expression: Expr, name: Token):
         self.expression = expression
         self.name = name
+        self.cache = None
 
     def accept(self, visitor):
         return visitor.visit_get_expr(self)
 
 
 class Set(Expr):
+    __slots__ = ("expression", "name", "value", "cache")
+
     def __init__(self, expression: Expr, name: Token, value: Expr):
         self.expression = expression
         self.name = name
         self.value = value
+        self.cache = None
 
     def accept(self, visitor):
         return visitor.visit_set_expr(self)
 
 
 class Self(Expr):
+    __slots__ = ("keyword",)
+
     def __init__(self, keyword: Token):
         self.keyword = keyword
 
@@ -128,9 +159,49 @@ class Self(Expr):
 
 
 class Super(Expr):
+    __slots__ = ("keyword", "method")
+
     def __init__(self, keyword: Token, method: Token):
         self.keyword = keyword
         self.method = method
 
     def accept(self, visitor):
         return visitor.visit_super_expr(self)
+
+
+class ListLiteral(Expr):
+    __slots__ = ("bracket", "elements")
+
+    def __init__(self, bracket: Token, elements: list[Expr]):
+        self.bracket = bracket
+        self.elements = elements
+
+    def accept(self, visitor):
+        return visitor.visit_list_literal_expr(self)
+
+
+class Index(Expr):
+    __slots__ = ("expression", "bracket", "index")
+
+    def __init__(self, expression: Expr, bracket: Token, index: Expr):
+        self.expression = expression
+        self.bracket = bracket
+        self.index = index
+
+    def accept(self, visitor):
+        return visitor.visit_index_expr(self)
+
+
+class SetIndex(Expr):
+    __slots__ = ("expression", "bracket", "index", "value")
+
+    def __init__(
+        self, expression: Expr, bracket: Token, index: Expr, value: Expr
+    ):
+        self.expression = expression
+        self.bracket = bracket
+        self.index = index
+        self.value = value
+
+    def accept(self, visitor):
+        return visitor.visit_set_index_expr(self)
@@ -0,0 +1,91 @@
+import typing as t
+
+from plox_instance import LoxInstance, Shape
+from plox_token import Token
+
+# A site stops caching new shapes once it has seen this many, and falls
+# back to the full lookup for any shape it does not know.
+POLYMORPHIC_LIMIT = 4
+
+
+class PropertyCache:
+    """Per-site inline cache for one expr.Get or expr.Set node.
+
+    Entries are keyed by the receiver's Shape. Every class has its own
+    root shape, so a shape also pins down the class. A Get entry is
+    (slot, None) for a field and (None, method) for a method. A Set
+    entry is (slot, None) when the field exists and (None, next_shape)
+    when the write adds it.
+    """
+
+    __slots__ = ("entries", "hits", "misses")
+
+    def __init__(self):
+        self.entries: dict[Shape, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, instance: LoxInstance, name: Token) -> tuple:
+        entry = self.entries.get(instance.shape)
+        if entry is None:
+            return self.get_miss(instance, name)
+        self.hits += 1
+        return entry
+
+    def get(self, instance: LoxInstance, name: Token) -> t.Any:
+        slot, method = self.lookup(instance, name)
+        if method is None:
+            return instance.values[slot]
+        return method.bind(instance)
+
+    def get_miss(self, instance: LoxInstance, name: Token) -> tuple:
+        self.misses += 1
+        slot = instance.shape.slots.get(name.lexeme)
+        if slot is not None:
+            entry = (slot, None)
+        else:
+            method = instance.klass.get_method(name.lexeme)
+            if method is None:
+                raise RuntimeError(
+                    name, f"Undefined property '{name.lexeme}'."
+                )
+            entry = (None, method)
+
+        if len(self.entries) < POLYMORPHIC_LIMIT:
+            self.entries[instance.shape] = entry
+        return entry
+
+    def set(self, instance: LoxInstance, name: Token, value: t.Any) -> None:
+        entry = self.entries.get(instance.shape)
+        if entry is None:
+            entry = self.set_miss(instance, name)
+        else:
+            self.hits += 1
+
+        slot, next_shape = entry
+        if next_shape is None:
+            instance.values[slot] = value
+        else:
+            instance.shape = next_shape
+            instance.values.append(value)
+
+    def set_miss(self, instance: LoxInstance, name: Token) -> tuple:
+        self.misses += 1
+        shape = instance.shape
+        slot = shape.slots.get(name.lexeme)
+        if slot is not None:
+            entry = (slot, None)
+        else:
+            entry = (None, shape.with_field(name.lexeme))
+
+        if len(self.entries) < POLYMORPHIC_LIMIT:
+            self.entries[shape] = entry
+        return entry
+
+
+def cache_stats(caches: list[PropertyCache]) -> dict[str, int]:
+    return {
+        "sites": len(caches),
+        "hits": sum(cache.hits for cache in caches),
+        "misses": sum(cache.misses for cache in caches),
+    }
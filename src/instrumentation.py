@@ -0,0 +1,99 @@
+import typing as t
+from collections import Counter
+
+import expr
+from environment import Environment
+from interpreter import Interpreter
+from plox_function import LoxFunction
+
+# Nodes whose evaluation walks the environment chain the resolver
+# measured for them.
+RESOLVED_VISITS = {
+    "visit_var_expr",
+    "visit_assign_expr",
+    "visit_self_expr",
+    "visit_super_expr",
+}
+
+
+class InstrumentedInterpreter(Interpreter):
+    """Interpreter that counts what its hot paths do.
+
+    Every visit_* method is wrapped to count its calls, and variable
+    accesses record how many environments they walk. Environment
+    allocations and LoxFunction.bind calls are counted by hooks that
+    are only installed while interpret() runs, so the plain Interpreter
+    pays nothing for any of this.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.visits: Counter[str] = Counter()
+        self.hops: Counter[int | str] = Counter()
+        self.environments = 0
+        self.max_chain = 0
+        self.binds = 0
+
+    def interpret(self, statements) -> bool:
+        interpreter = self
+        environment_init = Environment.__init__
+        bind = LoxFunction.bind
+
+        def counting_init(environment, *args, **kwargs):
+            environment_init(environment, *args, **kwargs)
+            interpreter.count_environment(environment)
+
+        def counting_bind(function, instance):
+            interpreter.binds += 1
+            return bind(function, instance)
+
+        Environment.__init__ = counting_init
+        LoxFunction.bind = counting_bind
+        try:
+            return super().interpret(statements)
+        finally:
+            Environment.__init__ = environment_init
+            LoxFunction.bind = bind
+
+    def count_environment(self, environment: Environment) -> None:
+        self.environments += 1
+        chain = 0
+        while isinstance(environment, Environment):
+            chain += 1
+            environment = environment.enclosing
+        self.max_chain = max(self.max_chain, chain)
+
+    def count_hops(self, expression: expr.Expr) -> None:
+        local = self.locals.get(expression)
+        self.hops[local[0] if local is not None else "global"] += 1
+
+    def stats(self) -> dict[str, t.Any]:
+        return {
+            "environments": self.environments,
+            "max_environment_chain": self.max_chain,
+            "binds": self.binds,
+            "returns": self.visits["visit_return_stmt"],
+            "lookup_hops": dict(
+                sorted(self.hops.items(), key=lambda item: str(item[0]))
+            ),
+            "visits": dict(self.visits.most_common()),
+        }
+
+
+def counting(name: str, visit: t.Any) -> t.Callable:
+    # visit is the raw class attribute; some visitors are staticmethods.
+    resolved = name in RESOLVED_VISITS
+
+    def counted(self, node, *args):
+        self.visits[name] += 1
+        if resolved:
+            self.count_hops(node)
+        return visit.__get__(self)(node, *args)
+
+    counted.__name__ = name
+    return counted
+
+
+for name, visit in vars(Interpreter).items():
+    if name.startswith("visit_"):
+        setattr(InstrumentedInterpreter, name, counting(name, visit))
@@ -1,41 +1,110 @@
+import itertools
+import typing as t
+
 import expr
 import stmt
-from callable import ClockCallable, PloxCallable
-from environment import Environment
-from exceptions import ReturnError
+from callable import (
+    AppendCallable,
+    ClockCallable,
+    FlushCallable,
+    LenCallable,
+    ListCallable,
+    PloxCallable,
+    PopCallable,
+)
+from environment import (
+    UNDEFINED,
+    Environment,
+    GlobalCell,
+    GlobalEnvironment,
+)
+from exceptions import error_message
+from inline_cache import PropertyCache
+from output import Output
 from plox_class import LoxClass
-from plox_function import LoxFunction
+from plox_function import LoxFunction, TailCall
 from plox_instance import LoxInstance
+from plox_list import (
+    LoxList,
+    get_index,
+    set_index,
+)
 from plox_token import Token
+from specialized import GenericBinary, specialize
 from token_type import TokenType
 
 
+def is_tail_callable(calle: t.Any) -> bool:
+    return calle.__class__ is LoxFunction and not calle.is_initializer
+
+
 class Interpreter:
+    # Every property cache is kept for --cache-stats only; otherwise the
+    # nodes own them and a long session would keep each one alive.
+    collect_caches = False
+
     def __init__(self):
-        self.globals = Environment()
-        self.environment = self.globals
-        self.locals: dict[expr, int] = {}
+        self.globals = GlobalEnvironment()
+        self.environment: Environment | GlobalEnvironment = self.globals
+        self.locals: dict[expr, tuple[int, int]] = {}
+        self.global_cells: dict[expr, GlobalCell] = {}
+        self.property_caches: list[PropertyCache] = []
+        self.output = Output()
 
         self.globals.define_var("clock", ClockCallable())
+        self.globals.define_var("flush", FlushCallable())
+        self.globals.define_var("list", ListCallable())
+        self.globals.define_var("append", AppendCallable())
+        self.globals.define_var("len", LenCallable())
+        self.globals.define_var("pop", PopCallable())
 
-    def interpret(self, statements: list[stmt.Stmt]):
+    def interpret(self, statements: list[stmt.Stmt]) -> bool:
         try:
             for statement in statements:
                 self.execute(statement)
         except RuntimeError as error:
-            print(error)
+            self.output.write(error_message(error))
+            return False
+        finally:
+            self.output.flush()
+        return True
+
+    def execute(self, statement: stmt.Stmt) -> t.Optional[tuple]:
+        return statement.accept(self)
+
+    def resolve(self, expression: expr.Expr, depth: int, slot: int):
+        self.locals[expression] = (depth, slot)
 
-    def execute(self, statement: stmt.Stmt):
-        statement.accept(self)
+    def checkpoint(self) -> tuple[int, int]:
+        return len(self.locals), len(self.global_cells)
 
-    def resolve(self, expression: expr.Expr, depth: int):
-        self.locals[expression] = depth
+    def forget_since(self, checkpoint: tuple[int, int]) -> None:
+        # Drops resolution data and cached cells recorded after the
+        # checkpoint, once the nodes they belong to can no longer run.
+        for table, size in zip((self.locals, self.global_cells), checkpoint):
+            for node in list(itertools.islice(table, size, None)):
+                del table[node]
 
     def look_up_var(self, name: Token, var_expr: expr.Var | expr.Self):
-        distance = self.locals.get(var_expr)
-        if distance is not None:
-            return self.environment.get_at(distance, name.lexeme)
-        return self.globals.get_var(name)
+        local = self.locals.get(var_expr)
+        if local is not None:
+            return self.environment.get_at(*local)
+
+        cell = self.global_cells.get(var_expr)
+        if cell is None:
+            cell = self.global_cell(name, var_expr)
+        value = cell.value
+        if value is UNDEFINED:
+            raise RuntimeError(f"Undefined variable {name}.")
+        return value
+
+    def global_cell(self, name: Token, expression: expr.Expr) -> GlobalCell:
+        cell = self.global_cells.get(expression)
+        if cell is None:
+            cell = self.global_cells[expression] = self.globals.cell(
+                name.lexeme
+            )
+        return cell
 
     def visit_expression_stmt(self, statement: stmt.Expression):
         self.evaluate(statement.expr)
@@ -53,8 +122,6 @@ class Interpreter:
                     statement.superclass.token, "Superclass must be a class."
                 )
 
-        self.environment.define_var(statement.name.lexeme, None)
-
         if statement.superclass is not None:
             self.environment = Environment(enclosing=self.environment)
             self.environment.define_var("super", superclass)
@@ -70,41 +137,48 @@ class Interpreter:
         if statement.superclass is not None:
             self.environment = self.environment.enclosing
 
-        self.environment.assign(statement.name, klass)
+        self.environment.define_var(statement.name.lexeme, klass)
 
     def visit_print_stmt(self, statement: stmt.Print):
         value = self.evaluate(statement.expr)
-        print(self.stringify(value))
+        self.output.write(self.stringify(value))
         return None
 
     def visit_return_stmt(self, statement: stmt.Return):
-        value = None
-        if statement.value is not None:
-            value = self.evaluate(statement.value)
+        value = statement.value
+        if value is None:
+            return (None,)
 
-        raise ReturnError(value)
+        if value.__class__ is expr.Call and value.tail:
+            result = self.visit_call_expr(value, True)
+            if result.__class__ is TailCall:
+                return result
+            return (result,)
+        return (self.evaluate(value),)
 
     def visit_if_stmt(self, statement: stmt.IfStmt):
         if self.is_truthy(self.evaluate(statement.condition)):
-            self.execute(statement.then_stmt)
+            return self.execute(statement.then_stmt)
         elif statement.else_stmt is not None:
-            self.execute(statement.else_stmt)
+            return self.execute(statement.else_stmt)
         return None
 
     def visit_block_stmt(self, block_stmt: stmt.Block):
-        self.execute_block(
+        return self.execute_block(
             block_stmt.statements, Environment(enclosing=self.environment)
         )
-        return None
 
     def execute_block(
         self, statements: list[stmt.Stmt], environment: Environment
-    ):
+    ) -> t.Optional[tuple]:
         previous = self.environment
         try:
             self.environment = environment
             for statement in statements:
-                self.execute(statement)
+                completion = statement.accept(self)
+                if completion is not None:
+                    return completion
+            return None
         finally:
             self.environment = previous
 
@@ -116,8 +190,11 @@ class Interpreter:
         self.environment.define_var(statement.name.lexeme, value)
 
     def visit_while_stmt(self, statement: stmt.While):
-        while self.evaluate(statement.condition):
-            self.execute(statement.body)
+        while self.is_truthy(self.evaluate(statement.condition)):
+            completion = self.execute(statement.body)
+            if completion is not None:
+                return completion
+        return None
 
     def visit_var_expr(self, var_expr: expr.Var):
         return self.look_up_var(var_expr.token, var_expr)
@@ -127,11 +204,12 @@ class Interpreter:
         value = self.evaluate(assign_expr.value)
         # self.environment.assign(assign_expr.name.lexeme, value)
 
-        distance = self.locals[assign_expr]
-        if distance is not None:
-            self.environment.assign_at(distance, assign_expr.name, value)
+        local = self.locals.get(assign_expr)
+        if local is not None:
+            self.environment.assign_at(*local, value)
         else:
-            self.globals.assign(assign_expr.name, value)
+            cell = self.global_cell(assign_expr.name, assign_expr)
+            self.globals.assign_cell(cell, assign_expr.name, value)
 
         return value
 
@@ -164,20 +242,105 @@ class Interpreter:
     def visit_binary_expr(self, binary_expr: expr.Binary):
         left = self.evaluate(binary_expr.left)
         right = self.evaluate(binary_expr.right)
+        specialize(binary_expr, left, right)
+        return self.binary_operation(binary_expr.operator, left, right)
 
-        operator_type = binary_expr.operator.token_type
+    def visit_generic_binary_expr(self, binary_expr: expr.Binary):
+        left = self.evaluate(binary_expr.left)
+        right = self.evaluate(binary_expr.right)
+        return self.binary_operation(binary_expr.operator, left, right)
+
+    def deoptimize(self, binary_expr: expr.Binary, left, right):
+        binary_expr.__class__ = GenericBinary
+        return self.binary_operation(binary_expr.operator, left, right)
+
+    def visit_number_add_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left + right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_subtract_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left - right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_multiply_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left * right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_divide_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left / right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_less_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left < right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_less_equal_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left <= right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_greater_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left > right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_number_greater_equal_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is float and type(right) is float:
+            return left >= right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_string_concat_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        if type(left) is str and type(right) is str:
+            return left + right
+        return self.deoptimize(binary_expr, left, right)
+
+    def visit_equal_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        return self.is_equal(left, right)
+
+    def visit_not_equal_expr(self, binary_expr: expr.Binary):
+        left = binary_expr.left.accept(self)
+        right = binary_expr.right.accept(self)
+        return not self.is_equal(left, right)
+
+    def binary_operation(self, operator: Token, left, right):
+        operator_type = operator.token_type
 
         if operator_type == TokenType.GREATER:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) > float(right)
         elif operator_type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) >= float(right)
         elif operator_type == TokenType.LESS:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) < float(right)
         elif operator_type == TokenType.LESS_EQUAL:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) <= float(right)
 
         elif operator_type == TokenType.BANG_EQUAL:
@@ -186,7 +349,7 @@ class Interpreter:
             return self.is_equal(left, right)
 
         elif operator_type == TokenType.MINUS:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) - float(right)
 
         elif operator_type == TokenType.PLUS:
@@ -201,15 +364,20 @@ class Interpreter:
             )
 
         elif operator_type == TokenType.SLASH:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) / float(right)
         elif operator_type == TokenType.STAR:
-            self.check_number_operands(binary_expr.operator, left, right)
+            self.check_number_operands(operator, left, right)
             return float(left) * float(right)
 
         return None
 
-    def visit_call_expr(self, call_expr: expr.Call):
+    def visit_call_expr(self, call_expr: expr.Call, tail: bool = False):
+        # A tail call to a Lox function returns a TailCall instead of
+        # running it; other callees are called as usual.
+        if isinstance(call_expr.calle, expr.Get):
+            return self.invoke(call_expr, call_expr.calle, tail)
+
         calle = self.evaluate(call_expr.calle)
 
         arguments = []
@@ -226,29 +394,98 @@ class Interpreter:
                 f"Expected {function.arity()} arguments, "
                 f"but {len(arguments)} were given."
             )
+        if tail and is_tail_callable(function):
+            return TailCall(function, None, arguments)
         return function.call(self, arguments)
 
+    def invoke(
+        self, call_expr: expr.Call, get_expr: expr.Get, tail: bool = False
+    ):
+        obj = self.evaluate(get_expr.expression)
+        if not isinstance(obj, LoxInstance):
+            raise RuntimeError(
+                get_expr.name, "Only instances have properties."
+            )
+
+        cache = get_expr.cache
+        if cache is None:
+            cache = get_expr.cache = self.property_cache()
+        slot, method = cache.lookup(obj, get_expr.name)
+
+        arguments = []
+        for argument in call_expr.arguments:
+            arguments.append(self.evaluate(argument))
+
+        if method is None:
+            calle = obj.values[slot]
+            if not isinstance(calle, PloxCallable):
+                raise RuntimeError("Can only call functions and classes.")
+        else:
+            calle = method
+
+        if len(arguments) != calle.arity():
+            raise RuntimeError(
+                f"Expected {calle.arity()} arguments, "
+                f"but {len(arguments)} were given."
+            )
+        if tail and is_tail_callable(calle):
+            instance = None if method is None else obj
+            return TailCall(calle, instance, arguments)
+        if method is None:
+            return calle.call(self, arguments)
+        return method.invoke(self, obj, arguments)
+
     def visit_get_expr(self, get_expr: expr.Get):
         obj = self.evaluate(get_expr.expression)
         if isinstance(obj, LoxInstance):
-            return obj.get(get_expr.name)
-        raise RuntimeError(obj.name, "Only instances have properties.")
+            cache = get_expr.cache
+            if cache is None:
+                cache = get_expr.cache = self.property_cache()
+            return cache.get(obj, get_expr.name)
+        raise RuntimeError(get_expr.name, "Only instances have properties.")
 
     def visit_set_expr(self, set_expr: expr.Set):
         obj = self.evaluate(set_expr.expression)
 
         if not isinstance(obj, LoxInstance):
-            RuntimeError(set_expr.name, "Only instances have fields.")
+            raise RuntimeError(set_expr.name, "Only instances have fields.")
 
         value = self.evaluate(set_expr.value)
-        obj.set(set_expr.name, value)
+        cache = set_expr.cache
+        if cache is None:
+            cache = set_expr.cache = self.property_cache()
+        cache.set(obj, set_expr.name, value)
         return value
 
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        elements = LoxList()
+        for element in list_expr.elements:
+            elements.append(self.evaluate(element))
+        return elements
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        lox_list = self.evaluate(index_expr.expression)
+        index = self.evaluate(index_expr.index)
+        return get_index(lox_list, index)
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        lox_list = self.evaluate(set_expr.expression)
+        index = self.evaluate(set_expr.index)
+        value = self.evaluate(set_expr.value)
+        return set_index(lox_list, index, value)
+
+    def property_cache(self) -> PropertyCache:
+        cache = PropertyCache()
+        if self.collect_caches:
+            self.property_caches.append(cache)
+        return cache
+
     def visit_super_expr(self, super_expr: expr.Super):
-        distance = self.locals.get(super_expr)
-        assert distance is not None
-        superclass: LoxClass = self.environment.get_at(distance, "super")
-        instance = self.environment.get_at(distance - 1, "self")
+        local = self.locals.get(super_expr)
+        assert local is not None
+        distance = local[0]
+        superclass: LoxClass = self.environment.get_at(distance, 0)
+        instance = self.environment.get_at(distance - 1, 0)
 
         method = superclass.get_method(super_expr.method.lexeme)
         if method is None:
@@ -305,4 +542,7 @@ class Interpreter:
             if text.endswith(".0"):
                 text = text[:-2]
             return text
+        if isinstance(value, LoxList):
+            elements = ", ".join(map(Interpreter.stringify, value))
+            return f"[{elements}]"
         return str(value)
@@ -1,38 +1,215 @@
+import argparse
+import contextlib
 import sys
 from parser import Parser
 
+from compiler import Compiler
+from inline_cache import cache_stats
+from instrumentation import InstrumentedInterpreter
 from interpreter import Interpreter
+from optimizer import Optimizer
+from output import Output
+from profiler import Profiler
+from program_cache import ProgramCache
 from resolver import Resolver
-from scanner import Scanner
+from scanner import (
+    RegexScanner,
+    Scanner,
+    StreamScanner,
+)
+from session import INTERPRETERS, Session
+from stack_interpreter import StackInterpreter
+from transpiler import PythonProgram, Transpiler
+from vm import VM
+
+ENGINES = ("tree", "closure", "vm", "python", "stack")
+SCANNERS = {"regex": RegexScanner, "classic": Scanner}
 
 
 class Lox:
     had_error = False
+    cache_stats = False
+    optimize = True
+    scanner = "regex"
+    scan_error = False
+    program_cache = True
+    profile = False
+    stats = False
+    profile_stacks = "lox.folded"
 
     @staticmethod
-    def run_file(filepath):
+    def run_file(filepath, engine="tree"):
         with open(filepath, "r") as file:
             source = file.read()
-            Lox.run(source)
+            Lox.run(source, engine)
+
+    @staticmethod
+    def run_prompt(engine="tree", path=None):
+        # Transpiled programs only run as a whole, so the prompt falls
+        # back to the tree-walker for the python engine.
+        if engine == "python":
+            engine = "tree"
+        session = Session(engine, Lox.prepare, Lox.check)
+
+        if path is not None:
+            with open(path, "r", encoding="utf-8") as file:
+                session.execute(Lox.parse(file.read()))
+        session.run_prompt()
+
+    @staticmethod
+    def run(source, engine="tree", cache=None):
+        program = None
+        if cache is not None:
+            key = ProgramCache.key(source, engine, Lox.optimize)
+            program = cache.load(key)
+        if program is None:
+            program = Lox.compile(source, engine)
+            if cache is not None and not Lox.scan_error:
+                cache.store(key, program)
+
+        if engine == "python":
+            program.run()
+            return
+
+        if engine == "vm":
+            VM().interpret(program)
+            return
+
+        statements, resolved = program
+        if Lox.stats:
+            interpreter = InstrumentedInterpreter()
+        else:
+            interpreter = INTERPRETERS[engine]()
+        interpreter.locals = resolved
+
+        if Lox.profile:
+            with Profiler() as profiler:
+                interpreter.interpret(statements)
+            Lox.report_profile(profiler)
+        else:
+            interpreter.interpret(statements)
+        # print(interpreter.environment.__dict__)
+
+        if Lox.cache_stats:
+            Lox.report_cache_stats(interpreter)
+        if Lox.stats:
+            Lox.report_stats(interpreter.stats())
+
+    @staticmethod
+    def compile(source, engine="tree"):
+        # Runs the front end for one engine. The result only depends on
+        # the source and options, so it can be cached across runs.
+        if engine == "python":
+            return Lox.compile_python(source)
+
+        statements = Lox.parse(source)
+
+        if engine == "vm":
+            Lox.check(statements)
+            return Compiler().compile(Lox.prepare(statements))
+
+        interpreter = INTERPRETERS[engine]()
+        Resolver(interpreter).resolve(statements)
+        return Lox.prepare(statements), interpreter.locals
+
+    @staticmethod
+    def run_stream(lines, engine="tree"):
+        # Each top-level declaration is resolved and executed as soon as
+        # it has been parsed, so output starts before the input ends.
+        if engine == "python":
+            Lox.run("".join(lines), engine)
+            return
+
+        tokens = StreamScanner(lines).iter_tokens()
+        interpreter = InstrumentedInterpreter() if Lox.stats else None
+        session = Session(engine, Lox.prepare, Lox.check, interpreter)
+        profiler = Profiler() if Lox.profile else contextlib.nullcontext()
+
+        with profiler:
+            for declaration in Parser(tokens).iter_declarations():
+                if not session.execute([declaration]):
+                    break
+
+        if Lox.profile:
+            Lox.report_profile(profiler)
+        if Lox.cache_stats and session.interpreter is not None:
+            Lox.report_cache_stats(session.interpreter)
+        if Lox.stats:
+            Lox.report_stats(interpreter.stats())
+
+    @staticmethod
+    def compile_python(source):
+        program = PythonProgram.cached(source, Lox.optimize)
+        if program is None:
+            statements = Lox.parse(source)
+            transpiler = Transpiler()
+            Resolver(transpiler).resolve(statements)
+            python_source = transpiler.transpile(Lox.prepare(statements))
+            program = PythonProgram.compile(
+                source, python_source, Lox.optimize
+            )
+        return program
+
+    @staticmethod
+    def prepare(statements):
+        # Runs after resolution, so static errors in code the optimizer
+        # drops (such as a dead if branch) are still reported.
+        if Lox.optimize:
+            return Optimizer().optimize(statements)
+        return statements
+
+    @staticmethod
+    def check(statements):
+        # The VM compiler does its own resolution, but only of the
+        # prepared program, so the unoptimized one is checked first.
+        if Lox.optimize:
+            Resolver(Interpreter()).resolve(statements)
 
     @staticmethod
-    def run_prompt():
-        while True:
-            try:
-                line = input("> ")
-                Lox.run(line)
+    def report_cache_stats(interpreter):
+        stats = cache_stats(interpreter.property_caches)
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+        print(
+            f"property caches: {stats['sites']} sites, {stats['hits']} hits,"
+            f" {stats['misses']} misses ({hit_rate:.1f}% hit rate)",
+            file=sys.stderr,
+        )
 
-                if Lox.had_error:
-                    sys.exit(65)
+    @staticmethod
+    def report_stats(stats):
+        hops = ", ".join(
+            f"{depth}: {count}"
+            for depth, count in stats["lookup_hops"].items()
+        )
+        lines = [
+            f"environments allocated   {stats['environments']}",
+            f"max environment chain    {stats['max_environment_chain']}",
+            f"method binds             {stats['binds']}",
+            f"returns                  {stats['returns']}",
+            f"lookups by hops          {hops}",
+            "visits:",
+        ]
+        for name, count in stats["visits"].items():
+            lines.append(f"  {name:<30}{count:>12}")
+        print("\n".join(lines), file=sys.stderr)
 
-            except EOFError:
-                print("\nExiting...")
-                break
+    @staticmethod
+    def report_profile(profiler):
+        print(profiler.report(), file=sys.stderr)
+        with open(Lox.profile_stacks, "w", encoding="utf-8") as file:
+            for line in profiler.collapsed_stacks():
+                file.write(line + "\n")
+        print(
+            f"collapsed stacks written to {Lox.profile_stacks}",
+            file=sys.stderr,
+        )
 
     @staticmethod
-    def run(source):
-        scanner = Scanner(source)
+    def parse(source):
+        scanner = SCANNERS[Lox.scanner](source)
         tokens = scanner.scan_tokens()
+        Lox.scan_error = scanner.had_error
         # for token in tokens:
         #     print(token.__dict__)
         if Lox.had_error:
@@ -44,22 +221,21 @@ class Lox:
         # print("statements")
         # for statement in statements:
         #     print(statement, statement.__dict__)
-
-        interpreter = Interpreter()
-
-        resolver = Resolver(interpreter)
-        resolver.resolve(statements)
-
-        interpreter.interpret(statements)
-        # print(interpreter.environment.__dict__)
+        return statements
 
     @staticmethod
-    def read_file(path):
+    def read_file(path, engine="tree", stream=False):
         try:
+            if stream:
+                with open(path, "r", encoding="utf-8") as file:
+                    Lox.run_stream(file, engine)
+                return
+
             with open(path, "rb") as file:
                 bytes_content = file.read()
                 source = bytes_content.decode("utf-8")
-                Lox.run(source)
+            cache = ProgramCache(path) if Lox.program_cache else None
+            Lox.run(source, engine, cache)
         except FileNotFoundError:
             print(f"Error: File '{path}' not found.")
             sys.exit(66)
@@ -78,10 +254,48 @@ class Lox:
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        print("Usage: python lox.py [script]")
-        sys.exit(64)
-    elif len(sys.argv) == 2:
-        Lox.read_file(sys.argv[1])
+    arg_parser = argparse.ArgumentParser(prog="lox.py")
+    arg_parser.add_argument("script", nargs="?")
+    arg_parser.add_argument("--engine", choices=ENGINES, default="tree")
+    arg_parser.add_argument("--cache-stats", action="store_true")
+    arg_parser.add_argument("--no-opt", action="store_true")
+    arg_parser.add_argument("--scanner", choices=SCANNERS, default="regex")
+    arg_parser.add_argument("--stream", action="store_true")
+    arg_parser.add_argument("--no-cache", action="store_true")
+    arg_parser.add_argument("-i", "--interactive", action="store_true")
+    arg_parser.add_argument("--profile", action="store_true")
+    arg_parser.add_argument("--profile-stacks", default=Lox.profile_stacks)
+    arg_parser.add_argument("--stats", action="store_true")
+    arg_parser.add_argument(
+        "--max-frames", type=int, default=StackInterpreter.max_frames
+    )
+    arg_parser.add_argument("--unbuffered", action="store_true")
+    arg_parser.add_argument(
+        "--buffer-size", type=int, default=Output.buffer_size
+    )
+    args = arg_parser.parse_args()
+    if args.stats and args.engine != "tree":
+        arg_parser.error("--stats needs the tree engine")
+    if args.profile and args.engine not in ("tree", "closure"):
+        arg_parser.error("--profile needs the tree or closure engine")
+    if (args.profile or args.stats) and (
+        args.interactive or args.script is None
+    ):
+        arg_parser.error("--profile and --stats need a script")
+    Lox.scanner = args.scanner
+    Lox.cache_stats = args.cache_stats
+    Lox.optimize = not args.no_opt
+    Lox.program_cache = not args.no_cache
+    Lox.profile = args.profile
+    Lox.stats = args.stats
+    Lox.profile_stacks = args.profile_stacks
+    Interpreter.collect_caches = args.cache_stats
+    StackInterpreter.max_frames = args.max_frames
+    Output.buffer_size = 0 if args.unbuffered else args.buffer_size
+
+    if args.script == "-":
+        Lox.run_stream(iter(sys.stdin.readline, ""), args.engine)
+    elif args.interactive or args.script is None:
+        Lox.run_prompt(args.engine, args.script)
     else:
-        Lox.run_prompt()
+        Lox.read_file(args.script, args.engine, args.stream)
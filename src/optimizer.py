@@ -0,0 +1,214 @@
+import typing as t
+
+import expr
+import stmt
+from interpreter import Interpreter
+from token_type import TokenType
+
+is_truthy = Interpreter.is_truthy
+is_equal = Interpreter.is_equal
+
+NUMBER_OPERATORS: dict[TokenType, t.Callable[[float, float], t.Any]] = {
+    TokenType.PLUS: lambda a, b: a + b,
+    TokenType.MINUS: lambda a, b: a - b,
+    TokenType.STAR: lambda a, b: a * b,
+    TokenType.SLASH: lambda a, b: a / b,
+    TokenType.GREATER: lambda a, b: a > b,
+    TokenType.GREATER_EQUAL: lambda a, b: a >= b,
+    TokenType.LESS: lambda a, b: a < b,
+    TokenType.LESS_EQUAL: lambda a, b: a <= b,
+}
+
+
+class Optimizer:
+    """Rewrites a resolved program before it runs.
+
+    Constant Binary/Unary/Logical subtrees are folded into Literals,
+    Grouping wrappers are dropped and if statements with a literal
+    condition are replaced by the branch that would run. Anything that
+    would raise at runtime (type errors, division by zero) is left as is
+    so the error is still reported when the code executes.
+    """
+
+    def optimize(self, statements: list[stmt.Stmt]) -> list[stmt.Stmt]:
+        return [
+            optimized
+            for optimized in map(self.optimize_statement, statements)
+            if optimized is not None
+        ]
+
+    def optimize_statement(self, statement: stmt.Stmt) -> stmt.Stmt | None:
+        return statement.accept(self)
+
+    def optimize_expression(self, expression: expr.Expr) -> expr.Expr:
+        return expression.accept(self)
+
+    def visit_expression_stmt(self, statement: stmt.Expression):
+        statement.expr = self.optimize_expression(statement.expr)
+        return statement
+
+    def visit_print_stmt(self, statement: stmt.Print):
+        statement.expr = self.optimize_expression(statement.expr)
+        return statement
+
+    def visit_var_stmt(self, statement: stmt.Var):
+        if statement.initializer is not None:
+            statement.initializer = self.optimize_expression(
+                statement.initializer
+            )
+        return statement
+
+    def visit_block_stmt(self, block_stmt: stmt.Block):
+        block_stmt.statements = self.optimize(block_stmt.statements)
+        return block_stmt
+
+    def visit_if_stmt(self, statement: stmt.IfStmt):
+        condition = self.optimize_expression(statement.condition)
+
+        if isinstance(condition, expr.Literal):
+            if is_truthy(condition.value):
+                branch = statement.then_stmt
+            else:
+                branch = statement.else_stmt
+            if branch is None:
+                return None
+            return self.optimize_statement(branch)
+
+        statement.condition = condition
+        statement.then_stmt = self.optimize_nested(statement.then_stmt)
+        if statement.else_stmt is not None:
+            statement.else_stmt = self.optimize_nested(statement.else_stmt)
+        return statement
+
+    def visit_while_stmt(self, statement: stmt.While):
+        statement.condition = self.optimize_expression(statement.condition)
+        statement.body = self.optimize_nested(statement.body)
+        return statement
+
+    def optimize_nested(self, statement: stmt.Stmt) -> stmt.Stmt:
+        optimized = self.optimize_statement(statement)
+        if optimized is None:
+            return stmt.Block([])
+        return optimized
+
+    def visit_function_stmt(self, statement: stmt.Function):
+        statement.body = self.optimize(statement.body)
+        return statement
+
+    def visit_return_stmt(self, statement: stmt.Return):
+        if statement.value is not None:
+            statement.value = self.optimize_expression(statement.value)
+        return statement
+
+    def visit_class_stmt(self, statement: stmt.Class):
+        for method in statement.methods:
+            self.visit_function_stmt(method)
+        return statement
+
+    def visit_literal_expr(self, literal_expr: expr.Literal):
+        return literal_expr
+
+    def visit_grouping_expr(self, grouping_expr: expr.Grouping):
+        return self.optimize_expression(grouping_expr.expr)
+
+    def visit_unary_expr(self, unary_expr: expr.Unary):
+        right = self.optimize_expression(unary_expr.right)
+        unary_expr.right = right
+        if not isinstance(right, expr.Literal):
+            return unary_expr
+
+        if unary_expr.operator.token_type == TokenType.BANG:
+            return expr.Literal(not is_truthy(right.value))
+        if type(right.value) is float:
+            return expr.Literal(-right.value)
+        return unary_expr
+
+    def visit_binary_expr(self, binary_expr: expr.Binary):
+        left = self.optimize_expression(binary_expr.left)
+        right = self.optimize_expression(binary_expr.right)
+        binary_expr.left = left
+        binary_expr.right = right
+        if not (
+            isinstance(left, expr.Literal) and isinstance(right, expr.Literal)
+        ):
+            return binary_expr
+
+        a, b = left.value, right.value
+        operator_type = binary_expr.operator.token_type
+
+        if operator_type == TokenType.EQUAL_EQUAL:
+            return expr.Literal(is_equal(a, b))
+        if operator_type == TokenType.BANG_EQUAL:
+            return expr.Literal(not is_equal(a, b))
+
+        if type(a) is float and type(b) is float:
+            if operator_type == TokenType.SLASH and b == 0:
+                return binary_expr
+            return expr.Literal(NUMBER_OPERATORS[operator_type](a, b))
+
+        if (
+            operator_type == TokenType.PLUS
+            and type(a) is str
+            and type(b) is str
+        ):
+            return expr.Literal(a + b)
+        return binary_expr
+
+    def visit_logical_expr(self, logical_expr: expr.Logical):
+        left = self.optimize_expression(logical_expr.left)
+        right = self.optimize_expression(logical_expr.right)
+        logical_expr.left = left
+        logical_expr.right = right
+        if not isinstance(left, expr.Literal):
+            return logical_expr
+
+        if logical_expr.operator.token_type == TokenType.OR:
+            return left if is_truthy(left.value) else right
+        return right if is_truthy(left.value) else left
+
+    def visit_var_expr(self, var_expr: expr.Var):
+        return var_expr
+
+    def visit_assign_expr(self, assign_expr: expr.Assign):
+        assign_expr.value = self.optimize_expression(assign_expr.value)
+        return assign_expr
+
+    def visit_call_expr(self, call_expr: expr.Call):
+        call_expr.calle = self.optimize_expression(call_expr.calle)
+        call_expr.arguments = [
+            self.optimize_expression(argument)
+            for argument in call_expr.arguments
+        ]
+        return call_expr
+
+    def visit_get_expr(self, get_expr: expr.Get):
+        get_expr.expression = self.optimize_expression(get_expr.expression)
+        return get_expr
+
+    def visit_set_expr(self, set_expr: expr.Set):
+        set_expr.expression = self.optimize_expression(set_expr.expression)
+        set_expr.value = self.optimize_expression(set_expr.value)
+        return set_expr
+
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        list_expr.elements = [
+            self.optimize_expression(element) for element in list_expr.elements
+        ]
+        return list_expr
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        index_expr.expression = self.optimize_expression(index_expr.expression)
+        index_expr.index = self.optimize_expression(index_expr.index)
+        return index_expr
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        set_expr.expression = self.optimize_expression(set_expr.expression)
+        set_expr.index = self.optimize_expression(set_expr.index)
+        set_expr.value = self.optimize_expression(set_expr.value)
+        return set_expr
+
+    def visit_self_expr(self, self_expr: expr.Self):
+        return self_expr
+
+    def visit_super_expr(self, super_expr: expr.Super):
+        return super_expr
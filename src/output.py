@@ -0,0 +1,36 @@
+import sys
+
+
+class Output:
+    """Lines printed by a Lox program, written to stdout in bulk.
+
+    Lines pile up until more than buffer_size characters are pending and
+    are then written with a single call. Whoever owns the Output flushes
+    it when the program stops, before reporting an error and before the
+    REPL prompts; Lox code can call flush() itself. A buffer_size of 0
+    writes and flushes every line as it is printed.
+    """
+
+    buffer_size = 64 * 1024
+
+    def __init__(self, buffer_size: int | None = None):
+        if buffer_size is None:
+            buffer_size = Output.buffer_size
+        self.buffer_size = buffer_size
+        self.lines: list[str] = []
+        self.pending = 0
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+        self.pending += len(line) + 1
+        if self.pending > self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            self.lines.append("")
+            text = "\n".join(self.lines)
+            self.lines.clear()
+            self.pending = 0
+            sys.stdout.write(text)
+        sys.stdout.flush()
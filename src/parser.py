@@ -1,3 +1,5 @@
+import typing as t
+
 import expr
 import stmt
 from exceptions import ParserError
@@ -6,15 +8,21 @@ from token_type import TokenType
 
 
 class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.current = 0
+    # Only the current and previous tokens are kept, so tokens can come
+    # from a lazy scanner and be released as soon as they are parsed. The
+    # next token is pulled only when peek() needs it, so a declaration is
+    # complete without waiting for the input that follows it.
+    def __init__(self, tokens: t.Iterable[Token]):
+        self.tokens = iter(tokens)
+        self.current_token: t.Optional[Token] = None
+        self.previous_token: t.Optional[Token] = None
 
     def parse(self) -> list[stmt.Stmt]:
-        statements = []
+        return list(self.iter_declarations())
+
+    def iter_declarations(self) -> t.Iterator[stmt.Stmt]:
         while not self.is_at_end():
-            statements.append(self.declaration())
-        return statements
+            yield self.declaration()
 
     def declaration(self):
         if self.match(TokenType.CLASS):
@@ -194,6 +202,11 @@ class Parser:
             elif isinstance(expression, expr.Get):
                 get = expression
                 return expr.Set(get.expression, get.name, value)
+            elif isinstance(expression, expr.Index):
+                index = expression
+                return expr.SetIndex(
+                    index.expression, index.bracket, index.index, value
+                )
 
             raise ParserError(f"Invalid assigment target: {type(expression)}")
 
@@ -284,6 +297,13 @@ class Parser:
                     TokenType.IDENTIFIER, "Expect property name after '.'."
                 )
                 expression = expr.Get(expression, name)
+            elif self.match(TokenType.LEFT_BRACKET):
+                bracket = self.previous()
+                index = self.expression()
+                self.consume(
+                    TokenType.RIGHT_BRACKET, "Expect ']' after index."
+                )
+                expression = expr.Index(expression, bracket, index)
             else:
                 break
 
@@ -307,6 +327,18 @@ class Parser:
         )
         return expr.Call(callee, paren, arguments)
 
+    def list_literal(self, bracket: Token) -> expr.Expr:
+        elements = []
+        if not self.check(TokenType.RIGHT_BRACKET):
+
+            while True:
+                elements.append(self.expression())
+                if not self.match(TokenType.COMMA):
+                    break
+
+        self.consume(TokenType.RIGHT_BRACKET, "Expect ']' after elements.")
+        return expr.ListLiteral(bracket, elements)
+
     def primary(self) -> expr.Expr:
         if self.match(TokenType.FALSE):
             return expr.Literal(False)
@@ -323,6 +355,9 @@ class Parser:
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
             return expr.Grouping(expression)
 
+        elif self.match(TokenType.LEFT_BRACKET):
+            return self.list_literal(self.previous())
+
         elif self.match(TokenType.SUPER):
             keyword = self.previous()
             self.consume(TokenType.DOT, "Expect '.' after 'super'.")
@@ -367,14 +402,17 @@ class Parser:
 
     def advance(self) -> Token:
         if not self.is_at_end():
-            self.current += 1
+            self.previous_token = self.current_token
+            self.current_token = None
         return self.previous()
 
     def peek(self) -> Token:
-        return self.tokens[self.current]
+        if self.current_token is None:
+            self.current_token = next(self.tokens)
+        return self.current_token
 
     def previous(self) -> Token:
-        return self.tokens[self.current - 1]
+        return self.previous_token
 
     def is_at_end(self) -> bool:
         return self.peek().token_type == TokenType.EOF
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 
 from callable import PloxCallable
 from plox_function import LoxFunction
-from plox_instance import LoxInstance
+from plox_instance import LoxInstance, Shape
 
 if TYPE_CHECKING:
     from interpreter import Interpreter
@@ -20,28 +20,29 @@ class LoxClass(PloxCallable):
         self.name = name
         self.superclass = superclass
         self.methods = methods
+        self.shape = Shape()
+
+        self.method_table: dict[str, LoxFunction] = {}
+        if superclass is not None:
+            self.method_table.update(superclass.method_table)
+        self.method_table.update(methods)
+        self.initializer = self.method_table.get("init")
 
     def call(self, interpreter: "Interpreter", arguments: list) -> LoxInstance:
         instance = LoxInstance(self)
 
-        initializer = self.get_method("init")
-        if initializer is not None:
-            initializer.bind(instance).call(interpreter, arguments)
+        if self.initializer is not None:
+            self.initializer.invoke(interpreter, instance, arguments)
 
         return instance
 
-    def get_method(self, name: str) -> LoxFunction:
-        if name in self.methods:
-            return self.methods[name]
-
-        if self.superclass is not None:
-            return self.superclass.get_method(name)
+    def get_method(self, name: str) -> t.Optional[LoxFunction]:
+        return self.method_table.get(name)
 
     def arity(self) -> int:
-        initializer = self.get_method("init")
-        if initializer is None:
+        if self.initializer is None:
             return 0
-        return initializer.arity()
+        return self.initializer.arity()
 
     def __str__(self) -> str:
         return self.name
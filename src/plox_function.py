@@ -4,7 +4,6 @@ from enum import Enum
 import stmt
 from callable import PloxCallable
 from environment import Environment
-from exceptions import ReturnError
 from plox_instance import LoxInstance
 
 if t.TYPE_CHECKING:
@@ -30,28 +29,94 @@ class LoxFunction(PloxCallable):
         interpreter: "Interpreter",
         arguments: list[t.Any],
     ) -> t.Any:
-        environment = Environment(self.closure)
-        for i in range(self.arity()):
-            parameter_name = self.declaration.params[i].lexeme
-            argument_value = arguments[i] if i < len(arguments) else None
-            environment.define_var(parameter_name, argument_value)
-        try:
-            interpreter.execute_block(self.declaration.body, environment)
-        except ReturnError as return_value:
-            return return_value.value
+        environment = Environment(self.closure, list(arguments))
+        completion = interpreter.execute_block(
+            self.declaration.body, environment
+        )
 
         if self.is_initializer:
-            return self.closure.get_at(0, "self")
+            return self.closure.get_at(0, 0)
+        if completion is not None:
+            if completion.__class__ is TailCall:
+                return completion.run(interpreter)
+            return completion[0]
+        return None
+
+    def invoke(
+        self,
+        interpreter: "Interpreter",
+        instance: LoxInstance,
+        arguments: list[t.Any],
+    ) -> t.Any:
+        bound = Environment(self.closure, [instance])
+        completion = interpreter.execute_block(
+            self.declaration.body, Environment(bound, arguments)
+        )
+
+        if self.is_initializer:
+            return instance
+        if completion is not None:
+            if completion.__class__ is TailCall:
+                return completion.run(interpreter)
+            return completion[0]
+        return None
+
+    def execute(
+        self,
+        interpreter: "Interpreter",
+        instance: t.Optional[LoxInstance],
+        arguments: list[t.Any],
+    ) -> t.Union[tuple, "TailCall", None]:
+        # Runs one pending tail call; the caller handles what it returns.
+        closure = self.closure
+        if instance is not None:
+            closure = Environment(closure, [instance])
+        return interpreter.execute_block(
+            self.declaration.body, Environment(closure, arguments)
+        )
 
     def bind(self, instance: LoxInstance) -> "LoxFunction":
-        environment = Environment(self.closure)
-        environment.define_var("self", instance)
+        environment = Environment(self.closure, [instance])
         return LoxFunction(self.declaration, environment, self.is_initializer)
 
     def __str__(self) -> str:
         return f"<{self.declaration.name.lexeme}>"
 
 
+class TailCall:
+    """Completion of a `return f(...)` whose call was left pending.
+
+    The function that got it back runs the call, and any tail calls
+    that call makes in turn, in a loop instead of recursing, so
+    tail-recursive Lox code runs in constant Python stack.
+    """
+
+    __slots__ = ("function", "instance", "arguments")
+
+    def __init__(
+        self,
+        function: t.Any,
+        instance: t.Optional[LoxInstance],
+        arguments: list[t.Any],
+    ):
+        self.function = function
+        self.instance = instance
+        self.arguments = arguments
+
+    def run(self, interpreter: "Interpreter") -> t.Any:
+        tail = self
+        while True:
+            completion = tail.function.execute(
+                interpreter, tail.instance, tail.arguments
+            )
+
+            if completion is None:
+                return None
+            if completion.__class__ is not TailCall:
+                return completion[0]
+            tail = completion
+
+
 class FunctionType(Enum):
     NONE = 0
     FUNCTION = 1
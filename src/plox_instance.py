@@ -1,3 +1,4 @@
+import typing as t
 from typing import TYPE_CHECKING
 
 from plox_token import Token
@@ -6,14 +7,35 @@ if TYPE_CHECKING:
     from plox_class import LoxClass, LoxFunction
 
 
+class Shape:
+    # Maps field names to indices into LoxInstance.values. Instances that
+    # add the same fields in the same order share one Shape.
+    __slots__ = ("slots", "transitions")
+
+    def __init__(self, slots: t.Optional[dict[str, int]] = None):
+        self.slots: dict[str, int] = {} if slots is None else slots
+        self.transitions: dict[str, Shape] = {}
+
+    def with_field(self, name: str) -> "Shape":
+        shape = self.transitions.get(name)
+        if shape is None:
+            shape = Shape({**self.slots, name: len(self.slots)})
+            self.transitions[name] = shape
+        return shape
+
+
 class LoxInstance:
+    __slots__ = ("klass", "shape", "values")
+
     def __init__(self, klass: "LoxClass"):
         self.klass = klass
-        self.fields: dict = {}
+        self.shape: Shape = klass.shape
+        self.values: list = []
 
     def get(self, name: Token) -> "LoxFunction":
-        if name.lexeme in self.fields:
-            return self.fields[name.lexeme]
+        slot = self.shape.slots.get(name.lexeme)
+        if slot is not None:
+            return self.values[slot]
 
         method = self.klass.get_method(name.lexeme)
         if method is not None:
@@ -21,8 +43,13 @@ class LoxInstance:
 
         raise RuntimeError(name, f"Undefined property '{name.lexeme}'.")
 
-    def set(self, name: Token, value: Token):
-        self.fields[name.lexeme] = value
+    def set(self, name: Token, value: t.Any):
+        slot = self.shape.slots.get(name.lexeme)
+        if slot is None:
+            self.shape = self.shape.with_field(name.lexeme)
+            self.values.append(value)
+        else:
+            self.values[slot] = value
 
     def __str__(self):
         return f"{self.klass.name} instance"
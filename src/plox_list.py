@@ -0,0 +1,62 @@
+import typing as t
+
+
+class LoxList(list):
+    """A Lox list value.
+
+    It is a plain Python list, so indexing and appending cost what they
+    cost in Python, but like instances it is only equal to itself.
+    """
+
+    __slots__ = ()
+
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+
+
+def list_index(lox_list: t.Any, index: t.Any) -> int:
+    if lox_list.__class__ is not LoxList:
+        raise RuntimeError("Only lists can be indexed.")
+    if index.__class__ is not float or not index.is_integer():
+        raise RuntimeError("List index must be an integer.")
+    if not 0 <= index < len(lox_list):
+        raise RuntimeError("List index out of range.")
+    return int(index)
+
+
+def get_index(lox_list: t.Any, index: t.Any) -> t.Any:
+    return lox_list[list_index(lox_list, index)]
+
+
+def set_index(lox_list: t.Any, index: t.Any, value: t.Any) -> t.Any:
+    lox_list[list_index(lox_list, index)] = value
+    return value
+
+
+# The list natives, shared by every engine.
+
+
+def new_list(length: t.Any) -> LoxList:
+    if length.__class__ is not float or not length.is_integer() or length < 0:
+        raise RuntimeError("List length must be a non-negative integer.")
+    return LoxList([None] * int(length))
+
+
+def append(lox_list: t.Any, value: t.Any) -> None:
+    if lox_list.__class__ is not LoxList:
+        raise RuntimeError("Can only append to a list.")
+    lox_list.append(value)
+
+
+def length(value: t.Any) -> float:
+    if value.__class__ is not LoxList and value.__class__ is not str:
+        raise RuntimeError("Can only take the length of a list or string.")
+    return float(len(value))
+
+
+def pop(lox_list: t.Any) -> t.Any:
+    if lox_list.__class__ is not LoxList:
+        raise RuntimeError("Can only pop from a list.")
+    if not lox_list:
+        raise RuntimeError("Can't pop from an empty list.")
+    return lox_list.pop()
@@ -4,6 +4,8 @@ from token_type import TokenType
 
 
 class Token:
+    __slots__ = ("token_type", "lexeme", "literal", "line")
+
     def __init__(
         self,
         token_type: TokenType,
@@ -0,0 +1,172 @@
+import time
+import typing as t
+
+from callable import NativeCallable
+from closure_compiler import CompiledFunction
+from plox_class import LoxClass
+from plox_function import LoxFunction
+
+SCRIPT = "<script>"
+
+
+class FunctionStats:
+    __slots__ = ("calls", "inclusive", "exclusive", "active")
+
+    def __init__(self):
+        self.calls = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+        # Activations on the stack, so recursion adds inclusive time once.
+        self.active = 0
+
+
+class CallNode:
+    """One distinct call path; its time is exclusive to that path."""
+
+    __slots__ = ("children", "time")
+
+    def __init__(self):
+        self.children: dict[str, CallNode] = {}
+        self.time = 0.0
+
+    def child(self, name: str) -> "CallNode":
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = CallNode()
+        return node
+
+
+def function_name(function, interpreter, *arguments) -> str:
+    return function.declaration.name.lexeme
+
+
+def method_name(method, interpreter, instance, arguments) -> str:
+    return f"{instance.klass.name}.{method.declaration.name.lexeme}"
+
+
+def tail_call_name(function, interpreter, instance, arguments) -> str:
+    if instance is None:
+        return function.declaration.name.lexeme
+    return f"{instance.klass.name}.{function.declaration.name.lexeme}"
+
+
+def class_name(klass, interpreter, arguments) -> str:
+    return klass.name
+
+
+def native_name(native, interpreter, arguments) -> str:
+    return native.name
+
+
+# (class, method, name of the Lox function being called)
+HOOKS: list[tuple[type, str, t.Callable[..., str]]] = [
+    (LoxFunction, "call", function_name),
+    (LoxFunction, "invoke", method_name),
+    (CompiledFunction, "call", function_name),
+    (CompiledFunction, "invoke", method_name),
+    # Tail calls run in the caller's frame, one execute() per call.
+    (LoxFunction, "execute", tail_call_name),
+    (CompiledFunction, "execute", tail_call_name),
+    (LoxClass, "call", class_name),
+    *(
+        (native, "call", native_name)
+        for native in NativeCallable.__subclasses__()
+    ),
+]
+
+
+class Profiler:
+    """Per-Lox-function call counts and inclusive/exclusive times.
+
+    While active, the call and invoke methods of every callable, and the
+    execute methods tail calls run through, are wrapped to time each
+    activation, so it costs nothing once exited.
+    Calls are also recorded as a tree of call paths that is written out
+    in the collapsed-stack format flamegraph tools read.
+    """
+
+    def __init__(self):
+        self.stats: dict[str, FunctionStats] = {}
+        self.root = CallNode()
+        self.node = self.root
+        self.children_time = 0.0
+        self.start = 0.0
+        self.total = 0.0
+        self.originals: list[tuple[type, str, t.Callable]] = []
+
+    def __enter__(self) -> "Profiler":
+        for cls, method, name_of in HOOKS:
+            original = cls.__dict__[method]
+            self.originals.append((cls, method, original))
+            setattr(cls, method, self.wrap(original, name_of))
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.total = time.perf_counter() - self.start
+        for cls, method, original in self.originals:
+            setattr(cls, method, original)
+        self.originals.clear()
+        self.root.time = self.total - self.children_time
+
+    def wrap(self, original: t.Callable, name_of: t.Callable) -> t.Callable:
+        profiler = self
+
+        def profiled(callee, *args):
+            name = name_of(callee, *args)
+            return profiler.record(name, original, callee, args)
+
+        return profiled
+
+    def record(self, name, original, callee, args) -> t.Any:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = FunctionStats()
+        parent = self.node
+        parent_children_time = self.children_time
+        self.node = parent.child(name)
+        self.children_time = 0.0
+        stats.active += 1
+
+        start = time.perf_counter()
+        try:
+            return original(callee, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            exclusive = elapsed - self.children_time
+            stats.calls += 1
+            stats.exclusive += exclusive
+            stats.active -= 1
+            if stats.active == 0:
+                stats.inclusive += elapsed
+            self.node.time += exclusive
+            self.node = parent
+            self.children_time = parent_children_time + elapsed
+
+    def report(self) -> str:
+        lines = [
+            f"{'function':<30}{'calls':>10}{'inclusive':>12}{'exclusive':>12}",
+            f"{SCRIPT:<30}{1:>10}{self.total:>11.3f}s{self.root.time:>11.3f}s",
+        ]
+        ranked = sorted(
+            self.stats.items(),
+            key=lambda item: item[1].exclusive,
+            reverse=True,
+        )
+        for name, stats in ranked:
+            lines.append(
+                f"{name:<30}{stats.calls:>10}"
+                f"{stats.inclusive:>11.3f}s{stats.exclusive:>11.3f}s"
+            )
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> t.Iterator[str]:
+        # One "outer;inner;leaf microseconds" line per call path.
+        pending = [(self.root, SCRIPT)]
+        while pending:
+            node, path = pending.pop()
+            microseconds = round(node.time * 1_000_000)
+            if microseconds > 0:
+                yield f"{path} {microseconds}"
+            for name, child in node.children.items():
+                pending.append((child, f"{path};{name}"))
@@ -0,0 +1,78 @@
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import typing as t
+from pathlib import Path
+
+CACHE_DIR = "__loxcache__"
+MAGIC = b"LOXC"
+KEY_SIZE = 64
+
+
+@functools.cache
+def interpreter_version() -> bytes:
+    # Any change to the interpreter's own sources, or a different Python,
+    # invalidates every cache file.
+    digest = hashlib.sha256(sys.implementation.cache_tag.encode())
+    for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+
+class ProgramCache:
+    """On-disk cache of front-end output, like __pycache__ for .py files.
+
+    The program prepared for one engine (resolved AST, bytecode or
+    transpiled code) is pickled to __loxcache__/<script>.loxc next to the
+    script. The file starts with a key hashed from the source, the engine,
+    the options that change the front end and the interpreter version;
+    any mismatch is a miss, and an unreadable file is deleted.
+    """
+
+    def __init__(self, script_path: str):
+        script = Path(script_path)
+        self.path = script.parent / CACHE_DIR / f"{script.stem}.loxc"
+
+    @staticmethod
+    def key(source: str, engine: str, optimize: bool) -> bytes:
+        digest = hashlib.sha256(interpreter_version())
+        digest.update(f"{engine}:{optimize}:".encode())
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest().encode()
+
+    def load(self, key: bytes) -> t.Any | None:
+        try:
+            with open(self.path, "rb") as file:
+                if file.read(len(MAGIC) + KEY_SIZE) != MAGIC + key:
+                    return None
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A truncated or foreign file can fail to unpickle with almost
+            # any error (AttributeError, ImportError, ...). It is dropped
+            # so the next run stores a fresh one.
+            self.discard()
+            return None
+
+    def discard(self) -> None:
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def store(self, key: bytes, program: t.Any) -> None:
+        # Caching is best effort: an unwritable directory or a program
+        # too deeply nested to pickle just runs uncached next time.
+        temporary = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            data = pickle.dumps(program, pickle.HIGHEST_PROTOCOL)
+            self.path.parent.mkdir(exist_ok=True)
+            with open(temporary, "wb") as file:
+                file.write(MAGIC + key)
+                file.write(data)
+            os.replace(temporary, self.path)
+        except (OSError, RecursionError, pickle.PicklingError):
+            temporary.unlink(missing_ok=True)
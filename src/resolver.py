@@ -15,8 +15,11 @@ class Resolver:
     def __init__(self, interpreter: "Interpreter"):
         self.interpreter = interpreter
         self.scopes: list[dict[str, bool]] = []
+        # Slot of each name in the matching scope, in declaration order.
+        self.slots: list[dict[str, int]] = []
         self.current_function = FunctionType.NONE
         self.current_class = ClassType.NONE
+        self.function_count = 0
 
     def resolve(self, statements: list[stmt.Stmt]):
         for statement in statements:
@@ -31,9 +34,11 @@ class Resolver:
     def begin_scope(self) -> None:
         hash_map: dict[str, bool] = {}
         self.scopes.append(hash_map)
+        self.slots.append({})
 
     def end_scope(self):
         self.scopes.pop()
+        self.slots.pop()
 
     def declare(self, name: Token):
         if self.scopes:
@@ -44,6 +49,7 @@ class Resolver:
                     name, "Already variable with this name in this scope."
                 )
 
+            self.slots[-1][name.lexeme] = len(scope)
             scope[name.lexeme] = False
 
     def define(self, name: Token):
@@ -52,8 +58,12 @@ class Resolver:
 
     def resolve_local(self, expression, name):
         for i in range(len(self.scopes) - 1, -1, -1):
-            if name.lexeme in self.scopes[i]:
-                self.interpreter.resolve(expression, len(self.scopes) - 1 - i)
+            scope = self.scopes[i]
+            if name.lexeme in scope:
+                slot = self.slots[i][name.lexeme]
+                self.interpreter.resolve(
+                    expression, len(self.scopes) - 1 - i, slot
+                )
                 return
 
     def resolve_function(
@@ -61,6 +71,7 @@ class Resolver:
     ):
         enclosing_function = self.current_function
         self.current_function = func_type
+        self.function_count += 1
         self.begin_scope()
 
         for param in function_stmt.params:
@@ -108,9 +119,11 @@ class Resolver:
 
             self.begin_scope()
             self.scopes[-1]["super"] = True
+            self.slots[-1]["super"] = 0
 
         self.begin_scope()
         self.scopes[-1]["self"] = True
+        self.slots[-1]["self"] = 0
 
         for method in class_stmt.methods:
             declaration = FunctionType.METHOD
@@ -162,6 +175,10 @@ class Resolver:
             self.error(return_stmt.keyword, "Can't return from initializer.")
 
         if return_stmt.value is not None:
+            if isinstance(return_stmt.value, expr.Call):
+                # Nothing is left to do in this function once the call
+                # returns, so the interpreter may reuse its frame.
+                return_stmt.value.tail = True
             self.resolve_expression(return_stmt.value)
 
     def visit_while_stmt(self, while_stmt: stmt.While):
@@ -185,6 +202,19 @@ class Resolver:
         self.resolve_expression(set_expr.value)
         self.resolve_expression(set_expr.expression)
 
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        for element in list_expr.elements:
+            self.resolve_expression(element)
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        self.resolve_expression(index_expr.expression)
+        self.resolve_expression(index_expr.index)
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        self.resolve_expression(set_expr.value)
+        self.resolve_expression(set_expr.expression)
+        self.resolve_expression(set_expr.index)
+
     def visit_super_expr(self, super_expr: expr.Super):
         if self.current_class is ClassType.NONE:
             self.error(
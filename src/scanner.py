@@ -1,4 +1,8 @@
+import re
+import typing as t
+
 from plox_token import Token
+from token_buffer import TokenBuffer
 from token_type import TokenType
 
 
@@ -28,6 +32,7 @@ class Scanner:
         self.start = 0
         self.current = 0
         self.line = 1
+        self.had_error = False
 
     def scan_tokens(self) -> list[Token]:
         while not self.is_at_end():
@@ -90,6 +95,10 @@ class Scanner:
             self.add_token(TokenType.LEFT_BRACE)
         elif c == "}":
             self.add_token(TokenType.RIGHT_BRACE)
+        elif c == "[":
+            self.add_token(TokenType.LEFT_BRACKET)
+        elif c == "]":
+            self.add_token(TokenType.RIGHT_BRACKET)
         elif c == ",":
             self.add_token(TokenType.COMMA)
         elif c == ".":
@@ -152,7 +161,11 @@ class Scanner:
 
         else:
             # Lox.error(self.line, f"Unexpected character: {c}")
-            print(f"Unexpected character: {c}. Line: {self.line}")
+            self.error(f"Unexpected character: {c}")
+
+    def error(self, message: str) -> None:
+        print(f"{message}. Line: {self.line}")
+        self.had_error = True
 
     def string(self) -> None:
         while self.peek() != '"' and not self.is_at_end():
@@ -162,7 +175,7 @@ class Scanner:
             self.advance()
 
         if self.is_at_end():
-            print(f"Unterminated string. Line: {self.line}")
+            self.error("Unterminated string")
             return
 
         self.advance()
@@ -194,3 +207,176 @@ class Scanner:
         token_type = self.keywords.get(text, TokenType.IDENTIFIER)
 
         self.add_token(token_type=token_type)
+
+
+class RegexScanner:
+    """Scans with one compiled master regex, yielding tokens lazily.
+
+    Produces the same tokens, line numbers and error messages as Scanner.
+    """
+
+    operators = {
+        "(": TokenType.LEFT_PAREN,
+        ")": TokenType.RIGHT_PAREN,
+        "{": TokenType.LEFT_BRACE,
+        "}": TokenType.RIGHT_BRACE,
+        "[": TokenType.LEFT_BRACKET,
+        "]": TokenType.RIGHT_BRACKET,
+        ",": TokenType.COMMA,
+        ".": TokenType.DOT,
+        "-": TokenType.MINUS,
+        "+": TokenType.PLUS,
+        ";": TokenType.SEMICOLON,
+        "*": TokenType.STAR,
+        "/": TokenType.SLASH,
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "=": TokenType.EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+    }
+
+    # Leading spaces are consumed by every match instead of producing
+    # matches of their own; alternatives are ordered by frequency.
+    pattern = re.compile(
+        r"""
+        [ ]*
+        (?:
+            (?P<identifier>[^\W\d_][^\W_]*)
+            | (?P<comment>//[^\n]*)
+            | (?P<operator>[!=<>]=?|[(){}[\],.\-+;*/])
+            | (?P<newline>\n)
+            | (?P<number>\d+(?:\.\d+)?)
+            | (?P<string>"[^"]*")
+            | (?P<unterminated>"[^"]*)
+            | (?P<error>[^ ])
+        )
+        """,
+        re.VERBOSE | re.DOTALL,
+    )
+
+    def __init__(self, source: str):
+        self.source = source
+        self.line = 1
+        self.open_string: t.Optional[int] = None
+        self.had_error = False
+
+    def scan_tokens(self) -> TokenBuffer:
+        return self.scan_buffer()
+
+    def scan_buffer(self) -> TokenBuffer:
+        # Only the type code, offsets and line of each token are stored
+        # instead of a Token object.
+        keywords = {
+            text: token_type.value
+            for text, token_type in Scanner.keywords.items()
+        }
+        operators = {
+            text: token_type.value
+            for text, token_type in self.operators.items()
+        }
+        identifier = TokenType.IDENTIFIER.value
+        literals = {
+            "number": TokenType.NUMBER.value,
+            "string": TokenType.STRING.value,
+        }
+
+        source = self.source
+        buffer = TokenBuffer(source)
+        append = buffer.append
+        for kind, start, end in self.spans(source):
+            if kind == "identifier":
+                code = keywords.get(source[start:end], identifier)
+            elif kind == "operator":
+                code = operators[source[start:end]]
+            else:
+                code = literals[kind]
+            append(code, start, end, self.line)
+
+        if self.open_string is not None:
+            self.error("Unterminated string")
+        end = len(source)
+        append(TokenType.EOF.value, end, end, self.line)
+        return buffer
+
+    def iter_tokens(self) -> t.Iterator[Token]:
+        yield from self.scan(self.source)
+        if self.open_string is not None:
+            self.error("Unterminated string")
+        yield Token(TokenType.EOF, "", None, self.line)
+
+    def error(self, message: str) -> None:
+        print(f"{message}. Line: {self.line}")
+        self.had_error = True
+
+    def scan(self, text: str) -> t.Iterator[Token]:
+        keywords = Scanner.keywords
+        operators = self.operators
+
+        for kind, start, end in self.spans(text):
+            lexeme = text[start:end]
+            if kind == "identifier":
+                token_type = keywords.get(lexeme, TokenType.IDENTIFIER)
+                yield Token(token_type, lexeme, None, self.line)
+            elif kind == "operator":
+                yield Token(operators[lexeme], lexeme, None, self.line)
+            elif kind == "number":
+                yield Token(TokenType.NUMBER, lexeme, float(lexeme), self.line)
+            else:
+                yield Token(TokenType.STRING, lexeme, lexeme[1:-1], self.line)
+
+    def spans(self, text: str) -> t.Iterator[tuple[str, int, int]]:
+        # Yields the kind and offsets of each identifier, operator, number
+        # and string in text, counting lines and reporting bad characters
+        # on the way. An unterminated string runs to the end of the text;
+        # its offset is left in open_string for the caller to report.
+        self.open_string = None
+
+        for match in self.pattern.finditer(text):
+            # Every alternative is a named group, so one always matched.
+            kind = t.cast(str, match.lastgroup)
+
+            if kind == "newline":
+                self.line += 1
+            elif kind == "comment":
+                continue
+            elif kind == "unterminated":
+                self.open_string = match.start(kind)
+            elif kind == "error":
+                self.error(f"Unexpected character: {match.group(kind)}")
+            else:
+                start, end = match.span(kind)
+                yield kind, start, end
+
+
+class StreamScanner(RegexScanner):
+    """RegexScanner over text that arrives in pieces, e.g. lines of a pipe.
+
+    Tokens never span a newline except string literals, so each line is
+    scanned as soon as it arrives; an open string is carried over and
+    rescanned together with the following lines.
+    """
+
+    def __init__(self, lines: t.Iterable[str]):
+        super().__init__("")
+        self.lines = lines
+
+    def scan_tokens(self) -> list[Token]:
+        return list(self.iter_tokens())
+
+    def iter_tokens(self) -> t.Iterator[Token]:
+        pending = ""
+        for line in self.lines:
+            pending += line
+            yield from self.scan(pending)
+            if self.open_string is None:
+                pending = ""
+            else:
+                pending = pending[self.open_string:]
+
+        if pending:
+            self.error("Unterminated string")
+        yield Token(TokenType.EOF, "", None, self.line)
@@ -0,0 +1,111 @@
+import sys
+import time
+import typing as t
+from parser import Parser
+
+import stmt
+from closure_compiler import ClosureInterpreter
+from compiler import Compiler
+from exceptions import ParserError, ResolveError
+from interpreter import Interpreter
+from resolver import Resolver
+from scanner import StreamScanner
+from stack_interpreter import StackInterpreter
+from vm import VM
+
+INTERPRETERS = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+    "stack": StackInterpreter,
+}
+
+Prepare = t.Callable[[list[stmt.Stmt]], list[stmt.Stmt]]
+Check = t.Callable[[list[stmt.Stmt]], None]
+
+
+class Session:
+    """One interpreter, globals and resolver kept alive across inputs.
+
+    Top-level declarations are resolved and run one batch at a time
+    against the same state, so everything defined by earlier input stays
+    visible. Resolution data for a batch is dropped once it has run,
+    unless it declared functions that may still be called.
+    """
+
+    def __init__(
+        self,
+        engine: str = "tree",
+        prepare: Prepare | None = None,
+        check: Check | None = None,
+        interpreter: Interpreter | None = None,
+    ):
+        # prepare rewrites each batch once it has been resolved; check
+        # validates a batch for the VM, whose compiler only sees the
+        # prepared statements. interpreter replaces the engine's own,
+        # e.g. with an InstrumentedInterpreter.
+        self.engine = engine
+        self.prepare = prepare or (lambda statements: statements)
+        self.check = check or (lambda statements: None)
+        self.pending = False
+
+        if engine == "vm":
+            self.vm = VM()
+            self.interpreter = None
+        else:
+            self.interpreter = interpreter or INTERPRETERS[engine]()
+            self.resolver = Resolver(self.interpreter)
+
+    def execute(self, statements: list[stmt.Stmt]) -> bool:
+        if self.interpreter is None:
+            self.check(statements)
+            program = Compiler().compile(self.prepare(statements))
+            return self.vm.interpret(program)
+
+        checkpoint = self.interpreter.checkpoint()
+        function_count = self.resolver.function_count
+
+        self.resolver.resolve(statements)
+        completed = self.interpreter.interpret(self.prepare(statements))
+        if self.resolver.function_count == function_count:
+            self.interpreter.forget_since(checkpoint)
+        return completed
+
+    def run_prompt(self) -> None:
+        # The parser pulls lines from the prompt as it needs tokens, so a
+        # declaration spanning several lines keeps reading with "... "
+        # until it is complete. A parse or resolve error discards the
+        # rest of the input line and starts over with a fresh parser.
+        lines = self.read_lines()
+        while True:
+            tokens = self.track(StreamScanner(lines).iter_tokens())
+            try:
+                for declaration in Parser(tokens).iter_declarations():
+                    self.run_timed([declaration])
+                break
+            except (ParserError, ResolveError) as error:
+                print(error)
+                self.pending = False
+                if self.interpreter is not None:
+                    self.resolver = Resolver(self.interpreter)
+        print("\nExiting...")
+
+    def run_timed(self, statements: list[stmt.Stmt]) -> None:
+        start = time.perf_counter()
+        self.execute(statements)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.pending = False
+        print(f"({elapsed:.2f} ms)", file=sys.stderr)
+
+    def track(self, tokens: t.Iterator) -> t.Iterator:
+        # Any token taken after a declaration ran starts the next one.
+        for token in tokens:
+            self.pending = True
+            yield token
+
+    def read_lines(self) -> t.Iterator[str]:
+        while True:
+            try:
+                line = input("... " if self.pending else "> ")
+            except EOFError:
+                return
+            yield line + "\n"
@@ -0,0 +1,127 @@
+import typing as t
+
+import expr
+from token_type import TokenType
+
+# Self-specializing Binary nodes. After its first evaluation the
+# Interpreter swaps an expr.Binary node's class for the variant matching
+# the operand types it saw, so later evaluations go straight to a
+# type-guarded fast path. When the guard fails the node deoptimizes to
+# GenericBinary for good. Swapping the class keeps the node's identity,
+# so resolver data and caches keyed by the node stay valid. The variants
+# add no slots of their own so their layout matches expr.Binary.
+
+
+class GenericBinary(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_generic_binary_expr(self)
+
+
+class NumberAdd(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_add_expr(self)
+
+
+class StringConcat(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_string_concat_expr(self)
+
+
+class NumberSubtract(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_subtract_expr(self)
+
+
+class NumberMultiply(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_multiply_expr(self)
+
+
+class NumberDivide(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_divide_expr(self)
+
+
+class NumberLess(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_less_expr(self)
+
+
+class NumberLessEqual(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_less_equal_expr(self)
+
+
+class NumberGreater(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_greater_expr(self)
+
+
+class NumberGreaterEqual(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_number_greater_equal_expr(self)
+
+
+class Equal(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_equal_expr(self)
+
+
+class NotEqual(expr.Binary):
+    __slots__ = ()
+
+    def accept(self, visitor):
+        return visitor.visit_not_equal_expr(self)
+
+
+NUMBER_NODES: dict[TokenType, type[expr.Binary]] = {
+    TokenType.PLUS: NumberAdd,
+    TokenType.MINUS: NumberSubtract,
+    TokenType.STAR: NumberMultiply,
+    TokenType.SLASH: NumberDivide,
+    TokenType.LESS: NumberLess,
+    TokenType.LESS_EQUAL: NumberLessEqual,
+    TokenType.GREATER: NumberGreater,
+    TokenType.GREATER_EQUAL: NumberGreaterEqual,
+}
+
+
+def specialize(binary_expr: expr.Binary, left: t.Any, right: t.Any) -> None:
+    operator_type = binary_expr.operator.token_type
+
+    if operator_type == TokenType.EQUAL_EQUAL:
+        binary_expr.__class__ = Equal
+    elif operator_type == TokenType.BANG_EQUAL:
+        binary_expr.__class__ = NotEqual
+    elif type(left) is float and type(right) is float:
+        binary_expr.__class__ = NUMBER_NODES[operator_type]
+    elif (
+        operator_type == TokenType.PLUS
+        and type(left) is str
+        and type(right) is str
+    ):
+        binary_expr.__class__ = StringConcat
+    else:
+        binary_expr.__class__ = GenericBinary
@@ -0,0 +1,330 @@
+import types
+import typing as t
+
+import expr
+import stmt
+from callable import PloxCallable
+from environment import Environment
+from interpreter import Interpreter
+from plox_class import LoxClass
+from plox_function import LoxFunction, TailCall
+from plox_instance import LoxInstance
+from plox_list import (
+    LoxList,
+    get_index,
+    set_index,
+)
+from token_type import TokenType
+
+Generator = types.GeneratorType
+
+# Nodes whose value never needs the driver.
+LEAVES = {expr.Literal, expr.Var, expr.Self}
+
+
+class StackInterpreter(Interpreter):
+    """Tree-walker that keeps Lox calls off the Python stack.
+
+    Visitors of nodes that evaluate children are generators: they yield
+    each child expression or statement and get its value sent back. run()
+    drives them from a list, and a call to a Lox function or initializer
+    is one more generator on that list running the body, so recursion in
+    Lox is only bounded by max_frames (and memory), never by the Python
+    recursion limit. Leaf nodes are visited directly, as in Interpreter.
+    """
+
+    # Lox calls that may be active at once; each holds about 1.3 KB
+    # of generators and environments (see benchmarks/recursion.py).
+    max_frames = 250_000
+
+    def __init__(self):
+        super().__init__()
+        self.frames = 0
+
+    def interpret(self, statements: list[stmt.Stmt]) -> bool:
+        completed = super().interpret(statements)
+        if not completed:
+            # An error abandons every pending generator mid-body.
+            self.environment = self.globals
+            self.frames = 0
+        return completed
+
+    def execute(self, statement: stmt.Stmt) -> t.Optional[tuple]:
+        return self.run(statement)
+
+    def evaluate(self, expression: expr.Expr):
+        return self.run(expression)
+
+    def run(self, node: expr.Expr | stmt.Stmt | Generator) -> t.Any:
+        # A generator yields a node to evaluate or another generator to
+        # run; either way the result is sent back once it is known.
+        if isinstance(node, Generator):
+            result = node
+        else:
+            result = node.accept(self)
+            if result.__class__ is not Generator:
+                return result
+
+        stack = [result]
+        value = None
+        while True:
+            try:
+                request = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    return stop.value
+                value = stop.value
+                continue
+
+            if request.__class__ is Generator:
+                stack.append(request)
+                value = None
+                continue
+            value = request.accept(self)
+            if value.__class__ is Generator:
+                stack.append(value)
+                value = None
+
+    def visit_expression_stmt(self, statement: stmt.Expression):
+        yield statement.expr
+
+    def visit_print_stmt(self, statement: stmt.Print):
+        value = yield statement.expr
+        self.output.write(self.stringify(value))
+
+    def visit_var_stmt(self, statement: stmt.Var):
+        value = None
+        if statement.initializer is not None:
+            value = yield statement.initializer
+
+        self.environment.define_var(statement.name.lexeme, value)
+
+    def visit_return_stmt(self, statement: stmt.Return):
+        value = statement.value
+        if value is None:
+            return (None,)
+
+        if value.__class__ is expr.Call and value.tail:
+            result = yield self.visit_call_expr(value, True)
+            if result.__class__ is TailCall:
+                return result
+            return (result,)
+        return ((yield value),)
+
+    def visit_if_stmt(self, statement: stmt.IfStmt):
+        condition = yield statement.condition
+        if self.is_truthy(condition):
+            return (yield statement.then_stmt)
+        elif statement.else_stmt is not None:
+            return (yield statement.else_stmt)
+        return None
+
+    def visit_block_stmt(self, block_stmt: stmt.Block):
+        return self.block(
+            block_stmt.statements, Environment(enclosing=self.environment)
+        )
+
+    def block(self, statements: list[stmt.Stmt], environment: Environment):
+        previous = self.environment
+        self.environment = environment
+        completion = None
+        for statement in statements:
+            completion = yield statement
+            if completion is not None:
+                break
+        self.environment = previous
+        return completion
+
+    def visit_while_stmt(self, statement: stmt.While):
+        while self.is_truthy((yield statement.condition)):
+            completion = yield statement.body
+            if completion is not None:
+                return completion
+        return None
+
+    def visit_assign_expr(self, assign_expr: expr.Assign):
+        value = yield assign_expr.value
+
+        local = self.locals.get(assign_expr)
+        if local is not None:
+            self.environment.assign_at(*local, value)
+        else:
+            cell = self.global_cell(assign_expr.name, assign_expr)
+            self.globals.assign_cell(cell, assign_expr.name, value)
+
+        return value
+
+    def visit_logical_expr(self, logical_expr: expr.Logical):
+        left = yield logical_expr.left
+
+        if logical_expr.operator.token_type == TokenType.OR:
+            if self.is_truthy(left):
+                return left
+        else:
+            if not self.is_truthy(left):
+                return left
+        return (yield logical_expr.right)
+
+    def visit_grouping_expr(self, grouping_expr: expr.Grouping):
+        return (yield grouping_expr.expr)
+
+    def visit_unary_expr(self, unary_expr: expr.Unary):
+        right = yield unary_expr.right
+        if unary_expr.operator.token_type == TokenType.BANG:
+            return not self.is_truthy(right)
+        if unary_expr.operator.token_type == TokenType.MINUS:
+            self.check_number_operand(unary_expr.operator, right)
+            return -right
+
+    def visit_binary_expr(self, binary_expr: expr.Binary):
+        # Binary nodes are never specialized here, so they stay shareable
+        # with the other engines; any specialized ones run generically.
+        left = binary_expr.left
+        right = binary_expr.right
+        if left.__class__ in LEAVES and right.__class__ in LEAVES:
+            return self.binary_operation(
+                binary_expr.operator, left.accept(self), right.accept(self)
+            )
+        return self.binary_operands(binary_expr)
+
+    def binary_operands(self, binary_expr: expr.Binary):
+        left = yield binary_expr.left
+        right = yield binary_expr.right
+        return self.binary_operation(binary_expr.operator, left, right)
+
+    visit_generic_binary_expr = visit_binary_expr
+    visit_number_add_expr = visit_binary_expr
+    visit_number_subtract_expr = visit_binary_expr
+    visit_number_multiply_expr = visit_binary_expr
+    visit_number_divide_expr = visit_binary_expr
+    visit_number_less_expr = visit_binary_expr
+    visit_number_less_equal_expr = visit_binary_expr
+    visit_number_greater_expr = visit_binary_expr
+    visit_number_greater_equal_expr = visit_binary_expr
+    visit_string_concat_expr = visit_binary_expr
+    visit_equal_expr = visit_binary_expr
+    visit_not_equal_expr = visit_binary_expr
+
+    def visit_call_expr(self, call_expr: expr.Call, tail: bool = False):
+        instance = None
+        if call_expr.calle.__class__ is expr.Get:
+            get_expr = call_expr.calle
+            obj = yield get_expr.expression
+            if not isinstance(obj, LoxInstance):
+                raise RuntimeError(
+                    get_expr.name, "Only instances have properties."
+                )
+
+            cache = get_expr.cache
+            if cache is None:
+                cache = get_expr.cache = self.property_cache()
+            slot, method = cache.lookup(obj, get_expr.name)
+            if method is None:
+                calle = obj.values[slot]
+            else:
+                calle = method
+                instance = obj
+        else:
+            calle = yield call_expr.calle
+
+        arguments = []
+        for argument in call_expr.arguments:
+            arguments.append((yield argument))
+
+        if not isinstance(calle, PloxCallable):
+            raise RuntimeError("Can only call functions and classes.")
+
+        if len(arguments) != calle.arity():
+            raise RuntimeError(
+                f"Expected {calle.arity()} arguments, "
+                f"but {len(arguments)} were given."
+            )
+
+        if calle.__class__ is LoxFunction:
+            if tail and not calle.is_initializer:
+                return TailCall(calle, instance, arguments)
+            return (yield self.call_function(calle, instance, arguments))
+        if calle.__class__ is LoxClass:
+            instance = LoxInstance(calle)
+            if calle.initializer is not None:
+                initializer = calle.initializer
+                yield self.call_function(initializer, instance, arguments)
+            return instance
+        return calle.call(self, arguments)
+
+    def call_function(
+        self,
+        function: LoxFunction,
+        instance: t.Optional[LoxInstance],
+        arguments: list[t.Any],
+    ):
+        # Runs the body, then any tail calls it returns, as one frame.
+        if self.frames >= self.max_frames:
+            raise RuntimeError("Stack overflow.")
+        self.frames += 1
+        previous = self.environment
+
+        while True:
+            closure = function.closure
+            if instance is not None:
+                closure = Environment(closure, [instance])
+            self.environment = Environment(closure, arguments)
+
+            completion = None
+            for statement in function.declaration.body:
+                completion = yield statement
+                if completion is not None:
+                    break
+            if not isinstance(completion, TailCall):
+                break
+            function = completion.function
+            instance = completion.instance
+            arguments = completion.arguments
+
+        self.environment = previous
+        self.frames -= 1
+        if function.is_initializer:
+            return closure.get_at(0, 0)
+        if completion is not None:
+            return completion[0]
+        return None
+
+    def visit_get_expr(self, get_expr: expr.Get):
+        obj = yield get_expr.expression
+        if isinstance(obj, LoxInstance):
+            cache = get_expr.cache
+            if cache is None:
+                cache = get_expr.cache = self.property_cache()
+            return cache.get(obj, get_expr.name)
+        raise RuntimeError(get_expr.name, "Only instances have properties.")
+
+    def visit_set_expr(self, set_expr: expr.Set):
+        obj = yield set_expr.expression
+
+        if not isinstance(obj, LoxInstance):
+            raise RuntimeError(set_expr.name, "Only instances have fields.")
+
+        value = yield set_expr.value
+        cache = set_expr.cache
+        if cache is None:
+            cache = set_expr.cache = self.property_cache()
+        cache.set(obj, set_expr.name, value)
+        return value
+
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        elements = LoxList()
+        for element in list_expr.elements:
+            elements.append((yield element))
+        return elements
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        lox_list = yield index_expr.expression
+        index = yield index_expr.index
+        return get_index(lox_list, index)
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        lox_list = yield set_expr.expression
+        index = yield set_expr.index
+        value = yield set_expr.value
+        return set_index(lox_list, index, value)
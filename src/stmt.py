@@ -1,3 +1,4 @@
+# Generated by tools/generate_ast.py, do not edit.
 import expr
 from expr import Expr
 from plox_token import Token
@@ -33,6 +34,8 @@ class Stmt:
     PrintStmt -> "print" expression ";" ;
     """
 
+    __slots__ = ()
+
     def accept(self, visitor):
         raise NotImplementedError(
             "accept method must be implemented by Stmt subclasses"
@@ -40,6 +43,8 @@ class Stmt:
 
 
 class Print(Stmt):
+    __slots__ = ("expr",)
+
     def __init__(self, expr: Expr):
         self.expr = expr
 
@@ -48,6 +53,8 @@ class Print(Stmt):
 
 
 class Expression(Stmt):
+    __slots__ = ("expr",)
+
     def __init__(self, expr: Expr):
         self.expr = expr
 
@@ -56,6 +63,8 @@ class Expression(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer")
+
     def __init__(self, name: Token, initializer: Expr):
         self.name = name
         self.initializer = initializer
@@ -65,6 +74,8 @@ class Var(Stmt):
 
 
 class Block(Stmt):
+    __slots__ = ("statements",)
+
     def __init__(self, statements: list[Stmt]):
         self.statements = statements
 
@@ -73,6 +84,8 @@ class Block(Stmt):
 
 
 class IfStmt(Stmt):
+    __slots__ = ("condition", "then_stmt", "else_stmt")
+
     def __init__(self, condition: Expr, then_stmt: Stmt, else_stmt: Stmt):
         self.condition = condition
         self.then_stmt = then_stmt
@@ -83,6 +96,8 @@ class IfStmt(Stmt):
 
 
 class While(Stmt):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: Expr, body: Stmt):
         self.condition = condition
         self.body = body
@@ -92,6 +107,8 @@ class While(Stmt):
 
 
 class Function(Stmt):
+    __slots__ = ("name", "params", "body")
+
     def __init__(self, name: Token, params: list[Token], body: list[Stmt]):
         self.name = name
         self.params = params
@@ -102,6 +119,8 @@ class Function(Stmt):
 
 
 class Return(Stmt):
+    __slots__ = ("keyword", "value")
+
     def __init__(self, keyword: Token, value: Expr):
         self.keyword = keyword
         self.value = value
@@ -111,6 +130,8 @@ class Return(Stmt):
 
 
 class Class(Stmt):
+    __slots__ = ("name", "superclass", "methods")
+
     def __init__(
         self, name: Token, superclass: expr.Var | None, methods: list[Function]
     ):
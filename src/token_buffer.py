@@ -0,0 +1,53 @@
+import array
+import typing as t
+
+from plox_token import Token
+from token_type import TokenType
+
+TOKEN_TYPES: dict[int, TokenType] = {
+    token_type.value: token_type for token_type in TokenType
+}
+
+
+class TokenBuffer:
+    """Struct-of-arrays token store over the scanned source.
+
+    Parallel arrays hold each token's type code, start/end offsets into
+    the source and line number. Lexemes and literals are sliced out of
+    the source, and Token objects built, only when a token is accessed,
+    so the parser can drop each Token as soon as it is done with it.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array.array("B")
+        self.starts = array.array("q")
+        self.ends = array.array("q")
+        self.lines = array.array("i")
+
+    def append(self, type_code: int, start: int, end: int, line: int) -> None:
+        self.types.append(type_code)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> Token:
+        token_type = TOKEN_TYPES[self.types[index]]
+        lexeme = self.source[self.starts[index]: self.ends[index]]
+
+        literal: t.Any = None
+        if token_type == TokenType.NUMBER:
+            literal = float(lexeme)
+        elif token_type == TokenType.STRING:
+            literal = lexeme[1:-1]
+        return Token(token_type, lexeme, literal, self.lines[index])
+
+    def __iter__(self) -> t.Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
@@ -8,44 +8,46 @@ class TokenType(Enum):
     RIGHT_PAREN = 2
     LEFT_BRACE = 3
     RIGHT_BRACE = 4
-    COMMA = 5
-    DOT = 6
-    MINUS = 7
-    PLUS = 8
-    SEMICOLON = 9
-    SLASH = 10
-    STAR = 11
+    LEFT_BRACKET = 5
+    RIGHT_BRACKET = 6
+    COMMA = 7
+    DOT = 8
+    MINUS = 9
+    PLUS = 10
+    SEMICOLON = 11
+    SLASH = 12
+    STAR = 13
 
     # One or two character tokens.
-    BANG = 12
-    BANG_EQUAL = 13
-    EQUAL = 14
-    EQUAL_EQUAL = 15
-    GREATER = 16
-    GREATER_EQUAL = 17
-    LESS = 18
-    LESS_EQUAL = 19
+    BANG = 14
+    BANG_EQUAL = 15
+    EQUAL = 16
+    EQUAL_EQUAL = 17
+    GREATER = 18
+    GREATER_EQUAL = 19
+    LESS = 20
+    LESS_EQUAL = 21
 
     # Literals.
-    IDENTIFIER = 20
-    STRING = 21
-    NUMBER = 22
+    IDENTIFIER = 22
+    STRING = 23
+    NUMBER = 24
 
     # Keywords.
-    AND = 23
-    CLASS = 24
-    ELSE = 25
-    FALSE = 26
-    FUN = 27
-    FOR = 28
-    IF = 29
-    NIL = 30
-    OR = 31
-    PRINT = 32
-    RETURN = 33
-    SUPER = 34
-    SELF = 35
-    TRUE = 36
-    VAR = 37
-    WHILE = 38
-    EOF = 39
+    AND = 25
+    CLASS = 26
+    ELSE = 27
+    FALSE = 28
+    FUN = 29
+    FOR = 30
+    IF = 31
+    NIL = 32
+    OR = 33
+    PRINT = 34
+    RETURN = 35
+    SUPER = 36
+    SELF = 37
+    TRUE = 38
+    VAR = 39
+    WHILE = 40
+    EOF = 41
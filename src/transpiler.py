@@ -0,0 +1,756 @@
+import hashlib
+import marshal
+import math
+import re
+import time
+import types
+import typing as t
+import warnings
+
+import expr
+import plox_list
+import stmt
+from exceptions import error_message
+from interpreter import Interpreter
+from output import Output
+from plox_function import FunctionType
+from plox_list import (
+    LoxList,
+    get_index,
+    set_index,
+)
+from plox_token import Token
+from token_type import TokenType
+
+# Locals are emitted as markers and expanded once the whole program is
+# known, because whether a local has to live in a Cell (it is captured by
+# an inner function) is only discovered after its first uses.
+MARKER = re.compile("\x01([RDSP])([A-Za-z0-9_]+)\x02")
+
+COMPARISONS = {
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+}
+ARITHMETIC = {
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.SLASH: "/",
+}
+EQUALITY = {
+    TokenType.EQUAL_EQUAL: "==",
+    TokenType.BANG_EQUAL: "!=",
+}
+
+# Default of every parameter of an emitted function, so that a call with
+# too few arguments reaches the arity check in its body (see arity_error).
+MISSING = object()
+
+
+class Cell:
+    __slots__ = ("v",)
+
+    def __init__(self, v: t.Any):
+        self.v = v
+
+    def rt_set(self, v: t.Any) -> t.Any:
+        self.v = v
+        return v
+
+
+class TranspiledInstance:
+    def __init__(self, *extra: t.Any):
+        if extra:
+            arity_error(0, (), extra)
+
+
+def lox_name(python_name: str) -> str:
+    return python_name.split("_", 1)[0]
+
+
+def stringify(value: t.Any) -> str:
+    if isinstance(value, TranspiledInstance):
+        return f"{lox_name(type(value).__name__)} instance"
+    if isinstance(value, LoxList):
+        return f"[{', '.join(map(stringify, value))}]"
+    if isinstance(value, type):
+        return lox_name(value.__name__)
+    if isinstance(value, types.MethodType):
+        value = value.__func__
+    if isinstance(value, types.FunctionType):
+        if value.__name__.startswith("rt_"):
+            return "<native fn>"
+        return f"<{lox_name(value.__name__)}>"
+    return Interpreter.stringify(value)
+
+
+def superclass(value: t.Any) -> type:
+    if isinstance(value, type) and issubclass(value, TranspiledInstance):
+        return value
+    raise RuntimeError("Superclass must be a class.")
+
+
+def operand_error(operator: str):
+    raise RuntimeError(f"Operand must be a float number. Operator: {operator}")
+
+
+def operands_error(operator: str):
+    raise RuntimeError(
+        f"Operands must be a float number. Operator: {operator}"
+    )
+
+
+def arity_error(arity: int, params: tuple, extra: tuple):
+    # Missing arguments are always the trailing parameters.
+    argc = sum(param is not MISSING for param in params) + len(extra)
+    raise RuntimeError(f"Expected {arity} arguments, but {argc} were given.")
+
+
+def undefined_assignment(name: str):
+    token = Token(TokenType.IDENTIFIER, name, None, 0)
+    raise RuntimeError(f"Undefined variable '{token}'.")
+
+
+def add_error():
+    raise RuntimeError(
+        f"Operands must be two numbers or two strings."
+        f" Operator: {TokenType.PLUS}"
+    )
+
+
+def get_property(obj: t.Any, name: str) -> t.Any:
+    if not isinstance(obj, TranspiledInstance):
+        raise RuntimeError("Only instances have properties.")
+    return getattr(obj, name)
+
+
+def set_property(obj: t.Any, name: str, value: t.Any) -> t.Any:
+    if not isinstance(obj, TranspiledInstance):
+        raise RuntimeError("Only instances have fields.")
+    setattr(obj, name, value)
+    return value
+
+
+# Natives check their arity the way emitted functions do.
+
+
+def rt_clock(*extra: t.Any) -> float:
+    if extra:
+        arity_error(0, (), extra)
+    return time.time()
+
+
+def rt_list(length: t.Any = MISSING, *extra: t.Any) -> LoxList:
+    if extra or length is MISSING:
+        arity_error(1, (length,), extra)
+    return plox_list.new_list(length)
+
+
+def rt_append(
+    lox_list: t.Any = MISSING, value: t.Any = MISSING, *extra: t.Any
+) -> None:
+    if extra or value is MISSING:
+        arity_error(2, (lox_list, value), extra)
+    plox_list.append(lox_list, value)
+
+
+def rt_len(value: t.Any = MISSING, *extra: t.Any) -> float:
+    if extra or value is MISSING:
+        arity_error(1, (value,), extra)
+    return plox_list.length(value)
+
+
+def rt_pop(lox_list: t.Any = MISSING, *extra: t.Any) -> t.Any:
+    if extra or lox_list is MISSING:
+        arity_error(1, (lox_list,), extra)
+    return plox_list.pop(lox_list)
+
+
+RUNTIME = {
+    "rt_Cell": Cell,
+    "rt_Instance": TranspiledInstance,
+    "rt_stringify": stringify,
+    "rt_superclass": superclass,
+    "rt_operand_error": operand_error,
+    "rt_operands_error": operands_error,
+    "rt_add_error": add_error,
+    "rt_arity_error": arity_error,
+    "rt_undefined_assignment": undefined_assignment,
+    "rt_missing": MISSING,
+    "rt_get_property": get_property,
+    "rt_set_property": set_property,
+    "rt_List": LoxList,
+    "rt_get_index": get_index,
+    "rt_set_index": set_index,
+    "clock_g": rt_clock,
+    "list_g": rt_list,
+    "append_g": rt_append,
+    "len_g": rt_len,
+    "pop_g": rt_pop,
+}
+
+
+class PyFunction:
+    def __init__(
+        self, enclosing: t.Optional["PyFunction"], kind: FunctionType | None
+    ):
+        self.enclosing = enclosing
+        self.kind = kind
+        self.free: dict[str, None] = {}
+        self.assigned_globals: set[str] = set()
+        self.start = 0
+
+
+class Transpiler:
+    """Emits Python source for a resolved Lox program.
+
+    Lox functions become Python functions and classes become Python
+    classes deriving from TranspiledInstance. Globals are Python globals
+    named ``<name>_g``, locals get a unique ``<name>_<n>`` name, and
+    properties are attributes named ``<name>_``. Functions that capture
+    locals are created through a factory taking the captured Cells, so
+    every closure sees the variables of its own loop iteration.
+    """
+
+    def __init__(self):
+        self.locals: dict[expr.Expr, int] = {}
+        self.lines: list[str] = []
+        self.indent = 0
+        self.scopes: list[tuple[dict[str, str], PyFunction]] = []
+        self.function = PyFunction(None, FunctionType.NONE)
+        self.captured: set[str] = set()
+        self.counter = 0
+
+    def resolve(self, expression: expr.Expr, depth: int, slot: int):
+        self.locals[expression] = depth
+
+    def transpile(self, statements: list[stmt.Stmt]) -> str:
+        self.function = PyFunction(None, FunctionType.NONE)
+        self.emit("def rt_main():")
+        self.indent += 1
+        globals_line = self.emit("")
+        self.emit_suite(statements)
+        self.lines[globals_line] += self.global_declaration(self.function)
+        self.indent -= 1
+        self.emit("rt_main()")
+        return MARKER.sub(self.expand_marker, "\n".join(self.lines))
+
+    def expand_marker(self, match: re.Match) -> str:
+        kind, name = match.groups()
+        if name in self.captured:
+            return {
+                "R": f"{name}.v",
+                "D": f"{name} = rt_Cell(",
+                "S": f"{name}.rt_set(",
+                "P": f"{name} = rt_Cell({name})",
+            }[kind]
+        return {
+            "R": name,
+            "D": f"{name} = (",
+            "S": f"({name} := ",
+            "P": "",
+        }[kind]
+
+    @staticmethod
+    def marker(kind: str, name: str) -> str:
+        return f"\x01{kind}{name}\x02"
+
+    def emit(self, line: str) -> int:
+        self.lines.append("    " * self.indent + line)
+        return len(self.lines) - 1
+
+    def emit_suite(self, statements: list[stmt.Stmt]) -> None:
+        start = len(self.lines)
+        for statement in statements:
+            statement.accept(self)
+        if len(self.lines) == start:
+            self.emit("pass")
+
+    def emit_block(self, statement: stmt.Stmt) -> None:
+        self.indent += 1
+        if isinstance(statement, stmt.Block):
+            self.scopes.append(({}, self.function))
+            self.emit_suite(statement.statements)
+            self.scopes.pop()
+        else:
+            self.emit_suite([statement])
+        self.indent -= 1
+
+    def temp(self) -> str:
+        self.counter += 1
+        return f"rt_t{self.counter}"
+
+    def mangle(self, name: str) -> str:
+        self.counter += 1
+        return f"{name}_{self.counter}"
+
+    @staticmethod
+    def global_declaration(function: PyFunction) -> str:
+        if not function.assigned_globals:
+            return ""
+        names = ", ".join(sorted(function.assigned_globals))
+        return f"global {names}"
+
+    def declare(self, name: Token) -> str | None:
+        if not self.scopes:
+            self.function.assigned_globals.add(f"{name.lexeme}_g")
+            return None
+        mangled = self.mangle(name.lexeme)
+        self.scopes[-1][0][name.lexeme] = mangled
+        return mangled
+
+    def lookup(self, name: str, expression: expr.Expr) -> str:
+        if self.locals.get(expression) is None:
+            return f"{name}_g"
+
+        for scope, owner in reversed(self.scopes):
+            if name not in scope:
+                continue
+            mangled = scope[name]
+            if owner is not self.function:
+                if mangled != "self":
+                    self.captured.add(mangled)
+                function: PyFunction | None = self.function
+                while function is not None and function is not owner:
+                    function.free[mangled] = None
+                    function = function.enclosing
+            return mangled
+        raise RuntimeError(f"Unresolved local '{name}'.")
+
+    def read(self, name: str, expression: expr.Expr) -> str:
+        mangled = self.lookup(name, expression)
+        if mangled.endswith("_g") or mangled == "self":
+            return mangled
+        return self.marker("R", mangled)
+
+    def truthy(self, expression: expr.Expr) -> str:
+        code = self.expression(expression)
+        if self.is_bool(expression):
+            return code
+        value = self.temp()
+        return f"(({value} := {code}) is not None and {value} is not False)"
+
+    def is_bool(self, expression: expr.Expr) -> bool:
+        if isinstance(expression, expr.Grouping):
+            return self.is_bool(expression.expr)
+        if isinstance(expression, expr.Literal):
+            return isinstance(expression.value, bool)
+        if isinstance(expression, expr.Unary):
+            return expression.operator.token_type == TokenType.BANG
+        if isinstance(expression, expr.Binary):
+            operator = expression.operator.token_type
+            return operator in COMPARISONS or operator in EQUALITY
+        if isinstance(expression, expr.Logical):
+            return self.is_bool(expression.left) and self.is_bool(
+                expression.right
+            )
+        return False
+
+    def expression(self, expression: expr.Expr) -> str:
+        return expression.accept(self)
+
+    def emit_function(
+        self, declaration: stmt.Function, py_name: str, kind: FunctionType
+    ) -> PyFunction:
+        function = PyFunction(self.function, kind)
+        scope: dict[str, str] = {}
+        receiver = []
+        if kind != FunctionType.FUNCTION:
+            scope["self"] = "self"
+            receiver.append("self")
+
+        params = []
+        for param in declaration.params:
+            mangled = self.mangle(param.lexeme)
+            scope[param.lexeme] = mangled
+            params.append(mangled)
+
+        self.function = function
+        self.scopes.append((scope, function))
+        signature = [
+            *receiver,
+            *(f"{param}=rt_missing" for param in params),
+            "*rt_extra",
+        ]
+        self.emit(f"def {py_name}({', '.join(signature)}):")
+        self.indent += 1
+        globals_line = self.emit("")
+        self.emit_arity_check(params)
+        for mangled in params:
+            self.emit(self.marker("P", mangled))
+
+        self.emit_suite(declaration.body)
+        if py_name == "init_":
+            self.emit("return self")
+
+        self.lines[globals_line] += self.global_declaration(function)
+        self.indent -= 1
+        self.scopes.pop()
+        assert function.enclosing is not None
+        self.function = function.enclosing
+        return function
+
+    def emit_arity_check(self, params: list[str]) -> None:
+        missing = f" or {params[-1]} is rt_missing" if params else ""
+        self.emit(f"if rt_extra{missing}:")
+        self.indent += 1
+        values = "".join(f"{param}, " for param in params)
+        self.emit(f"rt_arity_error({len(params)}, ({values}), rt_extra)")
+        self.indent -= 1
+
+    def bind_local(
+        self,
+        mangled: str,
+        py_name: str,
+        function: PyFunction,
+        params: list[str],
+        args: list[str],
+    ) -> None:
+        if not params:
+            for i in range(function.start, len(self.lines)):
+                self.lines[i] = self.lines[i][4:]
+            self.emit(f"{self.marker('D', mangled)}{py_name})")
+            return
+
+        self.lines.insert(
+            function.start,
+            "    " * self.indent
+            + f"def rt_mk_{mangled}({', '.join(params)}):",
+        )
+        self.indent += 1
+        self.emit(f"return {py_name}")
+        self.indent -= 1
+
+        values = ", ".join(args)
+        if mangled in function.free:
+            # The declaration refers to itself, so its cell has to exist
+            # before the factory captures it.
+            self.emit(f"{mangled} = rt_Cell(None)")
+            self.emit(f"{mangled}.v = rt_mk_{mangled}({values})")
+        else:
+            self.emit(f"{self.marker('D', mangled)}rt_mk_{mangled}({values}))")
+
+    def visit_expression_stmt(self, statement: stmt.Expression):
+        expression = statement.expr
+        if isinstance(expression, expr.Assign):
+            self.emit(self.assign_statement(expression))
+        else:
+            self.emit(self.expression(expression))
+
+    def assign_statement(self, assign_expr: expr.Assign) -> str:
+        value = self.expression(assign_expr.value)
+        mangled = self.lookup(assign_expr.name.lexeme, assign_expr)
+        if mangled.endswith("_g"):
+            self.function.assigned_globals.add(mangled)
+            return f"{self.defined_global(mangled)}; {mangled} = {value}"
+        return f"{self.marker('R', mangled)} = {value}"
+
+    @staticmethod
+    def defined_global(mangled: str) -> str:
+        # Assigning an undefined global is an error, not a definition.
+        return (
+            f"({mangled!r} in rt_globals"
+            f" or rt_undefined_assignment({lox_name(mangled)!r}))"
+        )
+
+    def visit_print_stmt(self, statement: stmt.Print):
+        self.emit(f"rt_write(rt_stringify({self.expression(statement.expr)}))")
+
+    def visit_var_stmt(self, statement: stmt.Var):
+        value = "None"
+        if statement.initializer is not None:
+            value = self.expression(statement.initializer)
+
+        mangled = self.declare(statement.name)
+        if mangled is None:
+            self.emit(f"{statement.name.lexeme}_g = {value}")
+        else:
+            self.emit(f"{self.marker('D', mangled)}{value})")
+
+    def visit_block_stmt(self, block_stmt: stmt.Block):
+        self.scopes.append(({}, self.function))
+        for statement in block_stmt.statements:
+            statement.accept(self)
+        self.scopes.pop()
+
+    def visit_if_stmt(self, statement: stmt.IfStmt):
+        self.emit(f"if {self.truthy(statement.condition)}:")
+        self.emit_block(statement.then_stmt)
+        if statement.else_stmt is not None:
+            self.emit("else:")
+            self.emit_block(statement.else_stmt)
+
+    def visit_while_stmt(self, statement: stmt.While):
+        self.emit(f"while {self.truthy(statement.condition)}:")
+        self.emit_block(statement.body)
+
+    def visit_return_stmt(self, statement: stmt.Return):
+        if statement.value is None:
+            self.emit("return None")
+        else:
+            self.emit(f"return {self.expression(statement.value)}")
+
+    def visit_function_stmt(self, statement: stmt.Function):
+        mangled = self.declare(statement.name)
+        if mangled is None:
+            self.emit_function(
+                statement, f"{statement.name.lexeme}_g", FunctionType.FUNCTION
+            )
+            return
+
+        start = len(self.lines)
+        self.indent += 1
+        function = self.emit_function(
+            statement, f"{mangled}d", FunctionType.FUNCTION
+        )
+        self.indent -= 1
+        function.start = start
+        free = list(function.free)
+        self.bind_local(mangled, f"{mangled}d", function, free, free)
+
+    def visit_class_stmt(self, statement: stmt.Class):
+        mangled = self.declare(statement.name)
+        base = "rt_Instance"
+        if statement.superclass is not None:
+            base = f"rt_superclass({self.expression(statement.superclass)})"
+
+        if mangled is None:
+            self.emit_class(statement, f"{statement.name.lexeme}_g", base)
+            return
+
+        class_scope = PyFunction(self.function, None)
+        self.function = class_scope
+        start = len(self.lines)
+        self.indent += 1
+        self.emit_class(statement, f"{mangled}c", "rt_base")
+        self.indent -= 1
+        assert class_scope.enclosing is not None
+        self.function = class_scope.enclosing
+
+        class_scope.start = start
+        free = list(class_scope.free)
+        self.bind_local(
+            mangled,
+            f"{mangled}c",
+            class_scope,
+            ["rt_base", *free],
+            [base, *free],
+        )
+
+    def emit_class(self, statement: stmt.Class, py_name: str, base: str):
+        self.emit(f"class {py_name}({base}):")
+        self.indent += 1
+        self.emit("pass")
+        for method in statement.methods:
+            name = method.name.lexeme
+            if name == "init":
+                self.emit_function(
+                    method, "__init__", FunctionType.INITIALIZER
+                )
+                self.emit_function(method, "init_", FunctionType.INITIALIZER)
+            else:
+                self.emit_function(method, f"{name}_", FunctionType.METHOD)
+        self.indent -= 1
+
+    def visit_literal_expr(self, literal_expr: expr.Literal):
+        value = literal_expr.value
+        if isinstance(value, float) and not math.isfinite(value):
+            return f"float({str(value)!r})"
+        return repr(value)
+
+    def visit_grouping_expr(self, grouping_expr: expr.Grouping):
+        return self.expression(grouping_expr.expr)
+
+    def visit_unary_expr(self, unary_expr: expr.Unary):
+        right = unary_expr.right
+        if unary_expr.operator.token_type == TokenType.BANG:
+            if self.is_bool(right):
+                return f"(not {self.expression(right)})"
+            value = self.temp()
+            code = self.expression(right)
+            return f"(({value} := {code}) is None or {value} is False)"
+
+        value = self.temp()
+        operator = repr(str(unary_expr.operator))
+        return (
+            f"(-{value} if type({value} := {self.expression(right)}) is float"
+            f" else rt_operand_error({operator}))"
+        )
+
+    def visit_binary_expr(self, binary_expr: expr.Binary):
+        left = self.expression(binary_expr.left)
+        right = self.expression(binary_expr.right)
+        operator_type = binary_expr.operator.token_type
+
+        if operator_type in EQUALITY:
+            return f"({left} {EQUALITY[operator_type]} {right})"
+
+        a = self.temp()
+        b = self.temp()
+        if operator_type == TokenType.PLUS:
+            return (
+                f"({a} + {b} if type({a} := {left}) is type({b} := {right})"
+                f" and (type({a}) is float or type({a}) is str)"
+                f" else rt_add_error())"
+            )
+
+        symbol = COMPARISONS.get(operator_type) or ARITHMETIC[operator_type]
+        operator = repr(str(binary_expr.operator))
+        return (
+            f"({a} {symbol} {b}"
+            f" if type({a} := {left}) is type({b} := {right}) is float"
+            f" else rt_operands_error({operator}))"
+        )
+
+    def visit_logical_expr(self, logical_expr: expr.Logical):
+        left_expr = logical_expr.left
+        left = self.expression(left_expr)
+        right = self.expression(logical_expr.right)
+        is_or = logical_expr.operator.token_type == TokenType.OR
+
+        if self.is_bool(left_expr):
+            return f"({left} {'or' if is_or else 'and'} {right})"
+
+        value = self.temp()
+        truthy = f"({value} := {left}) is not None and {value} is not False"
+        if is_or:
+            return f"({value} if {truthy} else {right})"
+        return f"({right} if {truthy} else {value})"
+
+    def visit_var_expr(self, var_expr: expr.Var):
+        return self.read(var_expr.token.lexeme, var_expr)
+
+    def visit_self_expr(self, self_expr: expr.Self):
+        return self.read("self", self_expr)
+
+    def visit_assign_expr(self, assign_expr: expr.Assign):
+        value = self.expression(assign_expr.value)
+        mangled = self.lookup(assign_expr.name.lexeme, assign_expr)
+        if mangled.endswith("_g"):
+            self.function.assigned_globals.add(mangled)
+            probe = self.defined_global(mangled)
+            return f"({probe}, ({mangled} := {value}))[1]"
+        return f"{self.marker('S', mangled)}{value})"
+
+    def visit_call_expr(self, call_expr: expr.Call):
+        arguments = ", ".join(
+            self.expression(argument) for argument in call_expr.arguments
+        )
+        return f"{self.callee(call_expr.calle)}({arguments})"
+
+    def callee(self, calle: expr.Expr) -> str:
+        if isinstance(calle, (expr.Var, expr.Get, expr.Super, expr.Call)):
+            return self.expression(calle)
+        return f"({self.expression(calle)})"
+
+    def visit_get_expr(self, get_expr: expr.Get):
+        obj = self.expression(get_expr.expression)
+        name = f"{get_expr.name.lexeme}_"
+        return f"rt_get_property({obj}, {name!r})"
+
+    def visit_set_expr(self, set_expr: expr.Set):
+        obj = self.expression(set_expr.expression)
+        value = self.expression(set_expr.value)
+        name = f"{set_expr.name.lexeme}_"
+        return f"rt_set_property({obj}, {name!r}, {value})"
+
+    def visit_list_literal_expr(self, list_expr: expr.ListLiteral):
+        elements = ", ".join(
+            self.expression(element) for element in list_expr.elements
+        )
+        return f"rt_List([{elements}])"
+
+    def visit_index_expr(self, index_expr: expr.Index):
+        obj = self.expression(index_expr.expression)
+        index = self.expression(index_expr.index)
+        return f"rt_get_index({obj}, {index})"
+
+    def visit_set_index_expr(self, set_expr: expr.SetIndex):
+        obj = self.expression(set_expr.expression)
+        index = self.expression(set_expr.index)
+        value = self.expression(set_expr.value)
+        return f"rt_set_index({obj}, {index}, {value})"
+
+    def visit_super_expr(self, super_expr: expr.Super):
+        instance = self.read("self", super_expr)
+        return f"super(__class__, {instance}).{super_expr.method.lexeme}_"
+
+
+class PythonProgram:
+    """A transpiled program, compiled once and cached per source hash.
+
+    The hash covers whether the AST optimizer ran, since the optimized
+    and unoptimized programs can differ.
+    """
+
+    cache: dict[str, "PythonProgram"] = {}
+
+    def __init__(self, code: types.CodeType):
+        self.code = code
+
+    @staticmethod
+    def key(source: str, optimized: bool) -> str:
+        data = f"{optimized}\0{source}".encode("utf-8")
+        return hashlib.sha256(data).hexdigest()
+
+    @classmethod
+    def cached(
+        cls, source: str, optimized: bool
+    ) -> t.Optional["PythonProgram"]:
+        return cls.cache.get(cls.key(source, optimized))
+
+    @classmethod
+    def compile(
+        cls, source: str, python_source: str, optimized: bool
+    ) -> "PythonProgram":
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", SyntaxWarning)
+            code = compile(python_source, "<lox>", "exec")
+        program = cls(code)
+        cls.cache[cls.key(source, optimized)] = program
+        return program
+
+    def __reduce__(self):
+        # Code objects cannot be pickled; marshal them as .pyc files do.
+        return PythonProgram.from_marshal, (marshal.dumps(self.code),)
+
+    @classmethod
+    def from_marshal(cls, data: bytes) -> "PythonProgram":
+        return cls(marshal.loads(data))
+
+    def run(self) -> None:
+        output = Output()
+
+        def rt_flush(*extra: t.Any) -> None:
+            if extra:
+                arity_error(0, (), extra)
+            output.flush()
+
+        namespace = dict(RUNTIME, rt_write=output.write, flush_g=rt_flush)
+        namespace["rt_globals"] = namespace
+        try:
+            try:
+                exec(self.code, namespace)
+            finally:
+                # Printed lines come before any error reported below.
+                output.flush()
+        except RuntimeError as error:
+            print(error_message(error))
+        except NameError as error:
+            token = Token(TokenType.IDENTIFIER, lox_name(error.name), None, 0)
+            print(f"Undefined variable {token}.")
+        except AttributeError as error:
+            obj = getattr(error, "obj", None)
+            if isinstance(obj, TranspiledInstance):
+                print(f"Undefined property '{lox_name(error.name)}'.")
+            elif isinstance(obj, super):
+                print(f"Undefined property: '{lox_name(error.name)}'.")
+            else:
+                raise
+        except TypeError as error:
+            # Callables check their own arity, so this is a call to a
+            # value that is not callable at all.
+            if not str(error).endswith("object is not callable"):
+                raise
+            print("Can only call functions and classes.")
@@ -0,0 +1,514 @@
+import typing as t
+
+from bytecode import (
+    ADD,
+    ARGC_BITS,
+    ARGC_MASK,
+    BUILD_LIST,
+    CALL,
+    CLASS,
+    CLOSURE,
+    CONSTANT,
+    DEFINE_CELL,
+    DEFINE_GLOBAL,
+    DEFINE_LOCAL,
+    DIVIDE,
+    EQUAL,
+    FALSE,
+    GET_CELL,
+    GET_GLOBAL,
+    GET_INDEX,
+    GET_LOCAL,
+    GET_PROPERTY,
+    GET_SUPER,
+    GET_UPVALUE,
+    GREATER,
+    GREATER_EQUAL,
+    INHERIT,
+    INVOKE,
+    JUMP,
+    JUMP_IF_FALSE,
+    JUMP_IF_TRUE,
+    LESS,
+    LESS_EQUAL,
+    METHOD,
+    MULTIPLY,
+    NEGATE,
+    NEW_CELL,
+    NIL,
+    NOT,
+    NOT_EQUAL,
+    POP,
+    POP_JUMP_IF_FALSE,
+    PRINT,
+    RETURN,
+    SET_CELL,
+    SET_GLOBAL,
+    SET_INDEX,
+    SET_LOCAL,
+    SET_PROPERTY,
+    SET_UPVALUE,
+    SUBTRACT,
+    SUPER_INVOKE,
+    TRUE,
+    FunctionProto,
+)
+from callable import (
+    AppendCallable,
+    ClockCallable,
+    FlushCallable,
+    LenCallable,
+    ListCallable,
+    PloxCallable,
+    PopCallable,
+)
+from exceptions import error_message
+from interpreter import Interpreter
+from output import Output
+from plox_list import (
+    LoxList,
+    get_index,
+    set_index,
+)
+from plox_token import Token
+from token_type import TokenType
+
+FRAMES_MAX = 100_000
+
+OPERATORS = {
+    SUBTRACT: Token(TokenType.MINUS, "-", None, 0),
+    MULTIPLY: Token(TokenType.STAR, "*", None, 0),
+    DIVIDE: Token(TokenType.SLASH, "/", None, 0),
+    GREATER: Token(TokenType.GREATER, ">", None, 0),
+    GREATER_EQUAL: Token(TokenType.GREATER_EQUAL, ">=", None, 0),
+    LESS: Token(TokenType.LESS, "<", None, 0),
+    LESS_EQUAL: Token(TokenType.LESS_EQUAL, "<=", None, 0),
+    NEGATE: Token(TokenType.MINUS, "-", None, 0),
+}
+
+stringify = Interpreter.stringify
+
+
+class Cell:
+    __slots__ = ("value",)
+
+    def __init__(self, value: t.Any = None):
+        self.value = value
+
+
+class Closure(PloxCallable):
+    def __init__(self, proto: FunctionProto, upvalues: list[Cell]):
+        self.proto = proto
+        self.upvalues = upvalues
+
+    def arity(self) -> int:
+        return self.proto.arity
+
+    def call(self, interpreter: "VM", arguments: list[t.Any]) -> t.Any:
+        return interpreter.run(self, list(arguments))
+
+    def __str__(self) -> str:
+        return str(self.proto)
+
+
+class VMClass(PloxCallable):
+    def __init__(self, name: str):
+        self.name = name
+        self.methods: dict[str, Closure] = {}
+        self.initializer: Closure | None = None
+
+    def arity(self) -> int:
+        if self.initializer is None:
+            return 0
+        return self.initializer.arity()
+
+    def call(self, interpreter: "VM", arguments: list[t.Any]) -> t.Any:
+        instance = VMInstance(self)
+        if self.initializer is not None:
+            interpreter.run(self.initializer, [instance, *arguments])
+        return instance
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class VMInstance:
+    __slots__ = ("klass", "fields")
+
+    def __init__(self, klass: VMClass):
+        self.klass = klass
+        self.fields: dict[str, t.Any] = {}
+
+    def __str__(self) -> str:
+        return f"{self.klass.name} instance"
+
+
+class BoundMethod(PloxCallable):
+    def __init__(self, receiver: VMInstance, method: Closure):
+        self.receiver = receiver
+        self.method = method
+
+    def arity(self) -> int:
+        return self.method.arity()
+
+    def call(self, interpreter: "VM", arguments: list[t.Any]) -> t.Any:
+        return interpreter.run(self.method, [self.receiver, *arguments])
+
+    def __str__(self) -> str:
+        return str(self.method)
+
+
+class VM:
+    def __init__(self):
+        self.globals: dict[str, t.Any] = {}
+        self.globals["clock"] = ClockCallable()
+        self.globals["flush"] = FlushCallable()
+        self.globals["list"] = ListCallable()
+        self.globals["append"] = AppendCallable()
+        self.globals["len"] = LenCallable()
+        self.globals["pop"] = PopCallable()
+        self.output = Output()
+
+    def interpret(self, script: FunctionProto) -> bool:
+        try:
+            self.run(Closure(script, []), [])
+        except RuntimeError as error:
+            self.output.write(error_message(error))
+            return False
+        finally:
+            self.output.flush()
+        return True
+
+    def run(self, closure: Closure, arguments: list[t.Any]) -> t.Any:
+        globals_ = self.globals
+        write = self.output.write
+        frames: list[tuple] = []
+        stack: list[t.Any] = []
+
+        proto = closure.proto
+        code = proto.code
+        constants = proto.constants
+        names = proto.names
+        upvalues = closure.upvalues
+        slots = self.make_slots(proto, arguments)
+        ip = 0
+
+        while True:
+            opcode = code[ip]
+            arg = code[ip + 1]
+            ip += 2
+
+            if opcode == GET_LOCAL:
+                stack.append(slots[arg])
+            elif opcode == CONSTANT:
+                stack.append(constants[arg])
+            elif opcode == GET_GLOBAL:
+                name = names[arg]
+                if name not in globals_:
+                    raise self.undefined_variable(name)
+                stack.append(globals_[name])
+            elif opcode == POP_JUMP_IF_FALSE:
+                value = stack.pop()
+                if value is None or value is False:
+                    ip = arg
+            elif opcode == LESS:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left < right
+            elif opcode == ADD:
+                right = stack.pop()
+                left = stack[-1]
+                left_type = type(left)
+                if (left_type is float or left_type is str) and type(
+                    right
+                ) is left_type:
+                    stack[-1] = left + right
+                else:
+                    raise RuntimeError(
+                        f"Operands must be two numbers or two strings."
+                        f" Operator: {TokenType.PLUS}"
+                    )
+            elif opcode == SUBTRACT:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left - right
+            elif opcode == SET_LOCAL:
+                slots[arg] = stack[-1]
+            elif opcode == POP:
+                stack.pop()
+            elif opcode == JUMP:
+                ip = arg
+            elif opcode == DEFINE_LOCAL:
+                slots[arg] = stack.pop()
+            elif opcode == GET_UPVALUE:
+                stack.append(upvalues[arg].value)
+            elif opcode == GET_CELL:
+                stack.append(slots[arg].value)
+            elif opcode == GET_PROPERTY:
+                instance = stack[-1]
+                if type(instance) is not VMInstance:
+                    raise RuntimeError("Only instances have properties.")
+                name = names[arg]
+                fields = instance.fields
+                if name in fields:
+                    stack[-1] = fields[name]
+                else:
+                    method = instance.klass.methods.get(name)
+                    if method is None:
+                        raise RuntimeError(f"Undefined property '{name}'.")
+                    stack[-1] = BoundMethod(instance, method)
+            elif opcode == GET_INDEX:
+                index = stack.pop()
+                stack[-1] = get_index(stack[-1], index)
+            elif CALL <= opcode <= SUPER_INVOKE:
+                target = None
+                argc = arg if opcode == CALL else arg & ARGC_MASK
+                if opcode == SUPER_INVOKE:
+                    superclass = stack.pop()
+                # The callee (or receiver) sits just below its arguments.
+                callee_at = len(stack) - argc - 1
+                arguments_at = callee_at + 1
+                if opcode == CALL:
+                    callee = stack[callee_at]
+                else:
+                    name = names[arg >> ARGC_BITS]
+                    if opcode == INVOKE:
+                        receiver = stack[callee_at]
+                        if type(receiver) is not VMInstance:
+                            raise RuntimeError(
+                                "Only instances have properties."
+                            )
+                        if name in receiver.fields:
+                            callee = receiver.fields[name]
+                        else:
+                            target = receiver.klass.methods.get(name)
+                            if target is None:
+                                raise RuntimeError(
+                                    f"Undefined property '{name}'."
+                                )
+                            new_slots = stack[callee_at:]
+                    else:
+                        target = superclass.methods.get(name)
+                        if target is None:
+                            raise self.undefined_super(name)
+                        new_slots = stack[callee_at:]
+
+                if target is None:
+                    callee_type = type(callee)
+                    if callee_type is Closure:
+                        target = callee
+                        new_slots = stack[arguments_at:]
+                    elif callee_type is BoundMethod:
+                        target = callee.method
+                        new_slots = stack[callee_at:]
+                        new_slots[0] = callee.receiver
+                    elif callee_type is VMClass:
+                        instance = VMInstance(callee)
+                        target = callee.initializer
+                        if target is None:
+                            if argc != 0:
+                                raise self.arity_error(0, argc)
+                            del stack[callee_at:]
+                            stack.append(instance)
+                            continue
+                        new_slots = stack[callee_at:]
+                        new_slots[0] = instance
+                    elif isinstance(callee, PloxCallable):
+                        if argc != callee.arity():
+                            raise self.arity_error(callee.arity(), argc)
+                        arguments = stack[arguments_at:]
+                        del stack[callee_at:]
+                        stack.append(callee.call(self, arguments))
+                        continue
+                    else:
+                        raise RuntimeError(
+                            "Can only call functions and classes."
+                        )
+
+                proto = target.proto
+                if argc != proto.arity:
+                    raise self.arity_error(proto.arity, argc)
+                if len(frames) >= FRAMES_MAX:
+                    raise RuntimeError("Stack overflow.")
+
+                del stack[callee_at:]
+                frames.append((code, constants, names, upvalues, slots, ip))
+
+                code = proto.code
+                constants = proto.constants
+                names = proto.names
+                upvalues = target.upvalues
+                if len(new_slots) < proto.num_slots:
+                    new_slots += [None] * (proto.num_slots - len(new_slots))
+                for slot in proto.cell_params:
+                    new_slots[slot] = Cell(new_slots[slot])
+                slots = new_slots
+                ip = 0
+            elif opcode == RETURN:
+                result = stack.pop()
+                if not frames:
+                    return result
+                code, constants, names, upvalues, slots, ip = frames.pop()
+                stack.append(result)
+            elif opcode == GREATER:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left > right
+            elif opcode == LESS_EQUAL:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left <= right
+            elif opcode == GREATER_EQUAL:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left >= right
+            elif opcode == MULTIPLY:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left * right
+            elif opcode == DIVIDE:
+                right = stack.pop()
+                left = stack[-1]
+                if type(left) is not float or type(right) is not float:
+                    raise self.operands_error(opcode)
+                stack[-1] = left / right
+            elif opcode == EQUAL:
+                right = stack.pop()
+                stack[-1] = stack[-1] == right
+            elif opcode == NOT_EQUAL:
+                right = stack.pop()
+                stack[-1] = stack[-1] != right
+            elif opcode == SET_PROPERTY:
+                value = stack.pop()
+                instance = stack[-1]
+                if type(instance) is not VMInstance:
+                    raise RuntimeError("Only instances have fields.")
+                instance.fields[names[arg]] = value
+                stack[-1] = value
+            elif opcode == SET_INDEX:
+                value = stack.pop()
+                index = stack.pop()
+                stack[-1] = set_index(stack[-1], index, value)
+            elif opcode == BUILD_LIST:
+                start = len(stack) - arg
+                elements = LoxList(stack[start:])
+                del stack[start:]
+                stack.append(elements)
+            elif opcode == SET_UPVALUE:
+                upvalues[arg].value = stack[-1]
+            elif opcode == SET_CELL:
+                slots[arg].value = stack[-1]
+            elif opcode == DEFINE_CELL:
+                slots[arg] = Cell(stack.pop())
+            elif opcode == NEW_CELL:
+                slots[arg] = Cell()
+            elif opcode == SET_GLOBAL:
+                name = names[arg]
+                if name not in globals_:
+                    raise self.undefined_assignment(name)
+                globals_[name] = stack[-1]
+            elif opcode == DEFINE_GLOBAL:
+                globals_[names[arg]] = stack.pop()
+            elif opcode == JUMP_IF_FALSE:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip = arg
+            elif opcode == JUMP_IF_TRUE:
+                value = stack[-1]
+                if value is not None and value is not False:
+                    ip = arg
+            elif opcode == NIL:
+                stack.append(None)
+            elif opcode == TRUE:
+                stack.append(True)
+            elif opcode == FALSE:
+                stack.append(False)
+            elif opcode == NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False
+            elif opcode == NEGATE:
+                if type(stack[-1]) is not float:
+                    raise RuntimeError(
+                        f"Operand must be a float number."
+                        f" Operator: {OPERATORS[opcode]}"
+                    )
+                stack[-1] = -stack[-1]
+            elif opcode == PRINT:
+                write(stringify(stack.pop()))
+            elif opcode == CLOSURE:
+                function = constants[arg]
+                cells = [
+                    slots[index] if is_local else upvalues[index]
+                    for is_local, index in function.upvalues
+                ]
+                stack.append(Closure(function, cells))
+            elif opcode == GET_SUPER:
+                superclass = stack.pop()
+                name = names[arg]
+                method = superclass.methods.get(name)
+                if method is None:
+                    raise self.undefined_super(name)
+                stack[-1] = BoundMethod(stack[-1], method)
+            elif opcode == CLASS:
+                stack.append(VMClass(names[arg]))
+            elif opcode == INHERIT:
+                superclass = stack.pop()
+                if type(superclass) is not VMClass:
+                    raise RuntimeError("Superclass must be a class.")
+                subclass = stack[-1]
+                subclass.methods.update(superclass.methods)
+                subclass.initializer = superclass.initializer
+            elif opcode == METHOD:
+                method = stack.pop()
+                klass = stack[-1]
+                klass.methods[names[arg]] = method
+                if names[arg] == "init":
+                    klass.initializer = method
+            else:
+                raise RuntimeError(f"Unknown opcode {opcode}.")
+
+    @staticmethod
+    def make_slots(proto: FunctionProto, arguments: list[t.Any]) -> list:
+        slots = list(arguments)
+        slots += [None] * (proto.num_slots - len(slots))
+        for slot in proto.cell_params:
+            slots[slot] = Cell(slots[slot])
+        return slots
+
+    @staticmethod
+    def undefined_variable(name: str) -> RuntimeError:
+        token = Token(TokenType.IDENTIFIER, name, None, 0)
+        return RuntimeError(f"Undefined variable {token}.")
+
+    @staticmethod
+    def undefined_assignment(name: str) -> RuntimeError:
+        token = Token(TokenType.IDENTIFIER, name, None, 0)
+        return RuntimeError(f"Undefined variable '{token}'.")
+
+    @staticmethod
+    def undefined_super(name: str) -> RuntimeError:
+        return RuntimeError(f"Undefined property: '{name}'.")
+
+    @staticmethod
+    def operands_error(opcode: int) -> RuntimeError:
+        return RuntimeError(
+            f"Operands must be a float number. Operator: {OPERATORS[opcode]}"
+        )
+
+    @staticmethod
+    def arity_error(arity: int, argc: int) -> RuntimeError:
+        return RuntimeError(
+            f"Expected {arity} arguments, but {argc} were given."
+        )
@@ -0,0 +1,27 @@
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lox import Lox  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """Runs Lox source on an engine and returns what it printed."""
+
+    def run(source: str, engine: str = "tree", optimize: bool = True) -> str:
+        output = io.StringIO()
+        Lox.optimize = optimize
+        try:
+            with contextlib.redirect_stdout(output):
+                Lox.run(source, engine)
+        finally:
+            Lox.optimize = True
+        return output.getvalue()
+
+    return run
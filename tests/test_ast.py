@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+import expr
+import specialized
+import stmt
+
+TOOLS = Path(__file__).resolve().parent.parent / "tools"
+sys.path.insert(0, str(TOOLS))
+
+import generate_ast  # noqa: E402
+
+
+@pytest.mark.parametrize("base", generate_ast.AST)
+def test_generated_modules_are_up_to_date(base):
+    imports, grammar, nodes = generate_ast.AST[base]
+    path = generate_ast.SRC / f"{base.lower()}.py"
+    assert path.read_text() == generate_ast.define_ast(
+        base, imports, grammar, nodes
+    )
+
+
+@pytest.mark.parametrize("module", [expr, stmt])
+def test_nodes_have_no_instance_dict(module):
+    base = getattr(module, module.__name__.capitalize())
+    for node_class in base.__subclasses__():
+        assert node_class.__dictoffset__ == 0, node_class.__name__
+
+
+def test_specialized_nodes_share_the_binary_layout():
+    node = expr.Binary(expr.Literal(1.0), None, expr.Literal(2.0))
+    for node_class in expr.Binary.__subclasses__():
+        assert node_class.__module__ == specialized.__name__
+        node.__class__ = node_class
+    assert node.left.value == 1.0 and node.right.value == 2.0
@@ -0,0 +1,51 @@
+import json
+import sys
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / "benchmarks"
+sys.path.insert(0, str(BENCHMARKS))
+
+import run as suite  # noqa: E402
+
+
+def results(medians: dict[str, dict[str, float]]) -> dict:
+    return {
+        "results": {
+            name: {
+                engine: {"median": median}
+                for engine, median in engines.items()
+            }
+            for name, engines in medians.items()
+        }
+    }
+
+
+def test_every_suite_program_is_found():
+    names = {path.stem for path in suite.PROGRAMS.glob("*.lox")}
+    assert {"fib", "binary_trees", "method_call", "zoo"} <= names
+
+
+def test_run_suite_records_each_engine(tmp_path, monkeypatch, capsys):
+    (tmp_path / "tiny.lox").write_text("print 1 + 2;")
+    monkeypatch.setattr(suite, "PROGRAMS", tmp_path)
+
+    report = suite.run_suite(["tiny"], ["tree", "vm"], repeat=2)
+
+    tiny = report["results"]["tiny"]
+    assert set(tiny) == {"tree", "vm"}
+    assert all(len(result["runs"]) == 2 for result in tiny.values())
+    assert "disagree" not in capsys.readouterr().out
+    json.dumps(report)
+
+
+def test_compare_flags_slowdowns_past_the_threshold(tmp_path, capsys):
+    base = tmp_path / "base.json"
+    new = tmp_path / "new.json"
+    base.write_text(json.dumps(results({"fib": {"tree": 1.0, "vm": 1.0}})))
+
+    new.write_text(json.dumps(results({"fib": {"tree": 1.05, "vm": 0.5}})))
+    assert suite.compare(str(base), str(new), 0.1)
+
+    new.write_text(json.dumps(results({"fib": {"tree": 1.2, "vm": 1.0}})))
+    assert not suite.compare(str(base), str(new), 0.1)
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,65 @@
+import pytest
+
+PROGRAMS = {
+    "shadowing": """
+        var a = "global";
+        {
+            fun show() { print a; }
+            show();
+            var a = "block";
+            show();
+            print a;
+        }
+    """,
+    "recursion": """
+        fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+        print fib(15);
+    """,
+    "methods": """
+        class Counter {
+            init() { self.count = 0; }
+            add(n) { self.count = self.count + n; return self; }
+        }
+        var counter = Counter();
+        counter.add(1).add(2);
+        var add = counter.add;
+        add(3);
+        print counter.count;
+    """,
+    "logic": """
+        print nil or "default";
+        print 0 and "zero is truthy";
+        print !nil == true;
+    """,
+}
+
+ERRORS = {
+    "undefined_assignment": "missing = 1;",
+    "undefined_super": """
+        class A {}
+        class B < A { m() { return super.x; } }
+        B().m();
+    """,
+    "superclass": "var X = 1; class B < X {}",
+    "call": '"text"();',
+    "arity": "class A { init(a) {} } A();",
+}
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_programs_match_tree_engine(run, name):
+    source = PROGRAMS[name]
+    assert run(source, "closure") == run(source, "tree")
+
+
+@pytest.mark.parametrize("name", ERRORS)
+def test_runtime_errors_match_tree_engine(run, name):
+    source = ERRORS[name]
+    assert run(source, "closure") == run(source, "tree")
+
+
+def test_error_stops_the_program(run):
+    output = run('print "before"; missing(); print "after";', "closure")
+    assert output == (
+        "before\nUndefined variable TokenType.IDENTIFIER missing None.\n"
+    )
@@ -0,0 +1,196 @@
+"""Every engine, with and without the optimizer, runs Lox the same way."""
+
+import pytest
+
+from exceptions import ResolveError
+from lox import ENGINES
+
+MODES = [
+    pytest.param(
+        engine, optimize, id=f"{engine}-{'opt' if optimize else 'no-opt'}"
+    )
+    for engine in ENGINES
+    for optimize in (True, False)
+]
+
+PROGRAMS = {
+    "values": """
+        print 1;
+        print 2.5;
+        print -3 + 1;
+        print "lox";
+        print nil;
+        print true and false;
+        print nil or "default";
+        print 10 / 4 * 2 - 1;
+        print "a" + "b" == "ab";
+        print 1 < 2 == !(2 <= 1);
+    """,
+    "scopes": """
+        var a = "global";
+        {
+            var a = "outer";
+            {
+                var b = a;
+                a = "changed";
+                print b;
+            }
+            print a;
+        }
+        print a;
+    """,
+    "control_flow": """
+        var total = 0;
+        for (var i = 0; i < 10; i = i + 1) {
+            if (i == 3) total = total + 100;
+            else if (i > 7) total = total + 10;
+            else total = total + i;
+        }
+        var n = 0;
+        while (n < 5) n = n + 2;
+        print total;
+        print n;
+    """,
+    "closures": """
+        fun counter() {
+            var count = 0;
+            fun increment() {
+                count = count + 1;
+                return count;
+            }
+            return increment;
+        }
+        var first = counter();
+        var second = counter();
+        first();
+        first();
+        print first();
+        print second();
+        fun early(x) {
+            if (x) return "yes";
+            return "no";
+        }
+        print early(true) + early(nil);
+    """,
+    "classes": """
+        class Shape {
+            init(name) { self.name = name; }
+            area() { return 0; }
+            describe() { return self.name + ": " + self.label(); }
+            label() { return "shape"; }
+        }
+        class Square < Shape {
+            init(side) {
+                super.init("square");
+                self.side = side;
+            }
+            area() { return self.side * self.side; }
+            label() { return "area " + "known"; }
+        }
+        var square = Square(3);
+        print square.area();
+        print square.describe();
+        var area = square.area;
+        square.side = 4;
+        print area();
+        print Shape("blob").area();
+        print Square;
+        print square;
+    """,
+    "recursion": """
+        fun fib(n) {
+            if (n < 2) return n;
+            return fib(n - 1) + fib(n - 2);
+        }
+        fun loop(n, acc) {
+            if (n == 0) return acc;
+            return loop(n - 1, acc + n);
+        }
+        print fib(15);
+        print loop(50, 0);
+    """,
+    "lists": """
+        var xs = [3, 1, 2];
+        append(xs, xs[0] * 2);
+        xs[1] = "one";
+        var copy = list(len(xs));
+        for (var i = 0; i < len(xs); i = i + 1) copy[i] = xs[i];
+        print pop(copy);
+        print len(copy);
+        print copy[1];
+        print xs == copy;
+    """,
+    "natives": """
+        var start = clock();
+        print clock() >= start;
+        print "buffered";
+        flush();
+        print len("four");
+    """,
+}
+
+RUNTIME_ERRORS = {
+    "var x = 1; x.y = 2;": "Only instances have fields.",
+    'var s = "a"; print s.foo;': "Only instances have properties.",
+    'var s = "a"; s.foo();': "Only instances have properties.",
+    "class A { m() {} } print A.m;": "Only instances have properties.",
+    "class A {} A.x = 3;": "Only instances have fields.",
+    "class A {} print A.x = 3;": "Only instances have fields.",
+    "class A {} print A().x;": "Undefined property 'x'.",
+    "class A {} A().m();": "Undefined property 'm'.",
+    "class A {} class B < A { m() { return super.x; } } B().m();": (
+        "Undefined property: 'x'."
+    ),
+    "var X = 1; class B < X {}": "Superclass must be a class.",
+    '"a"();': "Can only call functions and classes.",
+    "class A { init() { self.f = 1; } } A().f();": (
+        "Can only call functions and classes."
+    ),
+    "fun f(a) {} f(1, 2);": "Expected 1 arguments, but 2 were given.",
+    "class A { m(a) {} } A().m();": "Expected 1 arguments, but 0 were given.",
+    "class A { init(a) {} } A();": "Expected 1 arguments, but 0 were given.",
+    "print y;": "Undefined variable TokenType.IDENTIFIER y None.",
+    "y = 1;": "Undefined variable 'TokenType.IDENTIFIER y None'.",
+    'print -"a";': (
+        "Operand must be a float number. Operator: TokenType.MINUS - None"
+    ),
+    'print 1 + "a";': (
+        "Operands must be two numbers or two strings. "
+        "Operator: TokenType.PLUS"
+    ),
+    'print 1 < "a";': (
+        "Operands must be a float number. Operator: TokenType.LESS < None"
+    ),
+    'print "a" * 2;': (
+        "Operands must be a float number. Operator: TokenType.STAR * None"
+    ),
+}
+
+STATIC_ERRORS = {
+    "if (false) { return 1; }": "Can't return from top-level code.",
+    "if (false) { var a = 1; var a = 2; }": "Already variable with this name",
+    "print self;": "Can't use 'self' outside of a class.",
+    "{ var a = a; }": "Can't read local variable in its own",
+    "class A { init() { return 1; } }": "Can't return from initializer.",
+}
+
+
+@pytest.mark.parametrize("engine, optimize", MODES)
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_programs_print_the_same(run, name, engine, optimize):
+    source = PROGRAMS[name]
+    assert run(source, engine, optimize) == run(source)
+
+
+@pytest.mark.parametrize("engine, optimize", MODES)
+@pytest.mark.parametrize("source", RUNTIME_ERRORS)
+def test_runtime_errors_are_reported_the_same(run, source, engine, optimize):
+    output = run(f'print "before"; {source} print "after";', engine, optimize)
+    assert output == f"before\n{RUNTIME_ERRORS[source]}\n"
+
+
+@pytest.mark.parametrize("engine, optimize", MODES)
+@pytest.mark.parametrize("source", STATIC_ERRORS)
+def test_static_errors_are_raised_the_same(run, source, engine, optimize):
+    with pytest.raises(ResolveError, match=STATIC_ERRORS[source]):
+        run(source, engine, optimize)
@@ -0,0 +1,49 @@
+import pytest
+
+from lox import ENGINES
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_function_sees_global_defined_after_it(run, engine):
+    source = """
+        fun show() { print later; }
+        var later = "defined";
+        show();
+        later = "assigned";
+        show();
+    """
+    assert run(source, engine) == "defined\nassigned\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_redefinition_updates_cached_sites(run, engine):
+    source = """
+        var x = 1;
+        fun show() { print x; }
+        show();
+        var x = 2;
+        show();
+    """
+    assert run(source, engine) == "1\n2\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_undefined_global_is_an_error_at_each_site(run, engine):
+    source = """
+        fun show() { print missing; }
+        show();
+    """
+    assert run(source, engine) == (
+        "Undefined variable TokenType.IDENTIFIER missing None.\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assigning_undefined_global_does_not_define_it(run, engine):
+    source = """
+        fun set() { missing = 1; }
+        set();
+    """
+    assert run(source, engine) == (
+        "Undefined variable 'TokenType.IDENTIFIER missing None'.\n"
+    )
@@ -0,0 +1,94 @@
+import pytest
+
+from inline_cache import (
+    POLYMORPHIC_LIMIT,
+    PropertyCache,
+    cache_stats,
+)
+from interpreter import Interpreter
+from lox import ENGINES, Lox
+from resolver import Resolver
+
+
+def interpret(source: str) -> Interpreter:
+    interpreter = Interpreter()
+    interpreter.collect_caches = True
+    statements = Lox.parse(source)
+    Resolver(interpreter).resolve(statements)
+    interpreter.interpret(statements)
+    return interpreter
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "source", ["var x = 1; x.y = 2;", 'var s = "a"; s.y = 1;']
+)
+def test_setting_a_field_on_a_non_instance(run, engine, source):
+    assert run(source + ' print "unreached";', engine) == (
+        "Only instances have fields.\n"
+    )
+
+
+def test_monomorphic_site_hits_after_first_lookup():
+    interpreter = interpret(
+        """
+        class P { init() { self.x = 1; } }
+        var p = P();
+        for (var i = 0; i < 10; i = i + 1) p.x;
+        """
+    )
+    read = [
+        cache
+        for cache in interpreter.property_caches
+        if cache.hits + cache.misses == 10
+    ]
+    assert len(read) == 1
+    assert (read[0].hits, read[0].misses) == (9, 1)
+
+
+def test_megamorphic_site_falls_back_to_full_lookup(run):
+    # Every class reaches the one o.x site in x(), past the limit.
+    classes = "".join(
+        f"class C{i} {{ init() {{ self.x = {i}; }} }}"
+        for i in range(POLYMORPHIC_LIMIT + 2)
+    )
+    reads = "".join(
+        f"sum = sum + x(C{i}());" for i in range(POLYMORPHIC_LIMIT + 2)
+    )
+    source = f"""
+        {classes}
+        fun x(o) {{ return o.x; }}
+        var sum = 0;
+        for (var round = 0; round < 3; round = round + 1) {{ {reads} }}
+        print sum;
+    """
+    expected = 3 * sum(range(POLYMORPHIC_LIMIT + 2))
+    assert run(source) == f"{expected}\n"
+
+
+def test_cache_stats_sum_over_sites():
+    first = PropertyCache()
+    second = PropertyCache()
+    first.hits, first.misses = 3, 1
+    second.hits, second.misses = 5, 2
+    assert cache_stats([first, second]) == {
+        "sites": 2,
+        "hits": 8,
+        "misses": 3,
+    }
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cached_method_survives_field_shadowing(run, engine):
+    source = """
+        class A { m() { return 1; } }
+        fun two() { return 2; }
+        var a = A();
+        var b = A();
+        b.m = two;
+        fun call(o) { return o.m(); }
+        print call(a);
+        print call(b);
+        print call(a);
+    """
+    assert run(source, engine) == "1\n2\n1\n"
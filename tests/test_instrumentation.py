@@ -0,0 +1,72 @@
+import contextlib
+import io
+
+from environment import Environment
+from instrumentation import InstrumentedInterpreter
+from lox import Lox
+from plox_function import LoxFunction
+
+SOURCE = """
+    var total = 0;
+    class Counter {
+        init() { self.count = 0; }
+        bump() { self.count = self.count + 1; return self.count; }
+    }
+    var counter = Counter();
+    var bump = counter.bump;
+    fun outer() {
+        var a = 1;
+        { { total = total + a; } }
+        return a;
+    }
+    outer();
+    print bump();
+"""
+
+
+def instrument(source: str) -> tuple[dict, str]:
+    statements, resolved = Lox.compile(source, "tree")
+    interpreter = InstrumentedInterpreter()
+    interpreter.locals = resolved
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        interpreter.interpret(statements)
+    return interpreter.stats(), output.getvalue()
+
+
+def test_output_is_unchanged(run):
+    assert instrument(SOURCE)[1] == run(SOURCE) == "1\n"
+
+
+def test_hot_paths_are_counted():
+    stats, _ = instrument(SOURCE)
+    assert stats["binds"] == 1
+    assert stats["returns"] == 2
+    assert stats["visits"]["visit_class_stmt"] == 1
+    assert stats["visits"]["visit_function_stmt"] == 1
+    # The innermost block reads a from two environments out.
+    assert stats["lookup_hops"][2] == 1
+    # One call each of init and bump (self, then arguments), and
+    # outer's call environment with its two blocks.
+    assert stats["environments"] == 7
+    assert stats["max_environment_chain"] == 3
+
+
+def test_hooks_are_only_installed_while_interpreting():
+    environment_init = Environment.__init__
+    bind = LoxFunction.bind
+    instrument(SOURCE)
+    assert Environment.__init__ is environment_init
+    assert LoxFunction.bind is bind
+
+
+def test_stats_are_reported_on_stderr(capsys):
+    Lox.stats = True
+    try:
+        Lox.run(SOURCE, "tree")
+    finally:
+        Lox.stats = False
+    captured = capsys.readouterr()
+    assert captured.out == "1\n"
+    assert "method binds             1" in captured.err
+    assert "visit_call_expr" in captured.err
@@ -0,0 +1,55 @@
+import pytest
+
+from lox import ENGINES
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "source",
+    [
+        'var s = "a"; s.foo();',
+        "var n = 1; print n.foo;",
+        "nil.foo();",
+        "class A {} A.foo();",
+    ],
+)
+def test_property_of_a_non_instance(run, engine, source):
+    assert run(source + ' print "unreached";', engine) == (
+        "Only instances have properties.\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_invoked_method_binds_self(run, engine):
+    source = """
+        class Greeter {
+            init(name) { self.name = name; }
+            greet(greeting) { return greeting + " " + self.name; }
+        }
+        var greeter = Greeter("lox");
+        print greeter.greet("hi");
+        var greet = greeter.greet;
+        greeter.name = "changed";
+        print greet("bye");
+    """
+    assert run(source, engine) == "hi lox\nbye changed\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_invoking_a_field(run, engine):
+    source = """
+        class Box {}
+        fun double(x) { return x * 2; }
+        var box = Box();
+        box.fn = double;
+        print box.fn(4);
+        box.value = 1;
+        box.value();
+    """
+    assert run(source, engine) == ("8\nCan only call functions and classes.\n")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_invoking_an_undefined_method(run, engine):
+    source = "class A {} A().missing();"
+    assert run(source, engine) == "Undefined property 'missing'.\n"
@@ -0,0 +1,67 @@
+import pytest
+
+from lox import ENGINES
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_literals_indexing_and_natives(run, engine):
+    source = """
+        var xs = [1, "two", nil];
+        xs[2] = xs[0] + 2;
+        append(xs, [4]);
+        print len(xs);
+        print xs[1];
+        print xs[2] + xs[3][0] + len("lox");
+    """
+    assert run(source, engine) == "4\ntwo\n10\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_list_native_and_pop(run, engine):
+    source = """
+        var xs = list(3);
+        print xs[2];
+        xs[0] = 7;
+        print pop(xs);
+        print len(xs);
+        print pop(xs) == nil;
+        var total = 0;
+        for (var i = 0; i < 5; i = i + 1) append(xs, i);
+        while (len(xs) > 1) total = total + pop(xs);
+        print total;
+    """
+    assert run(source, engine) == "nil\nnil\n2\nTrue\n10\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_lists_are_only_equal_to_themselves(run, engine):
+    source = """
+        var a = [1];
+        var b = a;
+        print a == b;
+        print a == [1];
+        print [] != [];
+    """
+    assert run(source, engine) == "True\nFalse\nTrue\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("print [1][1];", "List index out of range."),
+        ("print [1][0.5];", "List index must be an integer."),
+        ('print [1]["0"];', "List index must be an integer."),
+        ("var x = 1; print x[0];", "Only lists can be indexed."),
+        ("var x = nil; x[0] = 1;", "Only lists can be indexed."),
+        ("list(-1);", "List length must be a non-negative integer."),
+        ("append(1, 2);", "Can only append to a list."),
+        ("len(1);", "Can only take the length of a list or string."),
+        ("pop([]);", "Can't pop from an empty list."),
+        ("pop(nil);", "Can only pop from a list."),
+        ("len();", "Expected 1 arguments, but 0 were given."),
+        ("append([]);", "Expected 2 arguments, but 1 were given."),
+    ],
+)
+def test_errors(run, engine, source, message):
+    assert run(source + ' print "unreached";', engine) == message + "\n"
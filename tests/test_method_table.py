@@ -0,0 +1,61 @@
+import pytest
+
+from interpreter import Interpreter
+from lox import ENGINES, Lox
+from plox_class import LoxClass
+from resolver import Resolver
+
+HIERARCHY = """
+    class A {
+        init(name) { self.name = name; }
+        who() { return "A " + self.name; }
+        base() { return "base"; }
+    }
+    class B < A {
+        who() { return "B " + super.who(); }
+    }
+    class C < B {}
+"""
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_methods_resolve_through_the_hierarchy(run, engine):
+    source = (
+        HIERARCHY
+        + """
+        var c = C("c");
+        print c.who();
+        print c.base();
+        print c.name;
+    """
+    )
+    assert run(source, engine) == "B A c\nbase\nc\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_redefined_superclass_does_not_change_subclass(run, engine):
+    source = (
+        HIERARCHY
+        + """
+        class A { who() { return "new A"; } }
+        print C("c").who();
+        print A().who();
+    """
+    )
+    assert run(source, engine) == "B A c\nnew A\n"
+
+
+def test_method_table_is_flattened_at_class_creation():
+    interpreter = Interpreter()
+    statements = Lox.parse(HIERARCHY)
+    Resolver(interpreter).resolve(statements)
+    interpreter.interpret(statements)
+    a, b, c = (
+        interpreter.globals.cells[name].value for name in ("A", "B", "C")
+    )
+    assert isinstance(c, LoxClass)
+    assert set(c.method_table) == {"init", "who", "base"}
+    assert c.method_table["who"] is b.methods["who"]
+    assert c.method_table["base"] is a.methods["base"]
+    assert c.initializer is a.methods["init"]
+    assert c.arity() == 1
@@ -0,0 +1,64 @@
+import pytest
+
+import expr
+from exceptions import ResolveError
+from lox import ENGINES, Lox
+from optimizer import Optimizer
+
+
+def optimize(source: str):
+    return Optimizer().optimize(Lox.parse(source))
+
+
+def test_constant_expressions_are_folded():
+    (statement,) = optimize('print (1 + 2) * 3 == 9 and "a" + "b";')
+    assert isinstance(statement.expr, expr.Literal)
+    assert statement.expr.value == "ab"
+
+
+def test_runtime_errors_are_left_in_place():
+    divide, negate = optimize('print 1 / 0; print -"a";')
+    assert isinstance(divide.expr, expr.Binary)
+    assert isinstance(negate.expr, expr.Unary)
+
+
+def test_dead_branches_are_dropped():
+    statements = optimize("if (false) print 1; if (true) print 2;")
+    assert len(statements) == 1
+    assert statements[0].expr.value == 2.0
+
+
+DEAD_BRANCH_ERRORS = [
+    ("if (false) return 1;", "Can't return from top-level code."),
+    (
+        "if (false) { var a = 1; var a = 2; }",
+        "Already variable with this name",
+    ),
+    ("if (false) print self;", "Can't use 'self' outside of a class."),
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("optimize_flag", [True, False])
+@pytest.mark.parametrize("source, message", DEAD_BRANCH_ERRORS)
+def test_dead_branches_are_still_resolved(
+    run, engine, optimize_flag, source, message
+):
+    with pytest.raises(ResolveError, match=message):
+        run(source, engine, optimize_flag)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_no_opt_matches_default(run, engine):
+    source = """
+        var x = 2;
+        if (1 < 2) print "yes"; else print "no";
+        if (!true) print "dead";
+        print (1 + 2) * x;
+        print "a" + "b" == "ab";
+        print nil or "fallback";
+        print false and 1;
+        fun f(n) { return -(-n) + 0; }
+        print f(x);
+    """
+    assert run(source, engine) == run(source, engine, optimize=False)
@@ -0,0 +1,72 @@
+import contextlib
+
+import pytest
+
+from lox import ENGINES, Lox
+from output import Output
+
+
+class RecordingStdout:
+    """Stands in for sys.stdout and keeps each write separately."""
+
+    def __init__(self):
+        self.writes: list[str] = []
+
+    def write(self, text: str) -> None:
+        self.writes.append(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def record(action) -> list[str]:
+    stdout = RecordingStdout()
+    with contextlib.redirect_stdout(stdout):
+        action()
+    return stdout.writes
+
+
+def test_lines_are_written_in_bulk():
+    output = Output(buffer_size=10)
+
+    def write_lines():
+        output.write("abc")
+        output.write("def")
+        assert output.pending == 8
+        output.write("ghi")
+
+    assert record(write_lines) == ["abc\ndef\nghi\n"]
+    assert output.pending == 0
+    assert record(output.flush) == []
+
+
+def test_zero_buffer_size_writes_every_line():
+    output = Output(buffer_size=0)
+    assert record(lambda: [output.write(line) for line in "ab"]) == [
+        "a\n",
+        "b\n",
+    ]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_flush_native_writes_pending_lines(engine):
+    writes = record(
+        lambda: Lox.run("print 1; print 2; flush(); print 3;", engine)
+    )
+    assert writes == ["1\n2\n", "3\n"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_output_is_flushed_before_an_error(engine):
+    writes = record(lambda: Lox.run('print 1; print -"a";', engine))
+    assert "".join(writes).splitlines() == [
+        "1",
+        "Operand must be a float number. Operator: TokenType.MINUS - None",
+    ]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_flush_checks_its_arity(run, engine):
+    assert run("flush(1);", engine) == (
+        "Expected 0 arguments, but 1 were given.\n"
+    )
@@ -0,0 +1,132 @@
+import contextlib
+import io
+import re
+
+import pytest
+
+from lox import INTERPRETERS, Lox
+from profiler import (
+    HOOKS,
+    SCRIPT,
+    Profiler,
+)
+
+SOURCE = """
+    fun fib(n) {
+        if (n < 2) return n;
+        return fib(n - 1) + fib(n - 2);
+    }
+    class Counter {
+        init() { self.count = 0; }
+        bump() { self.count = self.count + 1; }
+    }
+    var counter = Counter();
+    counter.bump();
+    counter.bump();
+    var start = clock();
+    print fib(5);
+"""
+
+
+def profile(source: str, engine: str) -> Profiler:
+    statements, resolved = Lox.compile(source, engine)
+    interpreter = INTERPRETERS[engine]()
+    interpreter.locals = resolved
+    with contextlib.redirect_stdout(io.StringIO()):
+        with Profiler() as profiler:
+            interpreter.interpret(statements)
+    return profiler
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure"])
+def test_calls_are_counted_per_lox_function(engine):
+    profiler = profile(SOURCE, engine)
+    calls = {name: stats.calls for name, stats in profiler.stats.items()}
+    assert calls == {
+        "fib": 15,
+        "Counter": 1,
+        "Counter.init": 1,
+        "Counter.bump": 2,
+        "clock": 1,
+    }
+
+
+TAIL_CALLS = """
+    fun loop(n) {
+        if (n == 0) return n;
+        return loop(n - 1);
+    }
+    fun work(n) {
+        var i = 0;
+        while (i < n) i = i + 1;
+        return i;
+    }
+    fun outer() { return work(2000); }
+    class Walker {
+        step(n) {
+            if (n == 0) return n;
+            return self.step(n - 1);
+        }
+    }
+    loop(1000);
+    outer();
+    Walker().step(3);
+"""
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure"])
+def test_tail_calls_are_counted_and_timed_as_calls(engine):
+    profiler = profile(TAIL_CALLS, engine)
+    calls = {name: stats.calls for name, stats in profiler.stats.items()}
+    assert calls == {
+        "loop": 1001,
+        "work": 1,
+        "outer": 1,
+        "Walker": 1,
+        "Walker.step": 4,
+    }
+    outer = profiler.root.children["outer"]
+    assert set(outer.children) == {"work"}
+    work = profiler.stats["work"]
+    assert work.exclusive <= profiler.stats["outer"].inclusive
+    assert profiler.stats["outer"].exclusive < work.inclusive
+
+
+def test_recursion_adds_inclusive_time_once():
+    fib = profile(SOURCE, "tree").stats["fib"]
+    assert fib.active == 0
+    assert fib.exclusive <= fib.inclusive
+
+
+def test_collapsed_stacks_follow_call_paths():
+    profiler = profile(SOURCE, "tree")
+    fib = profiler.root.children["fib"]
+    assert "fib" in fib.children
+    assert set(profiler.root.children) == {
+        "Counter",
+        "Counter.bump",
+        "clock",
+        "fib",
+    }
+    for line in profiler.collapsed_stacks():
+        assert re.fullmatch(rf"{re.escape(SCRIPT)}(;[\w.]+)* \d+", line)
+    assert "clock" in profiler.report()
+
+
+def test_hooks_are_removed_on_exit():
+    originals = {
+        (cls, method): cls.__dict__[method] for cls, method, _ in HOOKS
+    }
+    profile(SOURCE, "tree")
+    assert originals == {
+        (cls, method): cls.__dict__[method] for cls, method, _ in HOOKS
+    }
+
+
+@pytest.mark.parametrize(
+    "native",
+    ["flush()", "list(2)", "append([], 1)", "len([])", "pop([1])"],
+)
+def test_natives_are_profiled_by_name(native):
+    profiler = profile(f"{native};", "tree")
+    assert list(profiler.stats) == [native.split("(")[0]]
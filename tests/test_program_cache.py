@@ -0,0 +1,60 @@
+import contextlib
+import io
+
+import pytest
+
+from lox import ENGINES, Lox
+from program_cache import MAGIC, ProgramCache
+
+SOURCE = "fun f(n) { return n * 2; } print f(21);"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ProgramCache(str(tmp_path / "script.lox"))
+
+
+def test_stored_program_loads_under_the_same_key(cache):
+    key = ProgramCache.key(SOURCE, "vm", True)
+    cache.store(key, {"program": [1, 2, 3]})
+    assert cache.load(key) == {"program": [1, 2, 3]}
+    assert cache.load(ProgramCache.key(SOURCE, "vm", False)) is None
+    assert cache.load(ProgramCache.key(SOURCE, "tree", True)) is None
+
+
+def test_missing_file_is_a_miss(cache):
+    assert cache.load(ProgramCache.key(SOURCE, "tree", True)) is None
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",
+        b"not a pickle",
+        b"cno_such_module\nThing\n.",
+        b"c" + __name__.encode() + b"\nno_such_name\n.",
+    ],
+)
+def test_unreadable_entry_is_a_miss_and_deleted(cache, payload):
+    key = ProgramCache.key(SOURCE, "tree", True)
+    cache.path.parent.mkdir()
+    cache.path.write_bytes(MAGIC + key + payload)
+
+    assert cache.load(key) is None
+    assert not cache.path.exists()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cached_program_runs_like_a_fresh_one(tmp_path, engine):
+    script = tmp_path / "script.lox"
+    script.write_text(SOURCE)
+
+    outputs = []
+    for _ in range(2):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            Lox.read_file(str(script), engine)
+        outputs.append(output.getvalue())
+
+    assert outputs == ["42\n", "42\n"]
+    assert ProgramCache(str(script)).path.exists()
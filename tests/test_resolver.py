@@ -0,0 +1,57 @@
+import pytest
+
+from exceptions import ResolveError
+from interpreter import Interpreter
+from lox import Lox
+from resolver import Resolver
+
+
+def resolve(source: str) -> Interpreter:
+    interpreter = Interpreter()
+    Resolver(interpreter).resolve(Lox.parse(source))
+    return interpreter
+
+
+def test_locals_get_slots_in_declaration_order():
+    interpreter = resolve(
+        """
+        {
+            var a = 1;
+            var b = 2;
+            fun f(x, y) { return y + b; }
+            print a;
+        }
+        """
+    )
+    assert sorted(interpreter.locals.values()) == [(0, 0), (0, 1), (1, 1)]
+
+
+def test_self_and_super_take_slot_zero():
+    interpreter = resolve(
+        """
+        class A { m() { return 1; } }
+        class B < A { m() { return super.m() + self.n; } }
+        """
+    )
+    assert sorted(interpreter.locals.values()) == [(1, 0), (2, 0)]
+
+
+def test_many_locals_keep_their_slots(run):
+    count = 3000
+    declarations = "".join(f"var v{i} = {i};" for i in range(count))
+    source = f"{{ {declarations} print v0 + v{count - 1}; }}"
+    assert run(source) == f"{count - 1}\n"
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("{ var a = 1; var a = 2; }", "Already variable with this name"),
+        ("{ var a = a; }", "Can't read local variable in its own"),
+        ("return 1;", "Can't return from top-level code."),
+        ("print self;", "Can't use 'self' outside of a class."),
+    ],
+)
+def test_static_errors(source, message):
+    with pytest.raises(ResolveError, match=message):
+        resolve(source)
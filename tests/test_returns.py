@@ -0,0 +1,69 @@
+import pytest
+
+from exceptions import ResolveError
+from lox import ENGINES
+
+PROGRAMS = {
+    "from_nested_loops": (
+        """
+        fun find(target) {
+            for (var i = 0; i < 10; i = i + 1) {
+                var j = 0;
+                while (j < 10) {
+                    if (i * j == target) return i + j;
+                    j = j + 1;
+                }
+            }
+            return nil;
+        }
+        print find(12);
+        print find(1000);
+        """,
+        "8\nnil\n",
+    ),
+    "without_value": (
+        """
+        fun early(flag) {
+            if (flag) return;
+            print "not early";
+        }
+        print early(true);
+        early(false);
+        """,
+        "nil\nnot early\n",
+    ),
+    "initializer_returns_instance": (
+        """
+        class A {
+            init(value) { self.value = value; }
+        }
+        var a = A(1);
+        print a.value;
+        print a.init(2) == a;
+        print a.value;
+        """,
+        "1\nTrue\n2\n",
+    ),
+    "from_closure": (
+        """
+        fun outer() {
+            fun inner() { return "inner"; }
+            return inner() + " outer";
+        }
+        print outer();
+        """,
+        "inner outer\n",
+    ),
+}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_returns(run, engine, name):
+    source, expected = PROGRAMS[name]
+    assert run(source, engine) == expected
+
+
+def test_return_in_initializer_is_rejected(run):
+    with pytest.raises(ResolveError, match="Can't return from initializer"):
+        run("class A { init() { return; } }")
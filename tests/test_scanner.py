@@ -0,0 +1,70 @@
+import contextlib
+import io
+
+import pytest
+
+from scanner import (
+    RegexScanner,
+    Scanner,
+    StreamScanner,
+)
+from token_buffer import TokenBuffer
+from token_type import TokenType
+
+SOURCE = """
+// a comment line
+class Point < Base {
+    init(x, y) { self.x = x; self.y = y; }
+}
+var items = [1, 2.5, "two\nlines"];
+if (a <= b and c >= d or !e != f == g) print a / b * -c + d;
+"""
+
+
+def token_tuples(tokens):
+    return [
+        (token.token_type, token.lexeme, token.literal, token.line)
+        for token in tokens
+    ]
+
+
+def scan(scanner_class, source: str):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        scanner = scanner_class(source)
+        tokens = token_tuples(scanner.scan_tokens())
+    return tokens, output.getvalue(), scanner.had_error
+
+
+def test_regex_scanner_matches_classic():
+    assert scan(RegexScanner, SOURCE) == scan(Scanner, SOURCE)
+
+
+def test_buffer_matches_token_stream():
+    buffer = RegexScanner(SOURCE).scan_buffer()
+    assert isinstance(buffer, TokenBuffer)
+    assert token_tuples(buffer) == token_tuples(
+        RegexScanner(SOURCE).iter_tokens()
+    )
+    assert buffer.token_type(len(buffer) - 1) == TokenType.EOF
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ('var a = "open;\nvar b;', "Unterminated string. Line: 1"),
+        ("var a = 1;\nvar b = @;", "Unexpected character: @. Line: 2"),
+    ],
+)
+def test_errors_match_classic(source, message):
+    tokens, output, had_error = scan(RegexScanner, source)
+    assert had_error
+    assert message in output
+    assert (tokens, output, had_error) == scan(Scanner, source)
+
+
+def test_stream_scanner_carries_open_strings_across_lines():
+    lines = ['print "a\n', 'b";\n', "print 1;\n"]
+    streamed = token_tuples(StreamScanner(lines).iter_tokens())
+    assert streamed == token_tuples(RegexScanner("".join(lines)).iter_tokens())
+    assert (TokenType.STRING, '"a\nb"', "a\nb", 1) in streamed
@@ -0,0 +1,74 @@
+import builtins
+
+import pytest
+
+from lox import ENGINES, Lox
+
+
+def prompt(monkeypatch, capsys, engine: str, lines: list[str]):
+    # Feeds lines to the REPL and returns what it printed to stdout and
+    # the prompts it showed.
+    shown = []
+    replies = iter(lines)
+
+    def fake_input(text):
+        shown.append(text)
+        try:
+            return next(replies)
+        except StopIteration:
+            raise EOFError
+
+    monkeypatch.setattr(builtins, "input", fake_input)
+    Lox.run_prompt(engine)
+    return capsys.readouterr().out, shown
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_definitions_persist_across_inputs(monkeypatch, capsys, engine):
+    out, _ = prompt(
+        monkeypatch,
+        capsys,
+        engine,
+        [
+            "var count = 1;",
+            "fun bump() { count = count + 1; return count; }",
+            "bump();",
+            "print bump();",
+        ],
+    )
+    assert out == "3\n\nExiting...\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unfinished_declaration_keeps_reading(monkeypatch, capsys, engine):
+    out, shown = prompt(
+        monkeypatch,
+        capsys,
+        engine,
+        ["fun twice(n) {", "  return n * 2;", "}", "print twice(", "4);"],
+    )
+    assert out == "8\n\nExiting...\n"
+    assert shown == ["> ", "... ", "... ", "> ", "... ", "> "]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_errors_do_not_end_the_session(monkeypatch, capsys, engine):
+    out, _ = prompt(
+        monkeypatch,
+        capsys,
+        engine,
+        [
+            "var a = 1;",
+            "print ;",
+            "{ var b = 1; var b = 2; }",
+            "print -nil;",
+            "print a + 1;",
+        ],
+    )
+    lines = out.splitlines()
+    assert lines[-3:] == ["2", "", "Exiting..."]
+    assert (
+        "Operand must be a float number. Operator: TokenType.MINUS - None"
+        in lines
+    )
+    assert len(lines) == 6
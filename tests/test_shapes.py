@@ -0,0 +1,80 @@
+import pytest
+
+from interpreter import Interpreter
+from lox import ENGINES, Lox
+from plox_instance import Shape
+from resolver import Resolver
+
+
+def instances(source: str, *names: str) -> list:
+    interpreter = Interpreter()
+    statements = Lox.parse(source)
+    Resolver(interpreter).resolve(statements)
+    interpreter.interpret(statements)
+    return [interpreter.globals.cells[name].value for name in names]
+
+
+def test_same_fields_in_same_order_share_a_shape():
+    a, b = instances(
+        """
+        class P { init(x, y) { self.x = x; self.y = y; } }
+        var a = P(1, 2);
+        var b = P(3, 4);
+        """,
+        "a",
+        "b",
+    )
+    assert a.shape is b.shape
+    assert a.shape.slots == {"x": 0, "y": 1}
+    assert a.values == [1.0, 2.0]
+
+
+def test_field_order_gives_different_shapes():
+    a, b = instances(
+        """
+        class P {}
+        var a = P();
+        a.x = 1;
+        a.y = 2;
+        var b = P();
+        b.y = 1;
+        b.x = 2;
+        """,
+        "a",
+        "b",
+    )
+    assert a.shape is not b.shape
+    assert b.shape.slots == {"y": 0, "x": 1}
+
+
+def test_reassigning_a_field_keeps_the_shape():
+    (a,) = instances(
+        """
+        class P {}
+        var a = P();
+        a.x = 1;
+        a.x = 2;
+        """,
+        "a",
+    )
+    assert a.shape.slots == {"x": 0}
+    assert a.values == [2.0]
+
+
+def test_transitions_are_shared():
+    root = Shape()
+    assert root.with_field("x") is root.with_field("x")
+    assert root.with_field("x").with_field("y").slots == {"x": 0, "y": 1}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_fields_shadow_methods(run, engine):
+    source = """
+        class A { m() { return "method"; } }
+        var a = A();
+        print a.m();
+        fun field() { return "field"; }
+        a.m = field;
+        print a.m();
+    """
+    assert run(source, engine) == "method\nfield\n"
@@ -0,0 +1,72 @@
+import contextlib
+import io
+
+import pytest
+
+import specialized
+from interpreter import Interpreter
+from lox import Lox
+from resolver import Resolver
+
+
+def run_function(source: str):
+    # The program's first statement declares a function returning one
+    # Binary node; returns that node once the program ran, and the output.
+    interpreter = Interpreter()
+    statements = Lox.parse(source)
+    Resolver(interpreter).resolve(statements)
+    statements = Lox.prepare(statements)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        interpreter.interpret(statements)
+    (return_stmt,) = statements[0].body
+    return return_stmt.value, output.getvalue()
+
+
+@pytest.mark.parametrize(
+    "operator, arguments, node",
+    [
+        ("+", "1, 2", specialized.NumberAdd),
+        ("+", '"a", "b"', specialized.StringConcat),
+        ("-", "1, 2", specialized.NumberSubtract),
+        ("*", "1, 2", specialized.NumberMultiply),
+        ("/", "1, 2", specialized.NumberDivide),
+        ("<", "1, 2", specialized.NumberLess),
+        ("<=", "1, 2", specialized.NumberLessEqual),
+        (">", "1, 2", specialized.NumberGreater),
+        (">=", "1, 2", specialized.NumberGreaterEqual),
+        ("==", '1, "a"', specialized.Equal),
+        ("!=", "nil, nil", specialized.NotEqual),
+        ("+", '1, "a"', specialized.GenericBinary),
+    ],
+)
+def test_first_evaluation_specializes(operator, arguments, node):
+    binary, _ = run_function(
+        f"fun f(a, b) {{ return a {operator} b; }} f({arguments});"
+    )
+    assert type(binary) is node
+
+
+def test_type_change_deoptimizes_once():
+    binary, output = run_function(
+        """
+        fun f(a, b) { return a + b; }
+        print f(1, 2);
+        print f("a", "b");
+        print f(3, 4);
+        """
+    )
+    assert type(binary) is specialized.GenericBinary
+    assert output.split() == ["3", "ab", "7"]
+
+
+def test_deoptimized_node_keeps_error_text(run):
+    source = """
+        fun f(a, b) { return a - b; }
+        print f(3, 1);
+        print f("x", 1);
+    """
+    assert run(source).split("\n")[:2] == [
+        "2",
+        "Operands must be a float number. Operator: TokenType.MINUS - None",
+    ]
@@ -0,0 +1,57 @@
+import pytest
+
+from lox import Lox
+from stack_interpreter import StackInterpreter
+
+DEEP = """
+    fun depth(n) {
+        if (n == 0) return 0;
+        return 1 + depth(n - 1);
+    }
+    print depth(%d);
+"""
+
+
+def test_recursion_is_not_bounded_by_the_python_stack(run):
+    assert run(DEEP % 20_000, "stack") == "20000\n"
+
+
+def test_too_many_frames_is_a_lox_error(run, monkeypatch):
+    monkeypatch.setattr(StackInterpreter, "max_frames", 100)
+    assert run(DEEP % 99, "stack") == "99\n"
+    assert run(DEEP % 100, "stack") == "Stack overflow.\n"
+
+
+def test_interpreter_recovers_after_an_error_deep_in_calls(capsys):
+    interpreter = StackInterpreter()
+    for source in [
+        "fun down(n) { if (n == 0) return nil + 1; return down(n - 1) + 1; }",
+        "down(500);",
+        "print 1 + 1;",
+    ]:
+        statements, resolved = Lox.compile(source, "stack")
+        interpreter.locals.update(resolved)
+        interpreter.interpret(statements)
+
+    assert interpreter.environment is interpreter.globals
+    assert interpreter.frames == 0
+    assert capsys.readouterr().out.splitlines()[-1] == "2"
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("var a = 1; { var a = 2; print a; } print a;", "2\n1\n"),
+        ("var i = 0; while (i < 3) i = i + 1; print i;", "3\n"),
+        ('print "a" + "b" == "ab" and !nil;', "True\n"),
+        (
+            "class A { f() { return 1; } }"
+            " class B < A { f() { return super.f() + 1; } }"
+            " print B().f();",
+            "2\n",
+        ),
+        ("var xs = [1, 2]; xs[0] = 5; print xs[0] + xs[1];", "7\n"),
+    ],
+)
+def test_matches_the_tree_engine(run, source, expected):
+    assert run(source, "stack") == run(source, "tree") == expected
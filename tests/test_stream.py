@@ -0,0 +1,87 @@
+import contextlib
+import io
+
+import pytest
+
+from interpreter import Interpreter
+from lox import ENGINES, Lox
+from session import Session
+
+SCRIPT = [
+    "var total = 0;\n",
+    "fun add(n) {\n",
+    "    total = total + n;\n",
+    "}\n",
+    "for (var i = 0; i < 4; i = i + 1) add(i);\n",
+    'print "total: " +\n',
+    '    "six";\n',
+    "print total;\n",
+]
+
+
+def stream(lines, engine: str) -> str:
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Lox.run_stream(iter(lines), engine)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_stream_matches_whole_program(run, engine):
+    assert stream(SCRIPT, engine) == run("".join(SCRIPT), engine)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_stream_stops_at_first_runtime_error(engine):
+    lines = ["print 1;\n", "print -nil;\n", "print 2;\n"]
+    assert stream(lines, engine) == (
+        "1\nOperand must be a float number. Operator: TokenType.MINUS - None\n"
+    )
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure"])
+def test_stream_can_be_profiled(monkeypatch, tmp_path, capsys, engine):
+    monkeypatch.setattr(Lox, "profile", True)
+    monkeypatch.setattr(Lox, "profile_stacks", str(tmp_path / "lox.folded"))
+    Lox.run_stream(iter(SCRIPT), engine)
+    captured = capsys.readouterr()
+    assert captured.out == "total: six\n6\n"
+    calls = dict(line.split()[:2] for line in captured.err.splitlines()[1:-1])
+    assert calls == {"<script>": "1", "add": "4"}
+
+
+def test_stream_can_collect_stats(monkeypatch, capsys):
+    monkeypatch.setattr(Lox, "stats", True)
+    Lox.run_stream(iter(SCRIPT), "tree")
+    captured = capsys.readouterr()
+    assert captured.out == "total: six\n6\n"
+    visits = dict(line.split() for line in captured.err.splitlines()[7:])
+    assert visits["visit_call_expr"] == "4"
+
+
+def test_declarations_without_functions_are_forgotten():
+    session = Session("tree")
+    for _ in range(50):
+        session.execute(Lox.parse("{ var a = 1; var b = a + 1; a = b; }"))
+    assert session.interpreter.locals == {}
+    assert session.interpreter.global_cells == {}
+
+
+def test_property_caches_are_only_collected_for_stats():
+    lines = [
+        "class P { init() { self.x = 1; } }\n",
+        *["{ var p = P(); p.x = p.x + 1; }\n"] * 20,
+    ]
+    session = Session("tree")
+    for line in lines:
+        session.execute(Lox.parse(line))
+    assert session.interpreter.property_caches == []
+
+    Interpreter.collect_caches = True
+    try:
+        session = Session("tree")
+        for line in lines:
+            session.execute(Lox.parse(line))
+    finally:
+        Interpreter.collect_caches = False
+    assert len(session.interpreter.property_caches) > 20
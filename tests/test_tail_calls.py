@@ -0,0 +1,60 @@
+import pytest
+
+from lox import ENGINES
+
+# The python engine runs Lox calls as Python calls, so it has no tail
+# calls; the vm and stack engines never recurse on the Python stack.
+DEEP_ENGINES = [engine for engine in ENGINES if engine != "python"]
+DEPTH = 20_000
+
+
+@pytest.mark.parametrize("engine", DEEP_ENGINES)
+def test_tail_recursion_runs_in_constant_stack(run, engine):
+    source = f"""
+        fun count(n, acc) {{
+            if (n == 0) return acc;
+            return count(n - 1, acc + 1);
+        }}
+        print count({DEPTH}, 0);
+    """
+    assert run(source, engine) == f"{DEPTH}\n"
+
+
+@pytest.mark.parametrize("engine", DEEP_ENGINES)
+def test_mutual_tail_recursion(run, engine):
+    source = f"""
+        fun isEven(n) {{ if (n == 0) return true; return isOdd(n - 1); }}
+        fun isOdd(n) {{ if (n == 0) return false; return isEven(n - 1); }}
+        print isEven({DEPTH});
+        print isOdd(7);
+    """
+    assert run(source, engine) == "True\nTrue\n"
+
+
+@pytest.mark.parametrize("engine", DEEP_ENGINES)
+def test_method_tail_calls_keep_their_receiver(run, engine):
+    source = f"""
+        class Walker {{
+            init(step) {{ self.step = step; }}
+            walk(n, at) {{
+                if (n == 0) return at;
+                return self.walk(n - 1, at + self.step);
+            }}
+        }}
+        print Walker(2).walk({DEPTH}, 0);
+    """
+    assert run(source, engine) == f"{2 * DEPTH}\n"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_classes_and_natives_in_tail_position(run, engine):
+    source = """
+        class Box { init(value) { self.value = value; } }
+        fun box(value) { return Box(value); }
+        fun size(items) { return len(items); }
+        fun later(f, x) { return f(x); }
+        print box(3).value;
+        print size([1, 2, 3]);
+        print later(box, 4).value;
+    """
+    assert run(source, engine) == "3\n3\n4\n"
@@ -0,0 +1,39 @@
+from parser import Parser
+
+from scanner import RegexScanner, Scanner
+from token_buffer import TokenBuffer
+from token_type import TokenType
+
+
+def test_tokens_are_built_from_offsets():
+    source = 'var name = "lox" + 1.5;'
+    buffer = TokenBuffer(source)
+    buffer.append(TokenType.STRING.value, 11, 16, 3)
+    buffer.append(TokenType.NUMBER.value, 19, 22, 3)
+    buffer.append(TokenType.IDENTIFIER.value, 4, 8, 3)
+
+    assert len(buffer) == 3
+    assert [
+        (token.token_type, token.lexeme, token.literal, token.line)
+        for token in buffer
+    ] == [
+        (TokenType.STRING, '"lox"', "lox", 3),
+        (TokenType.NUMBER, "1.5", 1.5, 3),
+        (TokenType.IDENTIFIER, "name", None, 3),
+    ]
+    assert buffer.token_type(1) == TokenType.NUMBER
+
+
+def test_parser_reads_a_buffer_like_a_token_list(run):
+    source = """
+        fun greet(name) { return "hi " + name; }
+        var items = [1, 2];
+        print greet("lox") + " " + "x";
+    """
+    from_buffer = Parser(RegexScanner(source).scan_buffer()).parse()
+    from_list = Parser(Scanner(source).scan_tokens()).parse()
+    assert len(from_buffer) == len(from_list) == 3
+    assert [type(statement) for statement in from_buffer] == [
+        type(statement) for statement in from_list
+    ]
+    assert run(source) == "hi lox x\n"
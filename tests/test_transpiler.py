@@ -0,0 +1,63 @@
+import pytest
+
+from transpiler import PythonProgram
+
+ARITY = {
+    "function_missing": "fun f(a, b) {} f(1);",
+    "function_extra": "fun f() {} f(1);",
+    "method": "class A { m(a) {} } A().m(1, 2, 3);",
+    "bound_method": "class A { m(a) {} } var m = A().m; m();",
+    "initializer": "class A { init(x) {} } A();",
+    "inherited_initializer": "class A { init(x) {} } class B < A {} B();",
+    "no_initializer": "class A {} A(1);",
+    "local_function": "{ fun f(a) {} f(); }",
+    "native": "print len();",
+    "native_extra": "clock(1);",
+    "flush": "flush(1);",
+    "list_native": "append([]);",
+}
+
+ERRORS = {
+    "not_callable": '"text"();',
+    "undefined_variable": "print missing;",
+    "undefined_assignment": "missing = 1;",
+    "undefined_assignment_in_function": "fun f() { missing = 1; } f();",
+    "undefined_property": "class A {} print A().x;",
+    "undefined_super": """
+        class A {}
+        class B < A { m() { return super.x; } }
+        B().m();
+    """,
+    "superclass": "var X = 1; class B < X {}",
+}
+
+
+@pytest.mark.parametrize("name", ARITY)
+def test_arity_errors_match_tree_engine(run, name):
+    source = ARITY[name]
+    output = run(source, "python")
+    assert output.startswith("Expected ")
+    assert output == run(source, "tree")
+
+
+@pytest.mark.parametrize("name", ERRORS)
+def test_runtime_errors_match_tree_engine(run, name):
+    source = ERRORS[name]
+    assert run(source, "python") == run(source, "tree")
+
+
+def test_arity_is_checked_before_the_body_runs(run):
+    source = 'fun f(a) { print "ran"; } f(1); f();'
+    assert run(source, "python") == (
+        "ran\nExpected 1 arguments, but 0 were given.\n"
+    )
+
+
+def test_defined_global_can_be_assigned(run):
+    source = "var x = 1; fun f() { x = x + 1; } f(); print x = x * 10;"
+    assert run(source, "python") == "20\n"
+
+
+def test_compile_cache_keeps_optimized_programs_apart():
+    source = "print 1 + 2;"
+    assert PythonProgram.key(source, True) != PythonProgram.key(source, False)
@@ -0,0 +1,77 @@
+import pytest
+
+PROGRAMS = {
+    "closures": """
+        fun counter() {
+            var count = 0;
+            fun increment() {
+                count = count + 1;
+                return count;
+            }
+            return increment;
+        }
+        var next = counter();
+        next();
+        print next();
+    """,
+    "classes": """
+        class A {
+            init(name) { self.name = name; }
+            greet() { return "hi " + self.name; }
+        }
+        class B < A {
+            greet() { return super.greet() + "!"; }
+        }
+        print B("lox").greet();
+    """,
+    "loop": """
+        var total = 0;
+        for (var i = 0; i < 10; i = i + 1) total = total + i;
+        print total;
+    """,
+}
+
+ERRORS = {
+    "undefined_variable": "print missing;",
+    "undefined_assignment": "missing = 1;",
+    "undefined_property": "class A {} print A().x;",
+    "undefined_super": """
+        class A {}
+        class B < A { m() { return super.x; } }
+        B().m();
+    """,
+    "superclass": "var X = 1; class B < X {}",
+    "arity": "fun f(a) {} f(1, 2);",
+    "operands": 'print 1 < "a";',
+}
+
+
+@pytest.mark.parametrize("name", PROGRAMS)
+def test_programs_match_tree_engine(run, name):
+    source = PROGRAMS[name]
+    assert run(source, "vm") == run(source, "tree")
+
+
+@pytest.mark.parametrize("name", ERRORS)
+def test_runtime_errors_match_tree_engine(run, name):
+    source = ERRORS[name]
+    assert run(source, "vm") == run(source, "tree")
+
+
+@pytest.mark.parametrize("engine", ["tree", "vm"])
+def test_runtime_errors_report_the_message_alone(run, engine):
+    output = run('class A {} print A().x; print "unreached";', engine)
+    assert output == "Undefined property 'x'.\n"
+
+
+def test_output_before_an_error_is_kept(run):
+    assert run('print "first"; print -"a";', "vm") == (
+        "first\nOperand must be a float number. Operator: TokenType.MINUS"
+        " - None\n"
+    )
+
+
+@pytest.mark.parametrize("optimize", [True, False])
+def test_zero_and_negative_zero_are_separate_constants(run, optimize):
+    source = "print 0; print -0; print 0 * -1; print 0.0;"
+    assert run(source, "vm", optimize) == "0\n-0\n-0\n0\n"
@@ -0,0 +1,185 @@
+"""Generates src/expr.py and src/stmt.py from the grammar below.
+
+Run `python tools/generate_ast.py` after changing a node; the generated
+modules must not be edited by hand.
+"""
+
+import re
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+LINE_LENGTH = 79
+
+# base name -> (imports, grammar docstring, nodes). A node is
+# (class name, constructor fields, extra fields initialised to None).
+AST = {
+    "Expr": (
+        ["from typing import Any", "", "from plox_token import Token"],
+        """
+    Expression -> Assignment ;
+    assignment -> ( Call ".")? IDENTIFIER "=" Assignment
+        | Call "[" Expression "]" "=" Assignment | Equality ;
+    Logic_or → Logic_and ( "or" Logic_and )* ;
+    Logic_and → Equality ( "and" Equality )* ;
+    Equality -> Comparison ( ( "!=" | "==" ) Comparison )* ;
+    Comparison → Term ( ( ">" | ">=" | "<" | "<=" ) Term )* ;
+    Term → Factor ( ( "-" | "+" ) Factor )* ;
+    Factor → Unary ( ( "/" | "*" ) Unary )* ;
+    Unary -> ("!" | "-")Unary | Primary;
+    Call -> Primary ( "(" arguments? ")" | "." IDENTIFIER
+        | "[" Expression "]" )* ;
+    Primary -> "true" | "false" | "nil"
+        |  NUMBER | STRING
+        | "(" expression ")"
+        | "[" arguments? "]"
+        | IDENTIFIER ;
+        | "super" "." IDENTIFIER ;
+    """,
+        [
+            ("Binary", "left: Expr, operator: Token, right: Expr", []),
+            ("Unary", "operator: Token, right: Expr", []),
+            ("Literal", "value: Any", []),
+            ("Grouping", "expr: Expr", []),
+            ("Assign", "name: Token, value: Expr", []),
+            ("Var", "token: Token", []),
+            ("Logical", "left: Expr, operator: Token, right: Expr", []),
+            (
+                "Call",
+                "calle: Expr, paren: Token, arguments: list[Expr]",
+                ["tail"],
+            ),
+            ("Get", "expression: Expr, name: Token", ["cache"]),
+            ("Set", "expression: Expr, name: Token, value: Expr", ["cache"]),
+            ("Self", "keyword: Token", []),
+            ("Super", "keyword: Token, method: Token", []),
+            ("ListLiteral", "bracket: Token, elements: list[Expr]", []),
+            ("Index", "expression: Expr, bracket: Token, index: Expr", []),
+            (
+                "SetIndex",
+                "expression: Expr, bracket: Token, index: Expr, value: Expr",
+                [],
+            ),
+        ],
+    ),
+    "Stmt": (
+        [
+            "import expr",
+            "from expr import Expr",
+            "from plox_token import Token",
+        ],
+        """
+    Program -> Declaration * EOF ;
+    Declaration -> VarDecl
+                    | Statement
+                    | FunDecl
+                    | ClassDecl ;
+    VarDecl -> "var" IDENTIFIER ( "=" expression )? ";" ;
+    FunDecl -> "fun" Function ;
+    Function → IDENTIFIER "(" Parameters? ")" block ;
+    ClassDecl -> "class" IDENTIFIER ( "<" IDENTIFIER )? {" function* "}" ;
+    Parameters → IDENTIFIER ( "," IDENTIFIER )* ;
+    Statement -> ExprStmt
+                | PrintStmt
+                | Block
+                | ifStmt
+                | WhileStmt
+                | ForStmt
+                | ReturnStmt ;
+    ifStmt -> "if" "(" expression ")" statement ( "else" statement )? ;
+    WhileStmt -> "while" "(" expression ")" statement ;
+    ForStmt -> "for" "("
+        ( varDecl | exprStmt | ";" ) expression? ";" expression?
+        )" statement ;
+    ReturnStmt -> "return" expression? ";" ;
+    Block -> "{" Declaration* "}" ;
+    ExprStmt -> expression ";" ;
+    PrintStmt -> "print" expression ";" ;
+    """,
+        [
+            ("Print", "expr: Expr", []),
+            ("Expression", "expr: Expr", []),
+            ("Var", "name: Token, initializer: Expr", []),
+            ("Block", "statements: list[Stmt]", []),
+            (
+                "IfStmt",
+                "condition: Expr, then_stmt: Stmt, else_stmt: Stmt",
+                [],
+            ),
+            ("While", "condition: Expr, body: Stmt", []),
+            (
+                "Function",
+                "name: Token, params: list[Token], body: list[Stmt]",
+                [],
+            ),
+            ("Return", "keyword: Token, value: Expr", []),
+            (
+                "Class",
+                "name: Token, superclass: expr.Var | None, "
+                "methods: list[Function]",
+                [],
+            ),
+        ],
+    ),
+}
+
+
+def define_ast(base: str, imports: list[str], grammar: str, nodes) -> str:
+    lines = [
+        "# Generated by tools/generate_ast.py, do not edit.",
+        *imports,
+        "",
+        "",
+        f"class {base}:",
+        f'    """{grammar}"""',
+        "",
+        "    __slots__ = ()",
+        "",
+        "    def accept(self, visitor):",
+        "        raise NotImplementedError(",
+        f'            "accept method must be implemented by {base} '
+        'subclasses"',
+        "        )",
+    ]
+    for name, fields, extra in nodes:
+        lines += define_node(base, name, fields, extra)
+    return "\n".join(lines) + "\n"
+
+
+def define_node(
+    base: str, name: str, fields: str, extra: list[str]
+) -> list[str]:
+    names = [field.split(":")[0] for field in fields.split(", ")] + extra
+    visit = re.sub(r"(?<!^)(?=[A-Z])", "_", name.removesuffix(base)).lower()
+
+    slots = ", ".join(f'"{field}"' for field in names)
+    if len(names) == 1:
+        slots += ","
+    lines = ["", "", f"class {name}({base}):", f"    __slots__ = ({slots})"]
+    lines.append("")
+
+    signature = f"    def __init__(self, {fields}):"
+    if len(signature) > LINE_LENGTH:
+        lines += ["    def __init__(", f"        self, {fields}", "    ):"]
+    else:
+        lines.append(signature)
+    for field in names:
+        value = "None" if field in extra else field
+        lines.append(f"        self.{field} = {value}")
+
+    lines += [
+        "",
+        "    def accept(self, visitor):",
+        f"        return visitor.visit_{visit}_{base.lower()}(self)",
+    ]
+    return lines
+
+
+def main():
+    for base, (imports, grammar, nodes) in AST.items():
+        path = SRC / f"{base.lower()}.py"
+        path.write_text(define_ast(base, imports, grammar, nodes))
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()